@@ -4,7 +4,7 @@ import requests
 from datetime import datetime
 from .base_adapter import BaseAdapter, ExtractionError
 from models.raw_content import RawContent, RawContentBatch
-from python_shared.utils import generate_id
+from python_shared.utils import content_id
 
 
 class ArticleAdapter(BaseAdapter):
@@ -22,8 +22,9 @@ class ArticleAdapter(BaseAdapter):
         """Extract article content from web page."""
         try:
             # Fetch the page
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
+            response = self.http.fetch(url, commit=not self.skip_unchanged)
+            if response.not_modified and self.skip_unchanged:
+                return self.not_modified_batch()
             
             # Extract clean text with trafilatura
             downloaded = response.text
@@ -45,11 +46,12 @@ class ArticleAdapter(BaseAdapter):
             # Extract metadata
             metadata = trafilatura.extract_metadata(downloaded)
             
+            title = metadata.title if metadata and metadata.title else "Untitled Article"
             raw_content = RawContent(
-                id=generate_id(),
+                id=content_id(url, title, content),
                 source_type=self.adapter_type,
                 source_url=url,
-                title=metadata.title if metadata and metadata.title else "Untitled Article",
+                title=title,
                 content=content,
                 author=metadata.author if metadata and metadata.author else None,
                 published_date=self._parse_date(metadata.date) if metadata and metadata.date else None,
@@ -1,7 +1,8 @@
 """Base adapter interface that all adapters must implement."""
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Iterator, Optional
 from models.raw_content import RawContent, RawContentBatch
+from python_shared.http_client import HttpClient, get_default_client
 
 
 class BaseAdapter(ABC):
@@ -12,10 +13,14 @@ class BaseAdapter(ABC):
     1. Fetching content from a specific source type
     2. Extracting clean text
     3. Normalizing to RawContent format
+    
+    Network access goes through the shared HttpClient passed as
+    config['http_client'] (the process-wide default client otherwise).
     """
     
     def __init__(self, config: Optional[dict] = None):
         self.config = config or {}
+        self.http: HttpClient = self.config.get('http_client') or get_default_client()
     
     @abstractmethod
     def extract(self, url: str) -> RawContentBatch:
@@ -33,6 +38,19 @@ class BaseAdapter(ABC):
         """
         pass
     
+    def iter_batches(self, url: str) -> Iterator[RawContentBatch]:
+        """
+        Yield the content of a URL as one or more batches.
+        
+        The ingestor writes each batch before asking for the next one, so
+        adapters for long sources can override this to emit their output
+        incrementally. By default this yields the single batch of extract().
+        
+        Raises:
+            ExtractionError: If content cannot be extracted
+        """
+        yield self.extract(url)
+    
     @abstractmethod
     def validate_url(self, url: str) -> bool:
         """
@@ -51,6 +69,26 @@ class BaseAdapter(ABC):
     def adapter_type(self) -> str:
         """Return the adapter type identifier."""
         pass
+    
+    @property
+    def skip_unchanged(self) -> bool:
+        """
+        Whether a 304 from the HTTP cache should short-circuit extraction.
+        
+        When it does, the fetched response is only staged in the cache; the
+        ingestor commits it once the extracted items are written, so a
+        failed run is retried instead of skipped as unchanged.
+        """
+        return self.config.get('skip_unchanged', True)
+    
+    def not_modified_batch(self) -> RawContentBatch:
+        """Empty batch returned when the source hasn't changed since the last fetch."""
+        return RawContentBatch(
+            items=[],
+            total=0,
+            source_type=self.adapter_type,
+            not_modified=True
+        )
 
 
 class ExtractionError(Exception):
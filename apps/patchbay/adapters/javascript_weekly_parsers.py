@@ -0,0 +1,340 @@
+"""HTML parser backends for JavaScript Weekly issue pages."""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterator, Optional
+from urllib.parse import urljoin, urlparse
+import re
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - lxml is a declared dependency
+    etree = None
+
+
+# Dates JavaScript Weekly prints on issue pages
+DATE_PATTERNS = [
+    re.compile(r'(\w+ \d{1,2}, \d{4})'),  # "November 21, 2025"
+    re.compile(r'(\d{4}-\d{2}-\d{2})'),   # "2025-11-21"
+]
+DATE_FORMATS = ['%B %d, %Y', '%b %d, %Y', '%Y-%m-%d']
+
+CONTENT_CLASS_PATTERN = re.compile(r'content|main|issue', re.I)
+SKIP_PARENT_CLASSES = {'nav', 'navigation', 'footer', 'header', 'menu'}
+MIN_TITLE_LENGTH = 10
+MAX_DESCRIPTION_LENGTH = 500
+
+
+@dataclass
+class ParsedIssue:
+    """Everything the adapter needs from an issue page."""
+    title: str
+    date: Optional[datetime]
+    links: list[dict] = field(default_factory=list)  # {'title', 'url', 'description'}, page order
+
+
+def find_issue_date(page_text: str) -> Optional[datetime]:
+    """Return the first recognisable date in the page text."""
+    for pattern in DATE_PATTERNS:
+        match = pattern.search(page_text)
+        if match:
+            date_str = match.group(1)
+            for fmt in DATE_FORMATS:
+                try:
+                    return datetime.strptime(date_str, fmt)
+                except ValueError:
+                    continue
+    return None
+
+
+def normalize_url(href: str, base_url: str) -> str:
+    """Convert relative URLs to absolute URLs."""
+    if href.startswith('http://') or href.startswith('https://'):
+        return href
+
+    if href.startswith('/'):
+        # Absolute path on same domain
+        parsed = urlparse(base_url)
+        return f"{parsed.scheme}://{parsed.netloc}{href}"
+
+    # Relative URL
+    return urljoin(base_url, href)
+
+
+def is_article_href(href: str, text: str, issue_url: str) -> bool:
+    """Cheap checks on a link before looking at its surroundings."""
+    # Skip anchors, scripts and links without text
+    if href.startswith('#') or href.startswith('javascript:') or not text:
+        return False
+
+    # Skip if it's just the issue URL itself
+    if href == issue_url or href.endswith(issue_url.split('/')[-1]):
+        return False
+
+    return len(text) > MIN_TITLE_LENGTH
+
+
+def description_after_link(parent_text: str, link_text: str) -> str:
+    """Text following the link inside its paragraph."""
+    if link_text in parent_text:
+        after_link = parent_text.split(link_text, 1)
+        if len(after_link) > 1:
+            return after_link[1].strip()
+    return ""
+
+
+class IssueParser(ABC):
+    """Extracts the title, date and article links from an issue page."""
+
+    name: str = ""
+
+    @abstractmethod
+    def parse(self, html: str, issue_url: str) -> ParsedIssue:
+        """
+        Parse an issue page.
+
+        Args:
+            html: Page HTML
+            issue_url: URL of the issue page (used to resolve relative links)
+
+        Returns:
+            ParsedIssue with links in page order (not yet deduplicated)
+        """
+        pass
+
+
+class SoupIssueParser(IssueParser):
+    """
+    Reference parser built on BeautifulSoup's pure-Python html.parser.
+
+    Slow, but tolerant and dependency-free; used when lxml is unavailable.
+    """
+
+    name = "soup"
+
+    def parse(self, html: str, issue_url: str) -> ParsedIssue:
+        soup = BeautifulSoup(html, 'html.parser')
+        return ParsedIssue(
+            title=self._title(soup),
+            date=find_issue_date(soup.get_text()),
+            links=self._links(soup, issue_url)
+        )
+
+    @staticmethod
+    def _title(soup: BeautifulSoup) -> str:
+        title_tag = soup.find('title')
+        if title_tag:
+            return title_tag.get_text(strip=True)
+
+        h1 = soup.find('h1')
+        if h1:
+            return h1.get_text(strip=True)
+
+        return "JavaScript Weekly Issue"
+
+    def _links(self, soup: BeautifulSoup, issue_url: str) -> list[dict]:
+        main_content = (
+            soup.find('main')
+            or soup.find('article')
+            or soup.find('div', class_=CONTENT_CLASS_PATTERN)
+            or soup
+        )
+
+        links = []
+        for link in main_content.find_all('a', href=True):
+            href = link.get('href', '').strip()
+            text = link.get_text(strip=True)
+            if not is_article_href(href, text, issue_url):
+                continue
+
+            # Skip navigation and footer links (checks up to 3 levels up)
+            parent_classes = []
+            parent = link.parent
+            for _ in range(3):
+                if parent and parent.get('class'):
+                    parent_classes.extend(parent.get('class', []))
+                parent = parent.parent if parent else None
+
+            if SKIP_PARENT_CLASSES.intersection(parent_classes):
+                continue
+
+            links.append({
+                'title': text,
+                'url': normalize_url(href, issue_url),
+                'description': self._description(link, text)
+            })
+
+        return links
+
+    @staticmethod
+    def _description(link, link_text: str) -> str:
+        """Text after the link in its paragraph, else the next sibling's text."""
+        description = ""
+
+        parent = link.parent
+        if parent and parent.name == 'p':
+            description = description_after_link(parent.get_text(strip=True), link_text)
+
+        if not description:
+            next_sibling = link.next_sibling
+            if next_sibling and hasattr(next_sibling, 'get_text'):
+                description = next_sibling.get_text(strip=True)
+
+        if not description and parent:
+            next_sibling = parent.next_sibling
+            if next_sibling and hasattr(next_sibling, 'get_text'):
+                description = next_sibling.get_text(strip=True)
+
+        return description[:MAX_DESCRIPTION_LENGTH]
+
+
+class LxmlIssueParser(IssueParser):
+    """
+    Parser built on lxml's C HTML parser and precompiled XPath lookups.
+
+    Follows the same rules as SoupIssueParser. Text is gathered the way
+    BeautifulSoup's get_text does it (comments and script/style bodies
+    are skipped), so both backends produce the same links on well-formed
+    pages; scripts/compare_jsweekly_parsers.py checks this on saved issues.
+    """
+
+    name = "lxml"
+
+    # Elements whose text BeautifulSoup leaves out of an ancestor's get_text()
+    NON_TEXT_TAGS = frozenset({'script', 'style', 'template'})
+
+    def __init__(self):
+        if etree is None:
+            raise ImportError("lxml is required for the lxml parser backend")
+
+        self._first_title = etree.XPath("(//title)[1]")
+        self._first_h1 = etree.XPath("(//h1)[1]")
+        self._first_main = etree.XPath("(//main)[1]")
+        self._first_article = etree.XPath("(//article)[1]")
+        self._first_content_div = etree.XPath(
+            "(//div[re:test(@class, 'content|main|issue', 'i')])[1]",
+            namespaces={'re': 'http://exslt.org/regular-expressions'}
+        )
+        self._links_with_href = etree.XPath(".//a[@href]")
+
+    def parse(self, html: str, issue_url: str) -> ParsedIssue:
+        root = etree.fromstring(html.encode('utf-8'), etree.HTMLParser(encoding='utf-8'))
+        if root is None:
+            return ParsedIssue(title="JavaScript Weekly Issue", date=None)
+
+        return ParsedIssue(
+            title=self._title(root),
+            date=find_issue_date(''.join(self._strings(root))),
+            links=self._links(root, issue_url)
+        )
+
+    def _title(self, root) -> str:
+        for lookup in (self._first_title, self._first_h1):
+            found = lookup(root)
+            if found:
+                return self._text(found[0])
+        return "JavaScript Weekly Issue"
+
+    def _links(self, root, issue_url: str) -> list[dict]:
+        main_content = root
+        for lookup in (self._first_main, self._first_article, self._first_content_div):
+            found = lookup(root)
+            if found:
+                main_content = found[0]
+                break
+
+        links = []
+        for link in self._links_with_href(main_content):
+            href = link.get('href', '').strip()
+            text = self._text(link)
+            if not is_article_href(href, text, issue_url):
+                continue
+
+            # Skip navigation and footer links (checks up to 3 levels up)
+            parent_classes = set()
+            parent = link.getparent()
+            for _ in range(3):
+                if parent is None:
+                    break
+                parent_classes.update((parent.get('class') or '').split())
+                parent = parent.getparent()
+
+            if SKIP_PARENT_CLASSES.intersection(parent_classes):
+                continue
+
+            links.append({
+                'title': text,
+                'url': normalize_url(href, issue_url),
+                'description': self._description(link, text)
+            })
+
+        return links
+
+    def _description(self, link, link_text: str) -> str:
+        """Text after the link in its paragraph, else the next sibling's text."""
+        description = ""
+
+        parent = link.getparent()
+        if parent is not None and parent.tag == 'p':
+            description = description_after_link(self._text(parent), link_text)
+
+        if not description:
+            description = self._next_sibling_text(link)
+
+        if not description and parent is not None:
+            description = self._next_sibling_text(parent)
+
+        return description[:MAX_DESCRIPTION_LENGTH]
+
+    def _next_sibling_text(self, element) -> str:
+        """Stripped text of the node following an element (its tail, else the next element)."""
+        if element.tail:
+            return element.tail.strip()
+
+        sibling = element.getnext()
+        if sibling is None or not isinstance(sibling.tag, str):
+            # Comments and processing instructions have no text
+            return ""
+        return self._text(sibling)
+
+    def _text(self, element) -> str:
+        """Equivalent of BeautifulSoup's get_text(strip=True)."""
+        return ''.join(
+            stripped for stripped in (s.strip() for s in self._strings(element, top=True)) if stripped
+        )
+
+    def _strings(self, element, top: bool = True) -> Iterator[str]:
+        """Text nodes under an element, in document order, without its own tail."""
+        if element.text and (top or element.tag not in self.NON_TEXT_TAGS):
+            yield element.text
+        for child in element:
+            if isinstance(child.tag, str):
+                yield from self._strings(child, top=False)
+            if child.tail:
+                yield child.tail
+
+
+PARSER_BACKENDS = {
+    'lxml': LxmlIssueParser,
+    'soup': SoupIssueParser,
+}
+
+
+def get_issue_parser(backend: str = 'auto') -> IssueParser:
+    """
+    Create an issue parser.
+
+    Args:
+        backend: 'lxml', 'soup', or 'auto' (lxml when installed, else soup)
+
+    Returns:
+        IssueParser instance
+    """
+    if backend == 'auto':
+        backend = 'lxml' if etree is not None else 'soup'
+
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend}")
+    return PARSER_BACKENDS[backend]()
@@ -1,81 +1,206 @@
 """PDF document adapter."""
-import requests
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
-from datetime import datetime
+from typing import BinaryIO, Iterator, Optional
 from PyPDF2 import PdfReader
 from .base_adapter import BaseAdapter, ExtractionError
-from models.raw_content import RawContent, RawContentBatch
-from python_shared.utils import generate_id
+from models.raw_content import ITEM_KEY, RawContent, RawContentBatch
+from python_shared.utils import content_id
+
+
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+DEFAULT_MAX_PAGES = 1000
+DEFAULT_PAGES_PER_SECTION = 20
+PARALLEL_MIN_PAGES = 40  # Smaller documents aren't worth starting a process pool
+SPOOL_MAX_SIZE = 8 * 1024 * 1024  # Downloads larger than this spill to disk
+
+# Reader opened once per worker process by _init_worker
+_worker_reader: Optional[PdfReader] = None
+
+
+def _init_worker(pdf_path: str) -> None:
+    """Open the PDF once in each worker process."""
+    global _worker_reader
+    _worker_reader = PdfReader(pdf_path)
+
+
+def _extract_page_range(page_range: tuple[int, int]) -> str:
+    """Extract text for pages [start, end) in a worker process."""
+    start, end = page_range
+    return "\n\n".join(
+        _worker_reader.pages[i].extract_text() or "" for i in range(start, end)
+    )
 
 
 class PDFAdapter(BaseAdapter):
-    """Adapter for PDF documents."""
-    
+    """
+    Adapter for PDF documents.
+
+    Remote PDFs are streamed into a spooled temp file (in memory while
+    small, on disk beyond that) with a byte cap. Pages are grouped into
+    sections and each section becomes its own RawContent item, yielded
+    by iter_batches() as soon as it is extracted, so the ingestor writes
+    long documents incrementally rather than as one huge string. Large
+    documents are extracted on a process pool.
+
+    Config:
+        max_bytes: Maximum PDF size in bytes (default 100 MB)
+        max_pages: Pages beyond this are ignored (default 1000)
+        pages_per_section: Pages per emitted item (default 20)
+        pdf_workers: Worker processes for page extraction (default: CPUs, max 4)
+    """
+
     @property
     def adapter_type(self) -> str:
         return "pdf"
-    
+
     def validate_url(self, url: str) -> bool:
         """Check if URL points to a PDF."""
         return url.lower().endswith('.pdf')
-    
+
     def extract(self, url: str) -> RawContentBatch:
         """Extract text from PDF."""
+        items = [item for batch in self.iter_batches(url) for item in batch.items]
+        return RawContentBatch(
+            items=items,
+            total=len(items),
+            source_type=self.adapter_type
+        )
+
+    def iter_batches(self, url: str) -> Iterator[RawContentBatch]:
+        """Yield each section as its own batch as soon as its pages are extracted."""
+        sections = 0
         try:
-            # Download PDF if it's a URL
-            if url.startswith(('http://', 'https://')):
-                response = requests.get(url, timeout=60)
-                response.raise_for_status()
-                
-                # Save temporarily
-                temp_path = Path(f"/tmp/{generate_id()}.pdf")
-                temp_path.write_bytes(response.content)
-                pdf_path = temp_path
-            else:
-                pdf_path = Path(url)
-            
-            # Extract text
-            reader = PdfReader(pdf_path)
-            
+            for item in self.iter_sections(url):
+                sections += 1
+                yield RawContentBatch(items=[item], total=1, source_type=self.adapter_type)
+        except ExtractionError:
+            raise
+        except Exception as e:
+            raise ExtractionError(f"PDF extraction failed: {str(e)}")
+
+        if not sections:
+            raise ExtractionError("No text could be extracted from PDF")
+
+    def iter_sections(self, url: str) -> Iterator[RawContent]:
+        """
+        Yield one RawContent per section of pages, in page order.
+
+        Temp files are removed even if extraction fails part way.
+        """
+        max_pages = self.config.get('max_pages', DEFAULT_MAX_PAGES)
+        pages_per_section = max(1, self.config.get('pages_per_section', DEFAULT_PAGES_PER_SECTION))
+
+        with ExitStack() as stack:
+            stream, pdf_path = self._open(url, stack)
+            reader = PdfReader(stream)
+
             # Extract metadata
             metadata = reader.metadata
-            title = metadata.title if metadata and metadata.title else pdf_path.stem
+            title = metadata.title if metadata and metadata.title else Path(url).stem
             author = metadata.author if metadata and metadata.author else None
-            
-            # Extract text from all pages
-            text_content = []
-            for page in reader.pages:
-                text_content.append(page.extract_text())
-            
-            content = "\n\n".join(text_content)
-            
-            if not content.strip():
-                raise ExtractionError("No text could be extracted from PDF")
-            
-            raw_content = RawContent(
-                id=generate_id(),
-                source_type=self.adapter_type,
-                source_url=url,
-                title=title,
-                content=content,
-                author=author,
-                metadata={
-                    'pages': len(reader.pages),
-                    'creator': metadata.creator if metadata and metadata.creator else None,
-                    'producer': metadata.producer if metadata and metadata.producer else None,
-                }
-            )
-            
-            # Clean up temp file
-            if url.startswith(('http://', 'https://')):
-                temp_path.unlink(missing_ok=True)
-            
-            return RawContentBatch(
-                items=[raw_content],
-                total=1,
-                source_type=self.adapter_type
-            )
-            
-        except Exception as e:
-            raise ExtractionError(f"PDF extraction failed: {str(e)}")
 
+            total_pages = len(reader.pages)
+            page_count = min(total_pages, max_pages)
+            ranges = [
+                (start, min(start + pages_per_section, page_count))
+                for start in range(0, page_count, pages_per_section)
+            ]
+
+            texts = self._iter_section_texts(reader, stream, pdf_path, ranges, stack)
+            for index, ((start, end), text) in enumerate(zip(ranges, texts, strict=True)):
+                if not text.strip():
+                    continue
+
+                section_title = title if len(ranges) == 1 else f"{title} (pages {start + 1}-{end})"
+                yield RawContent(
+                    id=content_id(url, section_title, text),
+                    source_type=self.adapter_type,
+                    source_url=url,
+                    title=section_title,
+                    content=text,
+                    author=author,
+                    metadata={
+                        # Sections share the PDF's URL; the first page keys
+                        # each one in the seen index
+                        ITEM_KEY: f"page={start + 1}",
+                        'pages': total_pages,
+                        'page_start': start + 1,
+                        'page_end': end,
+                        'section': index + 1,
+                        'sections': len(ranges),
+                        'truncated': total_pages > page_count,
+                        'creator': metadata.creator if metadata and metadata.creator else None,
+                        'producer': metadata.producer if metadata and metadata.producer else None,
+                    }
+                )
+
+    def _open(self, url: str, stack: ExitStack) -> tuple[BinaryIO, Optional[Path]]:
+        """
+        Open the PDF as a seekable stream.
+
+        Returns:
+            (stream, path on disk or None if the PDF is only held in a spool)
+        """
+        max_bytes = self.config.get('max_bytes', DEFAULT_MAX_BYTES)
+
+        if not url.startswith(('http://', 'https://')):
+            pdf_path = Path(url)
+            if pdf_path.stat().st_size > max_bytes:
+                raise ExtractionError(f"PDF exceeds {max_bytes} bytes")
+            return stack.enter_context(open(pdf_path, 'rb')), pdf_path
+
+        spool = stack.enter_context(tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE))
+        self.http.download(url, spool, max_bytes=max_bytes, timeout=60)
+        spool.seek(0)
+        return spool, None
+
+    def _iter_section_texts(
+        self,
+        reader: PdfReader,
+        stream: BinaryIO,
+        pdf_path: Optional[Path],
+        ranges: list[tuple[int, int]],
+        stack: ExitStack
+    ) -> Iterator[str]:
+        """Yield the text of each page range, in order."""
+        page_count = ranges[-1][1] if ranges else 0
+        workers = self.config.get('pdf_workers', min(4, os.cpu_count() or 1))
+
+        if workers <= 1 or len(ranges) <= 1 or page_count < PARALLEL_MIN_PAGES:
+            for start, end in ranges:
+                yield "\n\n".join(
+                    reader.pages[i].extract_text() or "" for i in range(start, end)
+                )
+            return
+
+        # Worker processes open the file themselves, so a spooled download
+        # is copied to a named temp file first
+        if pdf_path is None:
+            pdf_path = self._spill_to_disk(stream, stack)
+
+        # Spawned, not forked: extraction runs on ingest worker threads and
+        # a fork would copy their locks, sockets and SQLite connections
+        executor = stack.enter_context(ProcessPoolExecutor(
+            max_workers=min(workers, len(ranges)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(pdf_path),)
+        ))
+        yield from executor.map(_extract_page_range, ranges)
+
+    @staticmethod
+    def _spill_to_disk(stream: BinaryIO, stack: ExitStack) -> Path:
+        """Copy a stream to a named temp file that is removed when the stack closes."""
+        handle, name = tempfile.mkstemp(suffix='.pdf')
+        path = Path(name)
+        stack.callback(path.unlink, missing_ok=True)
+        with os.fdopen(handle, 'wb') as f:
+            stream.seek(0)
+            shutil.copyfileobj(stream, f)
+        return path
@@ -1,11 +1,16 @@
 """RSS feed adapter."""
 import feedparser
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from typing import Optional
 from .base_adapter import BaseAdapter, ExtractionError
 from .article_adapter import ArticleAdapter
-from models.raw_content import RawContent, RawContentBatch
-from python_shared.utils import generate_id
+from models.raw_content import ITEM_KEY, RawContent, RawContentBatch
+from python_shared.utils import content_id
+
+
+logger = logging.getLogger("patchbay.rss")
 
 
 class RSSAdapter(BaseAdapter):
@@ -35,15 +40,26 @@ class RSSAdapter(BaseAdapter):
     def extract(self, url: str) -> RawContentBatch:
         """Extract entries from RSS feed."""
         try:
-            feed = feedparser.parse(url)
+            # Fetch through the shared client so the feed download gets a
+            # timeout and a pooled connection, then parse the bytes
+            response = self.http.fetch(url, commit=not self.skip_unchanged)
+            if response.not_modified and self.skip_unchanged:
+                return self.not_modified_batch()
+            
+            feed = feedparser.parse(
+                response.content,
+                response_headers={k.lower(): v for k, v in response.headers.items()}
+            )
             
             if feed.bozo:  # Feed parsing error
                 raise ExtractionError(f"Failed to parse RSS feed: {feed.bozo_exception}")
             
-            items = []
-            article_adapter = ArticleAdapter()  # For fetching full content from linked pages
+            # Fetch linked issue pages in parallel; results come back keyed by
+            # entry index so output keeps feed order
+            full_contents = self._fetch_full_contents(feed.entries, url)
             
-            for entry in feed.entries:
+            items = []
+            for index, entry in enumerate(feed.entries):
                 entry_url = entry.link if hasattr(entry, 'link') else url
                 
                 # Extract published date
@@ -51,43 +67,37 @@ class RSSAdapter(BaseAdapter):
                 if hasattr(entry, 'published_parsed') and entry.published_parsed:
                     published_date = datetime(*entry.published_parsed[:6])
                 
-                # Try to get full content from the linked page if it's an issue/article page
-                content = ""
                 source_type = self.adapter_type
-                
-                # Check if this entry links to an issue page that we can extract full content from
-                if '/issues/' in entry_url and entry_url.split('/issues/')[-1].isdigit():
-                    try:
-                        # Use article adapter to get full content
-                        article_batch = article_adapter.extract(entry_url)
-                        if article_batch.items:
-                            # Use the full extracted content
-                            article_item = article_batch.items[0]
-                            content = article_item.content
-                            source_type = "article"  # Mark as article since we extracted full content
-                    except Exception as e:
-                        # Fall back to RSS content if article extraction fails
-                        content = self._get_rss_content(entry)
-                        content = self._clean_html(content)
+                if index in full_contents:
+                    # Use the full extracted content from the linked page
+                    content = full_contents[index]
+                    source_type = "article"  # Mark as article since we extracted full content
                 else:
-                    # Use RSS feed content for non-issue links
+                    # Use RSS feed content for non-issue links, or when the
+                    # linked page failed or missed the feed deadline
                     content = self._get_rss_content(entry)
                     content = self._clean_html(content)
                 
+                title = entry.title if hasattr(entry, 'title') else "Untitled"
+                metadata = {
+                    'feed_title': feed.feed.title if hasattr(feed.feed, 'title') else None,
+                    'feed_url': url,
+                    'tags': [tag.term for tag in entry.tags] if hasattr(entry, 'tags') else [],
+                    'extracted_from_feed': True
+                }
+                if not hasattr(entry, 'link'):
+                    # Entries without a link share the feed URL; tell them
+                    # apart in the seen index by their guid (or title)
+                    metadata[ITEM_KEY] = entry.get('id') or title
                 raw_content = RawContent(
-                    id=generate_id(),
+                    id=content_id(entry_url, title, content),
                     source_type=source_type,
                     source_url=entry_url,
-                    title=entry.title if hasattr(entry, 'title') else "Untitled",
+                    title=title,
                     content=content,
                     author=entry.author if hasattr(entry, 'author') else None,
                     published_date=published_date,
-                    metadata={
-                        'feed_title': feed.feed.title if hasattr(feed.feed, 'title') else None,
-                        'feed_url': url,
-                        'tags': [tag.term for tag in entry.tags] if hasattr(entry, 'tags') else [],
-                        'extracted_from_feed': True
-                    }
+                    metadata=metadata
                 )
                 items.append(raw_content)
             
@@ -100,6 +110,72 @@ class RSSAdapter(BaseAdapter):
         except Exception as e:
             raise ExtractionError(f"RSS extraction failed: {str(e)}")
     
+    def _fetch_full_contents(self, entries: list, feed_url: str) -> dict[int, str]:
+        """
+        Fetch full content for entries that link to issue pages.
+        
+        Pages are extracted on a bounded worker pool. Anything that fails or
+        is still running when the per-feed deadline passes is left out, so
+        those entries fall back to their RSS content. The feed response is
+        then not cached, so the next run fetches the feed again and retries
+        those pages instead of skipping the unchanged feed.
+        
+        Config:
+            article_workers: Maximum concurrent page fetches (default 8)
+            article_deadline: Seconds allowed for all pages of a feed (default 60)
+        
+        Returns:
+            Dictionary mapping entry index to extracted page content
+        """
+        targets = {}
+        for index, entry in enumerate(entries):
+            entry_url = entry.link if hasattr(entry, 'link') else feed_url
+            if '/issues/' in entry_url and entry_url.split('/issues/')[-1].isdigit():
+                targets[index] = entry_url
+        
+        if not targets:
+            return {}
+        
+        # The feed changed, so unchanged linked pages are parsed from the cached copy
+        article_adapter = ArticleAdapter({
+            'http_client': self.http,
+            'skip_unchanged': False
+        })
+        max_workers = min(self.config.get('article_workers', 8), len(targets))
+        deadline = self.config.get('article_deadline', 60)
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rss-article")
+        try:
+            futures = {
+                executor.submit(article_adapter.extract, entry_url): index
+                for index, entry_url in targets.items()
+            }
+            done, not_done = wait(futures, timeout=deadline)
+            
+            if not_done:
+                logger.warning(
+                    f"{len(not_done)} linked pages in {feed_url} missed the "
+                    f"{deadline}s deadline, using RSS content"
+                )
+            
+            contents = {}
+            for future in done:
+                index = futures[future]
+                try:
+                    article_batch = future.result()
+                except Exception as e:
+                    logger.debug(f"Full content extraction failed for {targets[index]}: {e}")
+                    continue
+                if article_batch.items:
+                    contents[index] = article_batch.items[0].content
+            
+            if len(contents) < len(targets):
+                self.http.discard_cache(feed_url)
+            return contents
+        finally:
+            # Don't wait on pages that missed the deadline
+            executor.shutdown(wait=False, cancel_futures=True)
+    
     def _get_rss_content(self, entry) -> str:
         """Extract content from RSS entry."""
         if hasattr(entry, 'content') and entry.content:
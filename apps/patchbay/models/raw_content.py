@@ -4,6 +4,11 @@ from datetime import datetime
 from typing import Optional
 
 
+# Metadata key for items that share a source_url with other items (PDF
+# sections, feed entries without a link): a stable key that tells them apart
+ITEM_KEY = 'item_key'
+
+
 class RawContent(BaseModel):
     """
     Normalized raw content output from Patchbay.
@@ -32,4 +37,5 @@ class RawContentBatch(BaseModel):
     total: int
     source_type: str
     extracted_at: datetime = Field(default_factory=datetime.utcnow)
+    not_modified: bool = False  # Source answered 304, nothing was re-extracted
 
@@ -0,0 +1,101 @@
+"""Benchmark text normalization throughput in MB/s."""
+from pathlib import Path
+import argparse
+import random
+import re
+import sys
+import time
+
+# Add parent directory to path so we can import src and models
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.raw_content import RawContent
+from src.normalizer import ContentNormalizer
+
+
+WORDS = (
+    "javascript typescript runtime bundler module async await promise "
+    "component render state effect server edge worker stream buffer"
+).split()
+
+
+def legacy_clean_text(text: str) -> str:
+    """The original three-pass cleaner, kept for comparison."""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[\x00-\x08\x0b-\x0c\x0e-\x1f\x7f]', '', text)
+    text = re.sub(r'\n\s*\n', '\n\n', text)
+    return text.strip()
+
+
+def make_document(size: int, rng: random.Random) -> str:
+    """Build a document of roughly size characters with messy whitespace."""
+    parts = []
+    length = 0
+    while length < size:
+        sentence = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 20)))
+        separator = rng.choice([' ', '  ', '\n', '\n\n', ' \n \n ', '\t', '\r\n', '\x0c'])
+        parts.append(sentence + separator)
+        length += len(sentence) + len(separator)
+    return ''.join(parts)
+
+
+def make_batch(documents: int, doc_size: int, seed: int) -> list[RawContent]:
+    rng = random.Random(seed)
+    return [
+        RawContent(
+            id=str(i),
+            source_type="benchmark",
+            source_url=f"https://example.com/{i}",
+            title=f"Document {i}",
+            content=make_document(doc_size, rng)
+        )
+        for i in range(documents)
+    ]
+
+
+def report(label: str, megabytes: float, seconds: float) -> None:
+    print(f"{label:<28} {seconds:8.3f}s  {megabytes / seconds:8.1f} MB/s")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark ContentNormalizer throughput')
+    parser.add_argument('--documents', type=int, default=200,
+                       help='Number of documents in the batch')
+    parser.add_argument('--doc-size', type=int, default=50_000,
+                       help='Approximate characters per document')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes for normalize_many (default: CPU count)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    batch = make_batch(args.documents, args.doc_size, args.seed)
+    texts = [item.content for item in batch]
+    megabytes = sum(len(text.encode('utf-8')) for text in texts) / (1024 * 1024)
+    print(f"Batch: {args.documents} documents, {megabytes:.1f} MB\n")
+
+    start = time.perf_counter()
+    for text in texts:
+        legacy_clean_text(text)
+    report("legacy (3 passes)", megabytes, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for text in texts:
+        ContentNormalizer._clean_text(text)
+    report("single pass", megabytes, time.perf_counter() - start)
+
+    normalizer = ContentNormalizer(workers=args.workers)
+    try:
+        start = time.perf_counter()
+        normalizer.normalize_many(make_batch(args.documents, args.doc_size, args.seed))
+        report("normalize_many (cold pool)", megabytes, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        normalizer.normalize_many(batch)
+        report("normalize_many", megabytes, time.perf_counter() - start)
+    finally:
+        normalizer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Benchmark raw storage layouts: one file per item vs JSONL segments."""
+from datetime import datetime
+from pathlib import Path
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Add parent directory to path so we can import src and models
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from python_shared.file_io import DataReader, DataWriter
+
+
+WORDS = (
+    "javascript typescript runtime bundler module async await promise "
+    "component render state effect server edge worker stream buffer"
+).split()
+
+LAYOUTS = {
+    'files': dict(raw_layout='files'),
+    'partitioned': dict(raw_layout='partitioned'),
+    'segments': dict(raw_layout='segments'),
+    'segments+gzip': dict(raw_layout='segments', compress_segments=True),
+}
+
+
+def make_batches(items: int, batch_size: int, content_size: int, seed: int) -> list[dict]:
+    """Synthetic RSS-style batches of raw items."""
+    rng = random.Random(seed)
+    batches = []
+    for start in range(0, items, batch_size):
+        batch_items = []
+        for i in range(start, min(start + batch_size, items)):
+            content = ' '.join(rng.choice(WORDS) for _ in range(content_size // 8))
+            batch_items.append({
+                'id': f"item{i:08d}",
+                'source_type': 'rss',
+                'source_url': f"https://example.com/posts/{i}",
+                'title': f"Post {i}",
+                'content': content,
+                'author': None,
+                'published_date': None,
+                'extracted_date': datetime.utcnow().isoformat(),
+                'metadata': {'feed_url': 'https://example.com/feed'},
+            })
+        batches.append({'items': batch_items, 'total': len(batch_items), 'source_type': 'rss'})
+    return batches
+
+
+def disk_usage(path: Path) -> tuple[int, int]:
+    """(file count, bytes allocated on disk) under a directory."""
+    files = 0
+    allocated = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            files += 1
+            allocated += os.stat(os.path.join(root, name)).st_blocks * 512
+    return files, allocated
+
+
+def run_layout(name: str, options: dict, batches: list[dict], ids: list[str], work_dir: Path) -> None:
+    data_dir = work_dir / name
+    writer = DataWriter(base_path=data_dir, **options)
+
+    start = time.perf_counter()
+    for batch in batches:
+        writer.write_raw(batch, 'rss', per_item=True)
+    write_seconds = time.perf_counter() - start
+
+    files, allocated = disk_usage(data_dir / "raw")
+
+    reader = DataReader(base_path=data_dir)
+    start = time.perf_counter()
+    scanned = sum(1 for _ in reader.iter_raw())
+    scan_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for item_id in ids:
+        reader.read_raw_item(item_id)
+    lookup_ms = (time.perf_counter() - start) * 1000 / len(ids)
+
+    print(
+        f"{name:<14} write {write_seconds:7.2f}s  files {files:>7}  "
+        f"disk {allocated / (1024 * 1024):8.1f} MB  scan {scanned} items in {scan_seconds:6.2f}s  "
+        f"lookup {lookup_ms:7.3f} ms"
+    )
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark raw storage layouts')
+    parser.add_argument('--items', type=int, default=100_000,
+                       help='Number of raw items to write')
+    parser.add_argument('--batch-size', type=int, default=50,
+                       help='Items per write_raw call (roughly one feed run)')
+    parser.add_argument('--content-size', type=int, default=2000,
+                       help='Approximate characters of content per item')
+    parser.add_argument('--lookups', type=int, default=200,
+                       help='Random lookups by id per layout')
+    parser.add_argument('--layouts', nargs='+', choices=list(LAYOUTS), default=list(LAYOUTS))
+    parser.add_argument('--work-dir', type=Path, default=None,
+                       help='Directory for benchmark data (default: a temp dir, removed afterwards)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    batches = make_batches(args.items, args.batch_size, args.content_size, args.seed)
+    rng = random.Random(args.seed)
+    ids = [f"item{rng.randrange(args.items):08d}" for _ in range(args.lookups)]
+
+    work_dir = args.work_dir or Path(tempfile.mkdtemp(prefix="raw-layout-"))
+    print(f"{args.items} items in batches of {args.batch_size}, working in {work_dir}\n")
+    try:
+        for name in args.layouts:
+            run_layout(name, LAYOUTS[name], batches, ids, work_dir)
+    finally:
+        if args.work_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Check that the JavaScript Weekly parser backends agree on saved issue pages."""
+from pathlib import Path
+import argparse
+import sys
+import time
+
+# Add parent directory to path so we can import adapters and models
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from adapters.javascript_weekly_parsers import ParsedIssue, get_issue_parser
+from python_shared.http_client import get_default_client
+
+
+DEFAULT_FIXTURES_DIR = Path(__file__).parent.parent / 'tests' / 'fixtures' / 'javascript_weekly'
+
+def fixture_url(path: Path) -> str:
+    """Issue URL a saved page was fetched from (fixtures are named <issue>.html)."""
+    return f"https://javascriptweekly.com/issues/{path.stem}"
+
+
+def save_fixtures(urls: list[str], fixtures_dir: Path) -> None:
+    """Download issue pages into fixtures_dir as <issue>.html."""
+    fixtures_dir.mkdir(parents=True, exist_ok=True)
+    client = get_default_client()
+    for url in urls:
+        number = url.rstrip('/').split('/')[-1]
+        response = client.fetch(url, use_cache=False)
+        (fixtures_dir / f"{number}.html").write_text(response.text, encoding='utf-8')
+        print(f"Saved {url}")
+
+
+def diff_issues(expected: ParsedIssue, actual: ParsedIssue) -> list[str]:
+    """Human-readable differences between two parse results."""
+    diffs = []
+    if expected.title != actual.title:
+        diffs.append(f"title: {expected.title!r} != {actual.title!r}")
+    if expected.date != actual.date:
+        diffs.append(f"date: {expected.date} != {actual.date}")
+    if len(expected.links) != len(actual.links):
+        diffs.append(f"links: {len(expected.links)} != {len(actual.links)}")
+    for i, (a, b) in enumerate(zip(expected.links, actual.links, strict=False)):
+        for key in ('title', 'url', 'description'):
+            if a[key] != b[key]:
+                diffs.append(f"link {i} {key}: {a[key]!r} != {b[key]!r}")
+    return diffs
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Compare JavaScript Weekly parser backends')
+    parser.add_argument('fixtures_dir', type=Path, nargs='?', default=DEFAULT_FIXTURES_DIR,
+                       help='Directory of saved issue pages named <issue>.html '
+                            '(default: the test fixtures)')
+    parser.add_argument('--fetch', nargs='+', metavar='URL', default=[],
+                       help='Download these issue pages into the fixtures directory first')
+    parser.add_argument('--backend', default='lxml',
+                       help='Backend to compare against the BeautifulSoup reference')
+    parser.add_argument('--repeat', type=int, default=3,
+                       help='Parses per page when timing')
+    args = parser.parse_args()
+
+    if args.fetch:
+        save_fixtures(args.fetch, args.fixtures_dir)
+
+    fixtures = sorted(args.fixtures_dir.glob('*.html'))
+    if not fixtures:
+        print(f"No fixtures found in {args.fixtures_dir}")
+        sys.exit(1)
+
+    reference = get_issue_parser('soup')
+    candidate = get_issue_parser(args.backend)
+    timings = {reference.name: 0.0, candidate.name: 0.0}
+    mismatches = 0
+
+    for path in fixtures:
+        html = path.read_text(encoding='utf-8')
+        url = fixture_url(path)
+
+        results = {}
+        for backend in (reference, candidate):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                results[backend.name] = backend.parse(html, url)
+            timings[backend.name] += (time.perf_counter() - start) / args.repeat
+
+        diffs = diff_issues(results[reference.name], results[candidate.name])
+        if diffs:
+            mismatches += 1
+            print(f"✗ {path.name}: {len(diffs)} differences")
+            for line in diffs[:10]:
+                print(f"    {line}")
+        else:
+            print(f"✓ {path.name}: {len(results[reference.name].links)} links match")
+
+    print(f"\n{len(fixtures) - mismatches}/{len(fixtures)} pages identical")
+    for name, seconds in timings.items():
+        print(f"{name:<6} {seconds * 1000 / len(fixtures):8.2f} ms/page")
+    if timings[candidate.name]:
+        print(f"speedup {timings[reference.name] / timings[candidate.name]:.1f}x")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
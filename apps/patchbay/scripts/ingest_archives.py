@@ -1,42 +1,55 @@
 """Script to scrape JavaScript Weekly archives and ingest all issues."""
-import requests
 from bs4 import BeautifulSoup
-import sys
-import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
-import time
+import json
+import os
+import sys
+import threading
+
+# Add parent directory to path so we can import adapters and models
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from dotenv import load_dotenv
+from python_shared.http_client import get_default_client, set_default_client
 from python_shared.logging_config import setup_logging
+from python_shared.rate_limit import TokenBucket
+from src.ingest import Ingestor, build_http_client, build_writer
 
 logger = setup_logging("ingest_archives", "INFO")
 
 
+def issue_number(url: str) -> int:
+    """Return the issue number of an issue URL."""
+    return int(url.rstrip('/').split('/issues/')[-1])
+
+
 def extract_issue_urls(archives_url: str) -> list[str]:
     """
     Extract all issue URLs from JavaScript Weekly archives page.
-    
+
     Args:
         archives_url: URL to the archives page
-        
+
     Returns:
-        List of issue URLs
+        List of issue URLs, oldest issue first
     """
     logger.info(f"Fetching archives page: {archives_url}")
-    
+
     try:
-        response = requests.get(archives_url, timeout=30)
-        response.raise_for_status()
-        
+        response = get_default_client().fetch(archives_url)
+
         soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find all links that point to issues
-        issue_urls = []
-        
+
+        # Find all links that point to issues, keyed by issue number
+        issue_urls: dict[int, str] = {}
+
         # Look for links in the archives list
         # JavaScript Weekly issue links are like "issues/766" or "/issues/766"
         for link in soup.find_all('a', href=True):
             href = link.get('href', '').strip()
-            
+
             # Match issue URLs - can be "issues/766" or "/issues/766"
             if ('issues/' in href or '/issues/' in href) and href not in ('/issues', 'issues', '/issues/'):
                 # Convert to full URL if needed
@@ -47,119 +60,263 @@ def extract_issue_urls(archives_url: str) -> list[str]:
                 else:
                     # Handle relative URLs like "issues/766"
                     full_url = f"https://javascriptweekly.com/{href}"
-                
+
                 # Remove any fragments or query params
                 full_url = full_url.split('#')[0].split('?')[0]
-                
+
                 # Ensure it's a valid issue URL (has a number after issues/)
                 if '/issues/' in full_url and full_url.split('/issues/')[-1].isdigit():
-                    if full_url not in issue_urls:
-                        issue_urls.append(full_url)
-        
-        # Sort URLs (newest first typically)
-        issue_urls.sort(reverse=True)
-        
-        logger.info(f"Found {len(issue_urls)} issue URLs")
-        return issue_urls
-        
+                    issue_urls.setdefault(issue_number(full_url), full_url)
+
+        # Oldest first, so the checkpoint can advance as issues complete
+        ordered = [issue_urls[number] for number in sorted(issue_urls)]
+
+        logger.info(f"Found {len(ordered)} issue URLs")
+        return ordered
+
     except Exception as e:
         logger.error(f"Failed to scrape archives: {e}")
         return []
 
 
-def ingest_url(url: str) -> bool:
+class BackfillCheckpoint:
     """
-    Ingest a single URL using patchbay.
-    
+    Persisted progress of an archive backfill.
+
+    highest_issue is a watermark: every issue up to and including it has
+    been attempted. Issues that failed are remembered separately so they
+    can be retried without re-running the whole backfill.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.highest_issue = 0
+        self.failed: set[int] = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.highest_issue = data.get('highest_issue', 0)
+        self.failed = set(data.get('failed', []))
+
+    def save(self) -> None:
+        """Write the checkpoint atomically."""
+        with self._lock:
+            data = {
+                'highest_issue': self.highest_issue,
+                'failed': sorted(self.failed),
+                'updated_at': datetime.utcnow().isoformat(),
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def reset(self) -> None:
+        """Forget all progress."""
+        self.highest_issue = 0
+        self.failed = set()
+
+
+class IssueWatermark:
+    """
+    Tracks out-of-order completions and advances the checkpoint only over
+    a contiguous run of finished issues, so a crash never skips an issue
+    that was still in flight.
+    """
+
+    def __init__(self, checkpoint: BackfillCheckpoint, issues: list[int]):
+        self.checkpoint = checkpoint
+        self._pending = sorted(issues)
+        self._finished: set[int] = set()
+        self._lock = threading.Lock()
+
+    def finish(self, issue: int, success: bool) -> None:
+        """Record an attempted issue and persist any progress."""
+        with self._lock:
+            self._finished.add(issue)
+            if success:
+                self.checkpoint.failed.discard(issue)
+            else:
+                self.checkpoint.failed.add(issue)
+
+            advanced = False
+            while self._pending and self._pending[0] in self._finished:
+                done = self._pending.pop(0)
+                self._finished.discard(done)
+                if done > self.checkpoint.highest_issue:
+                    self.checkpoint.highest_issue = done
+                advanced = True
+
+        if advanced or not success:
+            self.checkpoint.save()
+
+
+def select_issues(
+    issue_urls: list[str],
+    checkpoint: BackfillCheckpoint,
+    retry_failed: bool
+) -> list[str]:
+    """Issues newer than the checkpoint, plus previously failed ones if asked."""
+    selected = []
+    for url in issue_urls:
+        number = issue_number(url)
+        if number > checkpoint.highest_issue or (retry_failed and number in checkpoint.failed):
+            selected.append(url)
+    return selected
+
+
+def backfill(
+    ingestor: Ingestor,
+    issue_urls: list[str],
+    checkpoint: BackfillCheckpoint,
+    rate: float,
+    burst: float,
+    concurrency: int
+) -> tuple[int, int]:
+    """
+    Ingest issues in-process with bounded concurrency and a rate limit.
+
     Args:
-        url: URL to ingest
-        
+        ingestor: Ingestor shared by every worker thread; its ingest() and
+            flush() are safe to call concurrently
+        issue_urls: Issue URLs to ingest, oldest first
+        checkpoint: Checkpoint updated as issues complete
+        rate: Issues started per second
+        burst: Issues that may start back-to-back
+        concurrency: Maximum issues in flight
+
     Returns:
-        True if successful, False otherwise
+        (successful, failed) counts
     """
-    try:
-        # Run patchbay ingest-source command
-        workspace_root = Path(__file__).parent.parent.parent.parent
-        result = subprocess.run(
-            ['nx', 'run', 'patchbay:ingest-source', '--', url],
-            cwd=workspace_root,
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        
-        if result.returncode == 0:
-            logger.info(f"✓ Successfully ingested: {url}")
-            return True
-        else:
-            logger.warning(f"✗ Failed to ingest: {url}")
-            logger.debug(f"Error: {result.stderr}")
+    bucket = TokenBucket(rate, burst)
+    watermark = IssueWatermark(checkpoint, [issue_number(url) for url in issue_urls])
+    successful = 0
+    failed = 0
+
+    def ingest_issue(url: str) -> bool:
+        bucket.acquire()
+        try:
+            if ingestor.ingest(url) is None:
+                return False
+        except Exception as e:
+            logger.error(f"Error ingesting {url}: {e}")
             return False
-            
-    except Exception as e:
-        logger.error(f"Error ingesting {url}: {e}")
-        return False
+
+        # The checkpoint may only pass issues whose items are on disk
+        try:
+            ingestor.flush()
+        except Exception as e:
+            logger.error(f"Failed to write items of {url}: {e}")
+            return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="backfill") as executor:
+        futures = {executor.submit(ingest_issue, url): url for url in issue_urls}
+        for i, future in enumerate(as_completed(futures), 1):
+            url = futures[future]
+            ok = future.result()
+            watermark.finish(issue_number(url), ok)
+
+            if ok:
+                successful += 1
+                logger.info(f"[{i}/{len(issue_urls)}] ✓ Successfully ingested: {url}")
+            else:
+                failed += 1
+                logger.warning(f"[{i}/{len(issue_urls)}] ✗ Failed to ingest: {url}")
+
+    return successful, failed
 
 
 def main():
     """Main function."""
     import argparse
-    
+
+    load_dotenv()
+
     parser = argparse.ArgumentParser(description='Ingest JavaScript Weekly archives')
     parser.add_argument('archives_url', nargs='?', default='https://javascriptweekly.com/issues',
                        help='URL to the archives page')
     parser.add_argument('--yes', '-y', action='store_true',
                        help='Skip confirmation prompt')
     parser.add_argument('--limit', type=int, default=None,
-                       help='Limit the number of issues to ingest (for testing)')
-    
+                       help='Limit the number of issues to ingest, oldest first (for testing)')
+    parser.add_argument('--rate', type=float, default=2.0,
+                       help='Maximum issues started per second')
+    parser.add_argument('--burst', type=float, default=4.0,
+                       help='Issues that may start back-to-back before the rate applies')
+    parser.add_argument('--concurrency', type=int, default=4,
+                       help='Maximum issues ingested at once')
+    parser.add_argument('--retry-failed', action='store_true',
+                       help='Also retry issues that failed in earlier runs')
+    parser.add_argument('--restart', action='store_true',
+                       help='Ignore the checkpoint and ingest every issue')
+
     args = parser.parse_args()
-    
+
+    # Patchbay logs go to the same console; keep them to warnings and errors
+    setup_logging("patchbay", os.getenv("LOG_LEVEL", "WARNING"))
+
+    data_dir = os.getenv("DATA_DIR", "../../data")
+    http_client = build_http_client(data_dir)
+    set_default_client(http_client)
+
     # Extract issue URLs
     issue_urls = extract_issue_urls(args.archives_url)
-    
+
     if not issue_urls:
         logger.error("No issue URLs found")
         sys.exit(1)
-    
+
+    checkpoint = BackfillCheckpoint(Path(data_dir) / "state" / "ingest_archives.json")
+    if args.restart:
+        checkpoint.reset()
+
+    issue_urls = select_issues(issue_urls, checkpoint, args.retry_failed)
+    if not issue_urls:
+        logger.info(f"Up to date: nothing newer than issue {checkpoint.highest_issue}")
+        sys.exit(0)
+
     # Apply limit if specified
     if args.limit:
         issue_urls = issue_urls[:args.limit]
         logger.info(f"Limited to first {args.limit} issues")
-    
+
     logger.info(f"\n{'='*60}")
-    logger.info(f"Found {len(issue_urls)} issues to ingest")
+    logger.info(f"Found {len(issue_urls)} issues to ingest (checkpoint: issue {checkpoint.highest_issue})")
     logger.info(f"{'='*60}\n")
-    
+
     # Ask for confirmation if many URLs (unless --yes flag is set)
     if len(issue_urls) > 10 and not args.yes:
         response = input(f"Found {len(issue_urls)} issues. Ingest all? (y/N): ")
         if response.lower() != 'y':
             logger.info("Cancelled")
             sys.exit(0)
-    
-    # Ingest each URL
-    successful = 0
-    failed = 0
-    
-    for i, url in enumerate(issue_urls, 1):
-        logger.info(f"\n[{i}/{len(issue_urls)}] Processing: {url}")
-        
-        if ingest_url(url):
-            successful += 1
-        else:
-            failed += 1
-        
-        # Be nice to the server - add a small delay
-        if i < len(issue_urls):
-            time.sleep(1)
-    
+
+    ingestor = Ingestor(data_dir=data_dir, http_client=http_client, writer=build_writer(data_dir))
+    try:
+        successful, failed = backfill(
+            ingestor,
+            issue_urls,
+            checkpoint,
+            rate=args.rate,
+            burst=args.burst,
+            concurrency=max(1, args.concurrency)
+        )
+    finally:
+        ingestor.close()
+
     # Summary
     logger.info(f"\n{'='*60}")
     logger.info(f"SUMMARY: {successful} successful, {failed} failed out of {len(issue_urls)} total")
+    logger.info(f"Checkpoint: issue {checkpoint.highest_issue}")
     logger.info(f"{'='*60}")
 
 
 if __name__ == "__main__":
     main()
-
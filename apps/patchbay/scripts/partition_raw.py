@@ -0,0 +1,42 @@
+"""Move data/raw files into the partitioned source_type=/date= layout."""
+from pathlib import Path
+import argparse
+import os
+import sys
+
+# Add parent directory to path so we can import src and models
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+from python_shared.file_io import DataWriter
+from python_shared.logging_config import setup_logging
+
+logger = setup_logging("partition_raw", "INFO")
+
+
+def main():
+    """Main function."""
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(
+        description='Move flat data/raw files into raw/source_type=<type>/date=<YYYY-MM-DD>/'
+    )
+    parser.add_argument('--data-dir', type=Path, default=Path(os.getenv("DATA_DIR", "../../data")),
+                       help='Data directory (default: DATA_DIR)')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='Only report how many files would move')
+    args = parser.parse_args()
+
+    # Stop ingestion first: files written during the move stay flat
+    writer = DataWriter(base_path=args.data_dir, raw_layout="partitioned")
+    count = writer.partition_raw(dry_run=args.dry_run)
+
+    if args.dry_run:
+        logger.info(f"Would move {count} files into partitions")
+    else:
+        logger.info(f"Moved {count} files into partitions")
+        logger.info("Set RAW_LAYOUT=partitioned so new files are written there too")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ import logging
 from typing import Optional, List
 import requests
 from models.raw_content import RawContent
+from python_shared.http_client import HttpClient, get_default_client
 
 logger = logging.getLogger("patchbay")
 
@@ -11,13 +12,15 @@ logger = logging.getLogger("patchbay")
 class KasitaApiClient:
     """Client for interacting with Kasita API."""
     
-    def __init__(self, base_url: Optional[str] = None):
+    def __init__(self, base_url: Optional[str] = None, http_client: Optional[HttpClient] = None):
         """
         Initialize API client.
         
         Args:
             base_url: Base URL of the API (defaults to http://localhost:3333/api)
+            http_client: Shared HTTP client (defaults to the process-wide client)
         """
+        self.http = http_client or get_default_client()
         self.base_url = base_url or os.getenv("API_URL", "http://localhost:3333/api")
         if not self.base_url.endswith("/"):
             self.base_url += "/"
@@ -31,7 +34,7 @@ class KasitaApiClient:
         """
         try:
             url = f"{self.base_url}source-configs?enabled=true"
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
             response.raise_for_status()
             configs = response.json()
             logger.info(f"Fetched {len(configs)} enabled source configs from API")
@@ -65,7 +68,7 @@ class KasitaApiClient:
             }
             
             url = f"{self.base_url}ingestion/raw-content"
-            response = requests.post(url, json=dto, timeout=30)
+            response = self.http.post(url, json=dto, timeout=30)
             response.raise_for_status()
             result = response.json()
             logger.debug(f"Successfully ingested raw content: {raw_content.title}")
@@ -111,7 +114,7 @@ class KasitaApiClient:
                 dtos.append(dto)
             
             url = f"{self.base_url}ingestion/raw-content/batch"
-            response = requests.post(url, json=dtos, timeout=60)
+            response = self.http.post(url, json=dtos, timeout=60)
             response.raise_for_status()
             results = response.json()
             logger.info(f"Successfully ingested {len(results)} raw content items in batch")
@@ -1,18 +1,77 @@
 """Core ingestion logic."""
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
+from urllib.parse import urlparse
+import asyncio
 import logging
 import os
-from models.raw_content import RawContentBatch
+from models.raw_content import RawContent, RawContentBatch
 from src.router import AdapterRouter
 from src.normalizer import ContentNormalizer
 from src.api_client import KasitaApiClient
+from src.seen_index import SeenIndex, SeenStatus
+from src.near_duplicates import NearDuplicateDetector
 from python_shared.file_io import DataWriter
+from python_shared.write_behind import WriteBehindWriter
+from python_shared.http_cache import HttpCache
+from python_shared.http_client import HttpClient, get_default_client
 
 
 logger = logging.getLogger("patchbay")
 
 
+def build_http_client(data_dir: str | Path) -> HttpClient:
+    """
+    Create the shared HTTP client from environment settings.
+    
+    Unless HTTP_CACHE_ENABLED is false, the client revalidates against a
+    conditional-GET cache under <data_dir>/cache/http so unchanged feeds
+    and pages aren't re-downloaded.
+    """
+    http_cache = None
+    if os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true":
+        http_cache = HttpCache(
+            Path(data_dir) / "cache" / "http",
+            max_bytes=int(os.getenv("HTTP_CACHE_MAX_MB", "256")) * 1024 * 1024
+        )
+    
+    return HttpClient(
+        timeout=(10.0, float(os.getenv("HTTP_TIMEOUT", "30"))),
+        pool_maxsize=int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "4")),
+        cache=http_cache
+    )
+
+
+def build_writer(data_dir: str | Path) -> Union[DataWriter, WriteBehindWriter]:
+    """
+    Create the raw content writer from environment settings.
+    
+    RAW_LAYOUT=segments appends raw items to JSONL segments under
+    <data_dir>/raw/segments instead of writing one JSON file per item.
+    DATA_CODEC / DATA_COMPRESSION pick the file format for the files layout.
+    DATA_FSYNC makes commits durable. Unless RAW_WRITE_BEHIND is false,
+    writes are committed in batches on a background thread.
+    """
+    writer = DataWriter(
+        base_path=data_dir,
+        raw_layout=os.getenv("RAW_LAYOUT", "files"),
+        compress_segments=os.getenv("RAW_SEGMENT_COMPRESS", "false").lower() == "true",
+        segment_max_bytes=int(os.getenv("RAW_SEGMENT_MAX_MB", "64")) * 1024 * 1024,
+        codec=os.getenv("DATA_CODEC", "json"),
+        compression=os.getenv("DATA_COMPRESSION") or None,
+        fsync=os.getenv("DATA_FSYNC", "true").lower() == "true"
+    )
+    if os.getenv("RAW_WRITE_BEHIND", "true").lower() == "true":
+        return WriteBehindWriter(
+            writer,
+            max_batch=int(os.getenv("RAW_WRITE_BATCH", "64")),
+            max_queue=int(os.getenv("RAW_WRITE_QUEUE", "1024"))
+        )
+    return writer
+
+
 class Ingestor:
     """Handles the ingestion pipeline."""
     
@@ -21,14 +80,65 @@ class Ingestor:
         data_dir: str | Path = "data",
         min_content_length: int = 100,
         use_api: bool = True,
-        api_base_url: Optional[str] = None
+        api_base_url: Optional[str] = None,
+        max_concurrency: int = 1,
+        per_host_limit: int = 2,
+        http_client: Optional[HttpClient] = None,
+        adapter_config: Optional[dict] = None,
+        track_seen: bool = True,
+        near_duplicate_action: Optional[str] = None,
+        near_duplicate_distance: int = 3,
+        writer: Optional[Union[DataWriter, WriteBehindWriter]] = None
     ):
-        self.router = AdapterRouter()
+        """
+        Initialize the ingestor.
+        
+        Args:
+            data_dir: Base data directory for raw output
+            min_content_length: Minimum content length for an item to be kept
+            use_api: Whether to push items to the Kasita API (requires API_URL)
+            api_base_url: Base URL of the API
+            max_concurrency: Maximum number of sources ingested at once
+                (1 keeps the original sequential behaviour)
+            per_host_limit: Maximum number of concurrent sources per host
+            http_client: Shared HTTP client for adapters and the API client
+            adapter_config: Extra config passed to every adapter
+            track_seen: Skip items already ingested with identical content,
+                using the index in <data_dir>/state/seen_items.sqlite
+            near_duplicate_action: 'drop' or 'link' to detect near-duplicates
+                of already ingested content (None disables the stage)
+            near_duplicate_distance: Maximum SimHash Hamming distance for
+                two items to count as near-duplicates
+            writer: Raw content writer (defaults to one file per item); a
+                WriteBehindWriter commits in the background, call close()
+                when done
+        """
+        self.http_client = http_client or get_default_client()
+        self.router = AdapterRouter({
+            **(adapter_config or {}),
+            'http_client': self.http_client
+        })
         self.normalizer = ContentNormalizer()
-        self.writer = DataWriter(base_path=data_dir)
+        self.writer = writer or DataWriter(base_path=data_dir)
         self.min_content_length = min_content_length
         self.use_api = use_api and os.getenv("API_URL") is not None
-        self.api_client = KasitaApiClient(api_base_url) if self.use_api else None
+        self.api_client = KasitaApiClient(api_base_url, self.http_client) if self.use_api else None
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_host_limit = max(1, per_host_limit)
+        self.seen_index = (
+            SeenIndex(Path(data_dir) / "state" / "seen_items.sqlite")
+            if track_seen else None
+        )
+        if near_duplicate_action not in (None, 'drop', 'link'):
+            raise ValueError(f"Unknown near-duplicate action: {near_duplicate_action}")
+        self.near_duplicate_action = near_duplicate_action
+        self.near_duplicates = (
+            NearDuplicateDetector(
+                Path(data_dir) / "state" / "near_duplicates.sqlite",
+                max_distance=near_duplicate_distance
+            )
+            if near_duplicate_action else None
+        )
     
     def ingest(self, url: str, skip_validation: bool = False) -> Optional[RawContentBatch]:
         """
@@ -51,19 +161,106 @@ class Ingestor:
         
         logger.info(f"Using adapter: {adapter.adapter_type}")
         
-        # Extract content
-        try:
-            batch = adapter.extract(url)
-            logger.info(f"Extracted {batch.total} items")
-        except Exception as e:
-            logger.error(f"Extraction failed: {str(e)}")
+        # Each batch the adapter yields (one per section for PDFs) is
+        # written before the next one is extracted
+        result = None
+        kept_items = []
+        unchanged = 0
+        reused_ids = set()
+        written = None
+        with closing(adapter.iter_batches(url)) as batches:
+            while True:
+                try:
+                    batch = next(batches, None)
+                except Exception as e:
+                    logger.error(f"Extraction failed: {str(e)}")
+                    self.http_client.discard_cache(url)
+                    return None
+                if batch is None:
+                    break
+                
+                if batch.not_modified:
+                    logger.info("Source not modified since last fetch, skipping")
+                    return batch
+                
+                logger.info(f"Extracted {batch.total} items")
+                result = result or batch
+                batch.items, skipped = self._filter_items(batch.items, reused_ids, skip_validation)
+                batch.total = len(batch.items)
+                unchanged += skipped
+                if batch.items:
+                    self._send_to_api(batch)
+                    written = self._write(batch, url)
+                    kept_items.extend(batch.items)
+        
+        if result is None:
+            logger.warning("No items extracted")
+            self.http_client.discard_cache(url)
             return None
         
-        # Normalize and validate each item
+        if unchanged:
+            logger.info(f"Skipped {unchanged} unchanged items already ingested")
+        
+        result.items = kept_items
+        result.total = len(kept_items)
+        if result.total == 0:
+            if unchanged:
+                self.http_client.commit_cache(url)
+                return result
+            logger.warning("No items passed validation")
+            self.http_client.discard_cache(url)
+            return None
+        
+        # Cache the source response once its last write is committed; a
+        # failed earlier write has discarded it by then (writes resolve in
+        # order), so a partly written source is fetched again next run
+        if isinstance(written, Future):
+            def commit_cache(future: Future) -> None:
+                if future.exception() is None:
+                    self.http_client.commit_cache(url)
+            
+            written.add_done_callback(commit_cache)
+        else:
+            self.http_client.commit_cache(url)
+        
+        return result
+    
+    def _filter_items(
+        self,
+        items: list[RawContent],
+        reused_ids: set[str],
+        skip_validation: bool
+    ) -> tuple[list[RawContent], int]:
+        """
+        Normalize items and drop the unchanged, invalid and near-duplicate ones.
+        
+        Args:
+            items: Extracted items
+            reused_ids: Stored ids already taken over by changed items of
+                this source (updated in place)
+            skip_validation: Skip content validation checks
+            
+        Returns:
+            (items to write, number of unchanged items skipped)
+        """
+        # Normalize the whole batch at once (large batches use a process pool)
+        self.normalizer.normalize_many(items)
+        
+        # Validate each item
         validated_items = []
-        for item in batch.items:
-            # Normalize
-            normalized = self.normalizer.normalize(item)
+        unchanged = 0
+        for normalized in items:
+            # Skip items we already have, reuse the stored id for updates
+            if self.seen_index is not None:
+                status, previous_id = self.seen_index.check(normalized)
+                if status == SeenStatus.UNCHANGED:
+                    unchanged += 1
+                    continue
+                # An id is only taken over once per source, so items that
+                # still share an index entry can't overwrite each other
+                if status == SeenStatus.CHANGED and previous_id not in reused_ids:
+                    normalized.id = previous_id
+                    reused_ids.add(previous_id)
             
             # Validate (unless skipped)
             if not skip_validation and self.normalizer.should_skip(
@@ -75,75 +272,213 @@ class Ingestor:
             
             validated_items.append(normalized)
         
-        # Update batch with validated items
-        batch.items = validated_items
-        batch.total = len(validated_items)
+        # Drop or link near-duplicates of content we already have (the
+        # whole batch is indexed in one transaction)
+        if self.near_duplicates is not None:
+            duplicates = self.near_duplicates.check_many(validated_items)
+            kept_items = []
+            for normalized in validated_items:
+                duplicate_of = duplicates.get(normalized.id)
+                if duplicate_of:
+                    if self.near_duplicate_action == 'drop':
+                        logger.info(f"Skipping item: {normalized.title} (near-duplicate of {duplicate_of})")
+                        continue
+                    normalized.metadata['duplicate_of'] = duplicate_of
+                kept_items.append(normalized)
+            validated_items = kept_items
         
-        if batch.total == 0:
-            logger.warning("No items passed validation")
-            return None
-        
-        # Try to ingest to API if enabled
+        return validated_items, unchanged
+    
+    def _send_to_api(self, batch: RawContentBatch) -> None:
+        """Push a batch to the API when enabled; failures fall back to the files."""
         path_id = os.getenv("DEFAULT_PATH_ID")
-        if self.use_api and self.api_client and path_id:
-            # Store pathId in metadata for Synthesizer to use later
-            for item in batch.items:
-                if not item.metadata:
-                    item.metadata = {}
-                item.metadata['pathId'] = path_id
-            try:
-                # Ingest to API (batch if multiple items, single otherwise)
-                if batch.total > 1:
-                    results = self.api_client.ingest_raw_content_batch(
-                        batch.items,
-                        path_id
-                    )
-                    if results:
-                        logger.info(f"Successfully ingested {len(results)} items to API")
-                else:
-                    result = self.api_client.ingest_raw_content(
-                        batch.items[0],
-                        path_id
-                    )
-                    if result:
-                        logger.info(f"Successfully ingested to API: {batch.items[0].title}")
-            except Exception as e:
-                logger.warning(f"API ingestion failed, falling back to file writing: {e}")
+        if not (self.use_api and self.api_client and path_id):
+            return
+        
+        # Store pathId in metadata for Synthesizer to use later
+        for item in batch.items:
+            if not item.metadata:
+                item.metadata = {}
+            item.metadata['pathId'] = path_id
+        try:
+            # Ingest to API (batch if multiple items, single otherwise)
+            if batch.total > 1:
+                results = self.api_client.ingest_raw_content_batch(
+                    batch.items,
+                    path_id
+                )
+                if results:
+                    logger.info(f"Successfully ingested {len(results)} items to API")
+            else:
+                result = self.api_client.ingest_raw_content(
+                    batch.items[0],
+                    path_id
+                )
+                if result:
+                    logger.info(f"Successfully ingested to API: {batch.items[0].title}")
+        except Exception as e:
+            logger.warning(f"API ingestion failed, falling back to file writing: {e}")
+    
+    def _write(
+        self,
+        batch: RawContentBatch,
+        url: str
+    ) -> Union[Path, list[Path], Future]:
+        """
+        Write a batch to the raw files and mark its items as seen once the
+        write is committed.
         
+        Raises:
+            The write error (the source response is not cached)
+        """
         # Always write to files as backup
         # For JavaScript Weekly issues, write all articles in one file per issue
         # For other sources, write one file per item
         use_per_item = batch.source_type != "javascript_weekly"
         
-        output_paths = self.writer.write_raw(
-            batch.model_dump(mode='json'),
-            batch.source_type,
-            per_item=use_per_item
-        )
+        try:
+            output_paths = self.writer.write_raw(
+                batch.model_dump(mode='json'),
+                batch.source_type,
+                per_item=use_per_item
+            )
+        except Exception:
+            self.http_client.discard_cache(url)
+            raise
+        
+        items = list(batch.items)
+        if isinstance(output_paths, Future):
+            # Write-behind: record once the write has been committed
+            output_paths.add_done_callback(
+                lambda future: self._on_written(future.exception() or future.result(), items, url)
+            )
+        else:
+            self._on_written(output_paths, items, url)
+        return output_paths
+    
+    def _on_written(
+        self,
+        output_paths: Union[Path, list[Path], BaseException],
+        items: list,
+        url: str
+    ) -> None:
+        """
+        Log a committed raw write and mark its items as seen, so the next
+        run skips them as unchanged. A failed write discards the staged
+        source response instead, so the source is fetched again.
+        """
+        if isinstance(output_paths, BaseException):
+            logger.error(f"Writing {len(items)} items failed: {output_paths}")
+            self.http_client.discard_cache(url)
+            return
         
         if isinstance(output_paths, list):
             logger.info(f"Wrote {len(output_paths)} files (one per item)")
             if output_paths:
                 logger.info(f"First file: {output_paths[0]}")
         else:
-            logger.info(f"Wrote {batch.total} articles to: {output_paths}")
+            logger.info(f"Wrote {len(items)} articles to: {output_paths}")
+        
+        if self.seen_index is not None:
+            self.seen_index.record(items)
+    
+    def flush(self) -> None:
+        """
+        Block until every raw write queued so far is committed.
         
-        return batch
+        Raises:
+            The error of a write this thread queued since its last flush
+        """
+        if isinstance(self.writer, WriteBehindWriter):
+            self.writer.flush()
+    
+    def close(self) -> None:
+        """
+        Wait for pending writes and close the writer, indexes and normalizer pool.
+        
+        Raises:
+            The error of a queued write that failed and was not flushed
+        """
+        try:
+            if isinstance(self.writer, WriteBehindWriter):
+                self.writer.close()
+        finally:
+            self.normalizer.close()
+            if self.seen_index is not None:
+                self.seen_index.close()
+            if self.near_duplicates is not None:
+                self.near_duplicates.close()
     
     def ingest_multiple(self, urls: list[str]) -> dict[str, RawContentBatch]:
         """
         Ingest multiple URLs.
         
+        Sources are ingested concurrently when max_concurrency > 1,
+        otherwise one at a time.
+        
         Returns:
             Dictionary mapping URLs to their RawContentBatch results
         """
-        results = {}
-        for url in urls:
-            logger.info(f"\n{'='*60}\nIngesting: {url}\n{'='*60}")
-            batch = self.ingest(url)
-            if batch:
-                results[url] = batch
+        if self.max_concurrency > 1 and len(urls) > 1:
+            results = asyncio.run(self.ingest_multiple_async(urls))
+        else:
+            results = {}
+            for url in urls:
+                logger.info(f"\n{'='*60}\nIngesting: {url}\n{'='*60}")
+                batch = self.ingest(url)
+                if batch:
+                    results[url] = batch
         
         logger.info(f"\nCompleted: {len(results)}/{len(urls)} successful")
         return results
-
+    
+    async def ingest_multiple_async(self, urls: list[str]) -> dict[str, RawContentBatch]:
+        """
+        Ingest multiple URLs concurrently.
+        
+        Each source runs the regular blocking ingest() on a worker thread.
+        At most max_concurrency sources run at once, and at most
+        per_host_limit of them against the same host. A URL given more
+        than once is ingested once, so two threads never stage the same
+        cached response.
+        
+        Returns:
+            Dictionary mapping URLs to their RawContentBatch results,
+            in the order the URLs were given
+        """
+        urls = list(dict.fromkeys(urls))
+        global_limit = asyncio.Semaphore(self.max_concurrency)
+        host_limits: dict[str, asyncio.Semaphore] = {}
+        loop = asyncio.get_running_loop()
+        
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="ingest"
+        ) as executor:
+            
+            async def run(url: str) -> Optional[RawContentBatch]:
+                host = urlparse(url).netloc.lower()
+                host_limit = host_limits.setdefault(
+                    host,
+                    asyncio.Semaphore(self.per_host_limit)
+                )
+                # Take the host slot first so sources queued behind a busy
+                # host don't hold on to a global slot while they wait
+                async with host_limit:
+                    async with global_limit:
+                        logger.info(f"Ingesting: {url}")
+                        return await loop.run_in_executor(executor, self.ingest, url)
+            
+            outcomes = await asyncio.gather(
+                *(run(url) for url in urls),
+                return_exceptions=True
+            )
+        
+        results = {}
+        for url, outcome in zip(urls, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Ingestion failed for {url}: {outcome}")
+            elif outcome:
+                results[url] = outcome
+        
+        return results
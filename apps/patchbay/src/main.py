@@ -7,8 +7,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from dotenv import load_dotenv
+from python_shared.http_client import set_default_client
 from python_shared.logging_config import setup_logging
-from src.ingest import Ingestor
+from src.ingest import Ingestor, build_http_client, build_writer
 
 
 def main():
@@ -24,69 +25,98 @@ def main():
     # Get data directory
     data_dir = os.getenv("DATA_DIR", "../../data")
     
-    # Create ingestor
-    ingestor = Ingestor(data_dir=data_dir)
+    # Concurrency settings for multi-source ingestion
+    max_concurrency = int(os.getenv("INGEST_CONCURRENCY", "8"))
+    per_host_limit = int(os.getenv("INGEST_PER_HOST_LIMIT", "2"))
     
-    # Parse command line arguments
-    if len(sys.argv) < 2:
-        print("Usage: python -m src.main <command> [args]")
-        print("\nCommands:")
-        print("  ingest              - Ingest from configured sources")
-        print("  ingest-source <url> - Ingest a specific URL")
-        sys.exit(1)
+    # Shared pooled HTTP client for all adapters
+    http_client = build_http_client(data_dir)
+    set_default_client(http_client)
     
-    command = sys.argv[1]
+    # Create ingestor
+    ingestor = Ingestor(
+        data_dir=data_dir,
+        max_concurrency=max_concurrency,
+        per_host_limit=per_host_limit,
+        http_client=http_client,
+        track_seen=os.getenv("SEEN_INDEX_ENABLED", "true").lower() == "true",
+        near_duplicate_action=os.getenv("NEAR_DUPLICATE_ACTION") or None,
+        near_duplicate_distance=int(os.getenv("NEAR_DUPLICATE_DISTANCE", "3")),
+        writer=build_writer(data_dir),
+        adapter_config={
+            'article_workers': int(os.getenv("RSS_ARTICLE_WORKERS", "8")),
+            'article_deadline': float(os.getenv("RSS_ARTICLE_DEADLINE", "60")),
+            'max_pages': int(os.getenv("PDF_MAX_PAGES", "1000")),
+            'max_bytes': int(os.getenv("PDF_MAX_MB", "100")) * 1024 * 1024,
+            'pages_per_section': int(os.getenv("PDF_PAGES_PER_SECTION", "20")),
+            'parser_backend': os.getenv("JSWEEKLY_PARSER", "auto"),
+        }
+    )
     
-    if command == "ingest":
-        import json
-        sources = []
+    try:
+        # Parse command line arguments
+        if len(sys.argv) < 2:
+            print("Usage: python -m src.main <command> [args]")
+            print("\nCommands:")
+            print("  ingest              - Ingest from configured sources")
+            print("  ingest-source <url> - Ingest a specific URL")
+            sys.exit(1)
+        
+        command = sys.argv[1]
+        
+        if command == "ingest":
+            import json
+            sources = []
 
-        # First priority: SOURCES_JSON passed directly from API
-        sources_json = os.getenv("SOURCES_JSON")
-        if sources_json:
-            try:
-                sources = json.loads(sources_json)
-                logger.info(f"Using {len(sources)} sources from SOURCES_JSON")
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse SOURCES_JSON: {e}")
+            # First priority: SOURCES_JSON passed directly from API
+            sources_json = os.getenv("SOURCES_JSON")
+            if sources_json:
+                try:
+                    sources = json.loads(sources_json)
+                    logger.info(f"Using {len(sources)} sources from SOURCES_JSON")
+                except json.JSONDecodeError as e:
+                    logger.error(f"Failed to parse SOURCES_JSON: {e}")
 
-        # Fall back to RSS_SOURCES environment variable
-        if not sources:
-            sources_env = os.getenv("RSS_SOURCES", "")
-            if sources_env:
-                sources = [s.strip() for s in sources_env.split(",")]
-                logger.info(f"Using {len(sources)} sources from RSS_SOURCES")
+            # Fall back to RSS_SOURCES environment variable
+            if not sources:
+                sources_env = os.getenv("RSS_SOURCES", "")
+                if sources_env:
+                    sources = [s.strip() for s in sources_env.split(",")]
+                    logger.info(f"Using {len(sources)} sources from RSS_SOURCES")
 
-        if not sources:
-            logger.error("No sources configured. Pass SOURCES_JSON or set RSS_SOURCES environment variable.")
-            sys.exit(1)
+            if not sources:
+                logger.error("No sources configured. Pass SOURCES_JSON or set RSS_SOURCES environment variable.")
+                sys.exit(1)
         
-        results = ingestor.ingest_multiple(sources)
+            results = ingestor.ingest_multiple(sources)
         
-        # Summary
-        total_items = sum(batch.total for batch in results.values())
-        logger.info(f"\n{'='*60}")
-        logger.info(f"SUMMARY: {len(results)} sources, {total_items} total items")
-        logger.info(f"{'='*60}")
+            # Summary
+            total_items = sum(batch.total for batch in results.values())
+            logger.info(f"\n{'='*60}")
+            logger.info(f"SUMMARY: {len(results)} sources, {total_items} total items")
+            logger.info(f"{'='*60}")
         
-    elif command == "ingest-source":
-        if len(sys.argv) < 3:
-            print("Usage: python -m src.main ingest-source <url>")
-            sys.exit(1)
+        elif command == "ingest-source":
+            if len(sys.argv) < 3:
+                print("Usage: python -m src.main ingest-source <url>")
+                sys.exit(1)
         
-        url = sys.argv[2]
-        batch = ingestor.ingest(url)
+            url = sys.argv[2]
+            batch = ingestor.ingest(url)
+        
+            if batch:
+                logger.info(f"\nSuccess! Extracted {batch.total} items")
+            else:
+                logger.error("\nIngestion failed")
+                sys.exit(1)
         
-        if batch:
-            logger.info(f"\nSuccess! Extracted {batch.total} items")
         else:
-            logger.error("\nIngestion failed")
+            print(f"Unknown command: {command}")
             sys.exit(1)
-    
-    else:
-        print(f"Unknown command: {command}")
-        sys.exit(1)
 
+    finally:
+        # Commit pending background writes before exiting
+        ingestor.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,291 @@
+"""Near-duplicate detection with SimHash fingerprints."""
+from array import array
+from itertools import compress
+from pathlib import Path
+from typing import Optional
+import hashlib
+import sqlite3
+import string
+import sys
+import threading
+import zlib
+from models.raw_content import RawContent
+
+
+FINGERPRINT_BITS = 64
+# ASCII punctuation becomes whitespace, so splitting yields the words
+PUNCTUATION_TABLE = bytes.maketrans(string.punctuation.encode(), b' ' * len(string.punctuation))
+# SAMPLE_TABLES[cutoff] maps a byte to 1 when it is below cutoff, else to 0
+SAMPLE_TABLES = [bytes(int(value < cutoff) for value in range(256)) for cutoff in range(257)]
+
+
+def simhash(
+    text: str,
+    shingle_size: int = 3,
+    max_features: int = 256,
+    max_tokens: int = 4096
+) -> Optional[int]:
+    """
+    Compute a 64-bit SimHash of a text.
+
+    Features are word shingles, sampled before any shingle is built:
+    - Every word gets a CRC32, and a shingle is kept when the CRC of its
+      first word falls below a cutoff sized for about max_features of
+      them. The sample only depends on the words, so copies of a text
+      keep the same shingles
+    - A kept shingle's key is the CRCs of its words, read straight out of
+      the CRC array, so no shingle strings are joined
+    - Keys are hashed to 64 bits with one multiply-shift (key * odd
+      constant, middle bits). Packing every key into its own lane of one
+      big integer does all of these multiplications at once
+
+    Words beyond max_tokens are ignored.
+
+    Args:
+        text: Text to fingerprint
+        shingle_size: Number of consecutive words per feature
+        max_features: Maximum number of features used
+        max_tokens: Maximum number of words read from the text
+
+    Returns:
+        Fingerprint, or None if the text has no words
+    """
+    tokens = text.lower().encode('utf-8').translate(PUNCTUATION_TABLE).split()[:max_tokens]
+    if not tokens:
+        return None
+
+    size = min(shingle_size, len(tokens))
+    starts = len(tokens) - size + 1
+    crcs = array('I', map(zlib.crc32, tokens))
+    if sys.byteorder == 'big':
+        crcs.byteswap()
+    packed = crcs.tobytes()
+
+    # Sample on the top byte of each first word's CRC (byte 3, little-endian)
+    key_width = 4 * size
+    cutoff = min(256, -(-max_features * 256 // starts))
+    sampled = packed[3:4 * starts:4].translate(SAMPLE_TABLES[cutoff])
+    keys = {packed[offset:offset + key_width] for offset in compress(range(0, 4 * starts, 4), sampled)}
+    if not keys:
+        # Only a few distinct words and none sampled; use every shingle
+        keys = {packed[offset:offset + key_width] for offset in range(0, 4 * starts, 4)}
+    keys = sorted(keys)[:max_features]
+
+    # (key * multiplier) fits in 2 * key_width + 8 bytes, so lanes of that
+    # width never carry into each other, and bytes [key_width, key_width + 8)
+    # of a lane are its multiply-shift hash
+    lane_width = 2 * key_width + 8
+    multiplier = int.from_bytes(hashlib.shake_256(b'simhash').digest(key_width + 8), 'little') | 1
+    lanes = int.from_bytes(bytes(lane_width - key_width).join(keys), 'little') * multiplier
+    hashes = lanes.to_bytes(lane_width * len(keys), 'little')
+
+    # A bit is set when it is set in more than half of the feature hashes.
+    # Each byte column of the hashes becomes one integer, so a bit column
+    # is counted with a shift, a mask and bit_count()
+    ones = int.from_bytes(b'\x01' * len(keys), 'little')
+    half = len(keys) / 2
+    fingerprint = 0
+    for byte in range(FINGERPRINT_BITS // 8):
+        column = int.from_bytes(hashes[key_width + byte::lane_width], 'little')
+        for bit in range(8):
+            if (column >> bit & ones).bit_count() > half:
+                fingerprint |= 1 << (8 * byte + bit)
+    return fingerprint
+
+
+def _to_signed(value: int) -> int:
+    """Map an unsigned 64-bit value into SQLite's signed INTEGER range."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class NearDuplicateDetector:
+    """
+    Persistent SimHash index for finding near-duplicate content.
+
+    Fingerprints are split into max_distance + 1 bands and each band is
+    indexed in SQLite. Two fingerprints within max_distance bits must agree
+    exactly on at least one band, so a lookup is one indexed query plus a
+    Hamming check on a handful of candidates, independent of corpus size.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        max_distance: int = 3,
+        shingle_size: int = 3
+    ):
+        """
+        Initialize near-duplicate detector.
+
+        Args:
+            db_path: Path to the SQLite database (created if missing)
+            max_distance: Maximum Hamming distance to call two items duplicates
+            shingle_size: Number of consecutive words per SimHash feature
+        """
+        if not 0 <= max_distance < FINGERPRINT_BITS // 4:
+            raise ValueError(f"max_distance must be between 0 and {FINGERPRINT_BITS // 4 - 1}")
+
+        self.max_distance = max_distance
+        self.shingle_size = shingle_size
+        self.num_bands = max_distance + 1
+        self.band_bits = FINGERPRINT_BITS // self.num_bands
+
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Reentrant so check_many() can hold it across a whole batch: the
+        # connection has one transaction, which another thread's commit
+        # would otherwise commit half-built
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                item_id TEXT PRIMARY KEY,
+                fingerprint INTEGER NOT NULL,
+                source_url TEXT
+            );
+            CREATE TABLE IF NOT EXISTS bands (
+                band INTEGER NOT NULL,
+                value INTEGER NOT NULL,
+                item_id TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_bands ON bands (band, value);
+            CREATE INDEX IF NOT EXISTS idx_bands_item ON bands (item_id);
+            """
+        )
+        self._conn.commit()
+
+    def fingerprint(self, item: RawContent) -> Optional[int]:
+        """SimHash of an item's content."""
+        return simhash(item.content, self.shingle_size)
+
+    def find(self, fingerprint: int, exclude_id: Optional[str] = None) -> Optional[tuple[str, int]]:
+        """
+        Find the closest indexed item within max_distance.
+
+        Args:
+            fingerprint: SimHash to look up
+            exclude_id: Item id to ignore (e.g. an earlier version of the same item)
+
+        Returns:
+            (item_id, distance) of the closest match, or None
+        """
+        bands = self._bands(fingerprint)
+        clause = " OR ".join("(b.band = ? AND b.value = ?)" for _ in bands)
+        params = [param for band, value in bands for param in (band, _to_signed(value))]
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT DISTINCT f.item_id, f.fingerprint
+                FROM bands b JOIN fingerprints f ON f.item_id = b.item_id
+                WHERE {clause}
+                """,
+                params
+            ).fetchall()
+
+        best = None
+        for item_id, stored in rows:
+            if item_id == exclude_id:
+                continue
+            distance = (fingerprint ^ _to_unsigned(stored)).bit_count()
+            if distance <= self.max_distance and (best is None or distance < best[1]):
+                best = (item_id, distance)
+        return best
+
+    def add(
+        self,
+        item_id: str,
+        fingerprint: int,
+        source_url: Optional[str] = None,
+        commit: bool = True
+    ) -> None:
+        """
+        Index a fingerprint, replacing any earlier one for the same item.
+
+        With commit=False the row stays in the open transaction (visible
+        to find() on this detector) until commit() is called.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM bands WHERE item_id = ?", (item_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fingerprints (item_id, fingerprint, source_url) VALUES (?, ?, ?)",
+                (item_id, _to_signed(fingerprint), source_url)
+            )
+            self._conn.executemany(
+                "INSERT INTO bands (band, value, item_id) VALUES (?, ?, ?)",
+                [(band, _to_signed(value), item_id) for band, value in self._bands(fingerprint)]
+            )
+            if commit:
+                self._conn.commit()
+
+    def commit(self) -> None:
+        """Commit fingerprints added with commit=False."""
+        with self._lock:
+            self._conn.commit()
+
+    def check(self, item: RawContent, commit: bool = True) -> Optional[str]:
+        """
+        Look up an item and index it if it is not a near-duplicate.
+
+        Returns:
+            Id of the item this one duplicates, or None
+        """
+        fingerprint = self.fingerprint(item)
+        if fingerprint is None:
+            return None
+
+        with self._lock:
+            match = self.find(fingerprint, exclude_id=item.id)
+            if match:
+                return match[0]
+
+            self.add(item.id, fingerprint, item.source_url, commit=commit)
+        return None
+
+    def check_many(self, items: list[RawContent]) -> dict[str, str]:
+        """
+        Check a batch of items in order, indexing the new ones in one
+        transaction. Later items are also checked against earlier ones.
+        Batches from concurrent threads run one after the other.
+
+        Returns:
+            {item id: id of the item it duplicates} for the near-duplicates
+        """
+        duplicates = {}
+        with self._lock:
+            try:
+                for item in items:
+                    duplicate_of = self.check(item, commit=False)
+                    if duplicate_of:
+                        duplicates[item.id] = duplicate_of
+            finally:
+                self.commit()
+        return duplicates
+
+    def count(self) -> int:
+        """Number of indexed fingerprints."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _bands(self, fingerprint: int) -> list[tuple[int, int]]:
+        """Split a fingerprint into (band index, band value) pairs."""
+        mask = (1 << self.band_bits) - 1
+        bands = []
+        for band in range(self.num_bands):
+            shift = band * self.band_bits
+            # The last band takes any bits left over by the integer division
+            width_mask = mask if band < self.num_bands - 1 else (1 << (FINGERPRINT_BITS - shift)) - 1
+            bands.append((band, (fingerprint >> shift) & width_mask))
+        return bands
@@ -1,10 +1,56 @@
 """Content normalization utilities."""
+import multiprocessing
+import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
 from models.raw_content import RawContent
 
 
+# Control characters except tab, newline and carriage return, removed via
+# str.translate in one C-level pass
+CONTROL_CHARS = dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F])
+
+# Whitespace runs that need rewriting: anything other than a lone space.
+# Ordinary word gaps don't match, so the replacement callback only runs on
+# line breaks, tabs and repeated spaces
+WHITESPACE_RUN = re.compile(r'\s{2,}|[^\S ]')
+
+# Batches at least this large (in characters) are cleaned on a process pool
+PARALLEL_MIN_CHARS = 4 * 1024 * 1024
+
+
+def _collapse_whitespace(match: re.Match) -> str:
+    """Paragraph breaks become a blank line, single line breaks stay, the rest is a space."""
+    newlines = match.group().count('\n')
+    if newlines >= 2:
+        return '\n\n'
+    if newlines == 1:
+        return '\n'
+    return ' '
+
+
 class ContentNormalizer:
-    """Normalizes and cleans raw content."""
+    """
+    Normalizes and cleans raw content.
+    
+    normalize_many() cleans large batches on a process pool that is started
+    on first use and kept until close(). Workers are spawned, not forked:
+    batches arrive on ingest worker threads, and a fork would copy those
+    threads' locks, sockets and SQLite connections into the children.
+    """
+    
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Initialize normalizer.
+        
+        Args:
+            workers: Worker processes for large batches (defaults to CPU count)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
     
     @staticmethod
     def normalize(content: RawContent) -> RawContent:
@@ -24,18 +70,61 @@ class ContentNormalizer:
         
         return content
     
-    @staticmethod
-    def _clean_text(text: str) -> str:
-        """Clean and normalize text content."""
-        # Remove control characters except newlines/tabs
-        text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text)
+    def normalize_many(self, contents: list[RawContent]) -> list[RawContent]:
+        """
+        Normalize a batch of content items.
+        
+        Large batches (by total text size) are cleaned on the process pool;
+        smaller ones in-process, where shipping the text to the workers
+        would cost more than it saves.
+        
+        Args:
+            contents: Items to normalize (updated in place)
+            
+        Returns:
+            The same items, normalized, in the same order
+        """
+        texts = [content.content for content in contents]
+        total_chars = sum(len(text) for text in texts)
         
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
+        if self.workers > 1 and len(texts) > 1 and total_chars >= PARALLEL_MIN_CHARS:
+            chunksize = max(1, len(texts) // (self.workers * 4))
+            cleaned = list(self._start().map(ContentNormalizer._clean_text, texts, chunksize=chunksize))
+        else:
+            cleaned = [ContentNormalizer._clean_text(text) for text in texts]
         
-        # Normalize line breaks
-        text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+        for content, text in zip(contents, cleaned, strict=True):
+            content.content = text
+        return contents
+    
+    def _start(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+    
+    def close(self) -> None:
+        """Stop the worker processes."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+    
+    @staticmethod
+    def _clean_text(text: str) -> str:
+        """
+        Clean and normalize text content.
         
+        Removes control characters, then rewrites whitespace in a single
+        regex pass: runs containing two or more line breaks become a
+        paragraph break, runs with one line break become a newline and
+        all other runs become a single space.
+        """
+        text = text.translate(CONTROL_CHARS)
+        text = WHITESPACE_RUN.sub(_collapse_whitespace, text)
         return text.strip()
     
     @staticmethod
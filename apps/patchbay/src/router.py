@@ -20,13 +20,21 @@ class AdapterRouter:
     5. Article (fallback for any HTTP(S) URL)
     """
     
-    def __init__(self):
+    def __init__(self, adapter_config: Optional[dict] = None):
+        """
+        Initialize router.
+        
+        Args:
+            adapter_config: Config passed to every built-in adapter
+                (e.g. the shared 'http_client')
+        """
+        config = adapter_config or {}
         self.adapters: list[BaseAdapter] = [
-            JavaScriptWeeklyAdapter(),  # Most specific - parse issue pages into articles
-            RSSAdapter(),
-            PDFAdapter(),
-            NewsletterAdapter(),
-            ArticleAdapter(),  # Fallback
+            JavaScriptWeeklyAdapter(config),  # Most specific - parse issue pages into articles
+            RSSAdapter(config),
+            PDFAdapter(config),
+            NewsletterAdapter(config),
+            ArticleAdapter(config),  # Fallback
         ]
     
     def get_adapter(self, url: str) -> Optional[BaseAdapter]:
@@ -0,0 +1,121 @@
+"""Persistent index of already-ingested content."""
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+import sqlite3
+import threading
+from models.raw_content import ITEM_KEY, RawContent
+from python_shared.utils import canonicalize_url, content_hash
+
+
+class SeenStatus(str, Enum):
+    """Outcome of checking an item against the index."""
+    NEW = "new"
+    UNCHANGED = "unchanged"
+    CHANGED = "changed"
+
+
+class SeenIndex:
+    """
+    SQLite index of ingested items keyed by canonical source URL and item key.
+
+    Each entry stores a hash of the item's title and content and the id it
+    was first stored under, so the pipeline can drop unchanged items before
+    validation, API calls and file writes, and update changed items in
+    place instead of piling up a new copy per run.
+
+    Most sources yield one item per URL and use an empty item key. Items
+    that share a URL carry a stable metadata['item_key'] (e.g. the first
+    page of a PDF section), so each of them gets its own entry.
+    """
+
+    def __init__(self, db_path: str | Path):
+        """
+        Initialize seen index.
+
+        Args:
+            db_path: Path to the SQLite database (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seen_items (
+                url TEXT NOT NULL,
+                item_key TEXT NOT NULL DEFAULT '',
+                content_hash TEXT NOT NULL,
+                item_id TEXT NOT NULL,
+                source_type TEXT,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                PRIMARY KEY (url, item_key)
+            )
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def fingerprint(item: RawContent) -> tuple[str, str, str]:
+        """Return (canonical URL, item key, content hash) for an item."""
+        return (
+            canonicalize_url(item.source_url),
+            str(item.metadata.get(ITEM_KEY) or ''),
+            content_hash(item.title, item.content)
+        )
+
+    def check(self, item: RawContent) -> tuple[SeenStatus, Optional[str]]:
+        """
+        Check an item against the index.
+
+        Returns:
+            (status, id the item was previously stored under or None)
+        """
+        url, key, digest = self.fingerprint(item)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, item_id FROM seen_items WHERE url = ? AND item_key = ?",
+                (url, key)
+            ).fetchone()
+
+        if row is None:
+            return SeenStatus.NEW, None
+        if row[0] == digest:
+            return SeenStatus.UNCHANGED, row[1]
+        return SeenStatus.CHANGED, row[1]
+
+    def record(self, items: list[RawContent]) -> None:
+        """Insert or update index entries for items that were stored."""
+        now = datetime.utcnow().isoformat()
+        rows = []
+        for item in items:
+            url, key, digest = self.fingerprint(item)
+            rows.append((url, key, digest, item.id, item.source_type, now, now))
+
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT INTO seen_items (url, item_key, content_hash, item_id, source_type, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url, item_key) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    item_id = excluded.item_id,
+                    source_type = excluded.source_type,
+                    last_seen = excluded.last_seen
+                """,
+                rows
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen_items").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
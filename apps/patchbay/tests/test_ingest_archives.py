@@ -0,0 +1,99 @@
+"""Tests for the archive backfill."""
+import io
+from pathlib import Path
+import requests
+from python_shared.file_io import DataReader, DataWriter
+from python_shared.http_cache import HttpCache
+from python_shared.http_client import HttpClient
+from python_shared.write_behind import WriteBehindWriter
+from scripts.ingest_archives import BackfillCheckpoint, backfill
+from src.ingest import Ingestor
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "javascript_weekly"
+
+
+ISSUES = [f"https://javascriptweekly.com/issues/{number}" for number in (700, 701, 702)]
+
+
+class WritingIngestor:
+    """Queues one raw write per issue, like Ingestor with a write-behind writer."""
+
+    def __init__(self, writer: WriteBehindWriter):
+        self.writer = writer
+
+    def ingest(self, url: str):
+        item = {"id": url.rsplit('/', 1)[-1], "source_type": "javascript_weekly", "content": url}
+        self.writer.write_raw({"items": [item], "total": 1}, "javascript_weekly", per_item=True)
+        return item
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+
+def test_failed_write_fails_its_issue(tmp_path):
+    data_writer = DataWriter(tmp_path / "data")
+    write_raw = data_writer.write_raw
+
+    def write(data, source_type, per_item=False):
+        if data["items"][0]["id"] == "701":
+            raise OSError("disk full")
+        return write_raw(data, source_type, per_item)
+
+    data_writer.write_raw = write
+    writer = WriteBehindWriter(data_writer)
+    checkpoint = BackfillCheckpoint(tmp_path / "checkpoint.json")
+    try:
+        successful, failed = backfill(
+            WritingIngestor(writer), ISSUES, checkpoint, rate=1000, burst=10, concurrency=3
+        )
+    finally:
+        writer.close()
+
+    assert (successful, failed) == (2, 1)
+    assert checkpoint.failed == {701}
+    assert sorted(item["id"] for item in DataReader(tmp_path / "data").iter_raw()) == ["700", "702"]
+
+
+class FixtureClient(HttpClient):
+    """HttpClient that serves issue pages from the committed fixtures."""
+
+    def get(self, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers.update({"ETag": '"fixture"', "Content-Type": "text/html; charset=utf-8"})
+        response.raw = io.BytesIO((FIXTURES_DIR / f"{url.rsplit('/', 1)[-1]}.html").read_bytes())
+        response.url = url
+        return response
+
+
+def run_backfill(data_dir: Path, concurrency: int) -> list[str]:
+    client = FixtureClient(cache=HttpCache(data_dir / "cache" / "http"))
+    ingestor = Ingestor(
+        data_dir=data_dir,
+        use_api=False,
+        http_client=client,
+        near_duplicate_action="drop",
+        writer=WriteBehindWriter(DataWriter(data_dir))
+    )
+    try:
+        successful, failed = backfill(
+            ingestor,
+            ISSUES,
+            BackfillCheckpoint(data_dir / "checkpoint.json"),
+            rate=1000,
+            burst=10,
+            concurrency=concurrency
+        )
+    finally:
+        ingestor.close()
+    assert (successful, failed) == (3, 0)
+    return sorted(item["id"] for item in DataReader(data_dir).iter_raw())
+
+
+def test_concurrent_backfill_shares_one_ingestor(tmp_path):
+    sequential = run_backfill(tmp_path / "sequential", concurrency=1)
+    concurrent = run_backfill(tmp_path / "concurrent", concurrency=3)
+
+    assert sequential
+    assert concurrent == sequential
@@ -0,0 +1,126 @@
+"""Tests for concurrent ingestion of multiple sources."""
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlparse
+from models.raw_content import RawContent, RawContentBatch
+from src.ingest import Ingestor
+from src.near_duplicates import NearDuplicateDetector
+
+
+class RecordingIngestor(Ingestor):
+    """Ingestor whose ingest() only records how many sources run at once."""
+
+    def __init__(self, data_dir, **kwargs):
+        super().__init__(data_dir=data_dir, use_api=False, track_seen=False, **kwargs)
+        self._counter_lock = threading.Lock()
+        self.running = 0
+        self.running_per_host = Counter()
+        self.peak = 0
+        self.peak_per_host = Counter()
+        self.calls = []
+
+    def ingest(self, url: str):
+        host = urlparse(url).netloc
+        with self._counter_lock:
+            self.calls.append(url)
+            self.running += 1
+            self.running_per_host[host] += 1
+            self.peak = max(self.peak, self.running)
+            self.peak_per_host[host] = max(self.peak_per_host[host], self.running_per_host[host])
+        time.sleep(0.05)
+        with self._counter_lock:
+            self.running -= 1
+            self.running_per_host[host] -= 1
+        if url.endswith("/fail"):
+            raise RuntimeError("boom")
+        return RawContentBatch(items=[make_item(url)], total=1, source_type="article")
+
+
+def test_respects_global_limit(tmp_path):
+    ingestor = RecordingIngestor(tmp_path, max_concurrency=3, per_host_limit=10)
+    urls = [f"https://host{index}.example/feed" for index in range(9)]
+
+    results = asyncio.run(ingestor.ingest_multiple_async(urls))
+
+    assert list(results) == urls
+    assert ingestor.peak == 3
+
+
+def test_respects_per_host_limit(tmp_path):
+    ingestor = RecordingIngestor(tmp_path, max_concurrency=8, per_host_limit=2)
+    urls = [f"https://busy.example/{index}" for index in range(6)]
+    urls += [f"https://quiet{index}.example/feed" for index in range(3)]
+
+    asyncio.run(ingestor.ingest_multiple_async(urls))
+
+    assert ingestor.peak_per_host["busy.example"] == 2
+    # The queued busy-host sources don't hold global slots, so the other
+    # hosts run alongside them
+    assert ingestor.peak >= 4
+
+
+def test_failed_source_does_not_stop_the_others(tmp_path):
+    ingestor = RecordingIngestor(tmp_path, max_concurrency=4)
+    urls = ["https://a.example/feed", "https://b.example/fail", "https://c.example/feed"]
+
+    results = ingestor.ingest_multiple(urls)
+
+    assert list(results) == ["https://a.example/feed", "https://c.example/feed"]
+
+
+def test_duplicate_urls_are_ingested_once(tmp_path):
+    ingestor = RecordingIngestor(tmp_path, max_concurrency=4)
+    urls = ["https://a.example/feed", "https://b.example/feed", "https://a.example/feed"]
+
+    results = asyncio.run(ingestor.ingest_multiple_async(urls))
+
+    assert sorted(ingestor.calls) == ["https://a.example/feed", "https://b.example/feed"]
+    assert list(results) == ["https://a.example/feed", "https://b.example/feed"]
+
+
+def make_item(item_id: str) -> RawContent:
+    return RawContent(
+        id=item_id,
+        source_type="article",
+        source_url=f"https://example.com/{item_id}",
+        title=item_id,
+        content=f"{item_id} has a body of its own with words unlike any other {item_id}"
+    )
+
+
+def test_check_many_is_not_committed_by_another_thread(tmp_path):
+    path = tmp_path / "nd.sqlite"
+    detector = NearDuplicateDetector(path)
+    paused = threading.Event()
+    resume = threading.Event()
+    add = detector.add
+
+    def pausing_add(item_id, fingerprint, source_url=None, commit=True):
+        add(item_id, fingerprint, source_url, commit=commit)
+        if item_id == "a1":
+            paused.set()
+            resume.wait(5)
+
+    detector.add = pausing_add
+    first = threading.Thread(target=detector.check_many, args=([make_item("a1"), make_item("a2")],))
+    second = threading.Thread(target=detector.check_many, args=([make_item("b1")],))
+
+    first.start()
+    assert paused.wait(5)
+    second.start()
+    second.join(0.2)
+
+    # The second batch waits for the first instead of committing its
+    # half-built transaction
+    assert second.is_alive()
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0] == 0
+
+    resume.set()
+    first.join(5)
+    second.join(5)
+    assert detector.count() == 3
+    detector.close()
@@ -0,0 +1,42 @@
+"""Tests that the JavaScript Weekly parser backends agree on saved issue pages."""
+from pathlib import Path
+
+import pytest
+
+from adapters.javascript_weekly_adapter import JavaScriptWeeklyAdapter
+from adapters.javascript_weekly_parsers import get_issue_parser
+from scripts.compare_jsweekly_parsers import diff_issues, fixture_url
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "javascript_weekly"
+FIXTURES = sorted(FIXTURES_DIR.glob("*.html"))
+
+
+def extract_with(backend: str, html: str, url: str) -> list[dict]:
+    adapter = JavaScriptWeeklyAdapter({'parser_backend': backend})
+    articles = adapter._extract_articles(adapter.parser.parse(html, url), url)
+    return [article.model_dump(exclude={'extracted_date'}) for article in articles]
+
+
+def test_fixtures_present():
+    assert len(FIXTURES) >= 3
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda path: path.name)
+def test_backends_parse_issue_identically(path):
+    html = path.read_text(encoding='utf-8')
+    url = fixture_url(path)
+
+    reference = get_issue_parser('soup').parse(html, url)
+    candidate = get_issue_parser('lxml').parse(html, url)
+
+    assert reference.links
+    assert diff_issues(reference, candidate) == []
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda path: path.name)
+def test_backends_return_identical_raw_content(path):
+    html = path.read_text(encoding='utf-8')
+    url = fixture_url(path)
+
+    assert extract_with('soup', html, url) == extract_with('lxml', html, url)
@@ -0,0 +1,105 @@
+"""Tests for SimHash near-duplicate detection."""
+import random
+import pytest
+from models.raw_content import RawContent
+from src.near_duplicates import NearDuplicateDetector, simhash
+
+
+WORDS = [f"word{index}" for index in range(5000)]
+
+
+def make_text(seed: int, length: int = 400) -> str:
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(WORDS) for _ in range(length))
+
+
+def make_item(item_id: str, content: str) -> RawContent:
+    return RawContent(
+        id=item_id,
+        source_type="article",
+        source_url=f"https://example.com/{item_id}",
+        title=item_id,
+        content=content
+    )
+
+
+def test_simhash_is_deterministic_and_ignores_case_and_punctuation():
+    text = make_text(1)
+
+    assert simhash(text) == simhash(text)
+    assert simhash(text.upper().replace(' ', ', ')) == simhash(text)
+    assert simhash("") is None
+    assert simhash("!!!") is None
+
+
+def test_simhash_of_short_text():
+    assert simhash("hello") is not None
+    assert simhash("hello world") is not None
+
+
+def test_simhash_of_repetitive_text():
+    assert simhash("spam " * 4000) is not None
+    assert simhash("spam " * 4000) == simhash("spam " * 3000)
+
+
+def test_simhash_distance_tracks_similarity():
+    text = make_text(1)
+    words = text.split()
+    words[100] = "changed"
+    near = ' '.join(words)
+
+    assert (simhash(text) ^ simhash(near)).bit_count() <= 3
+    assert (simhash(text) ^ simhash(make_text(2))).bit_count() > 10
+
+
+def test_detects_near_duplicate(tmp_path):
+    detector = NearDuplicateDetector(tmp_path / "nd.sqlite")
+    text = make_text(1)
+    words = text.split()
+    words[100] = "changed"
+
+    assert detector.check(make_item("a", text)) is None
+    assert detector.check(make_item("b", ' '.join(words))) == "a"
+    assert detector.check(make_item("c", make_text(2))) is None
+    assert detector.count() == 2
+
+
+def test_earlier_version_of_same_item_is_not_a_duplicate(tmp_path):
+    detector = NearDuplicateDetector(tmp_path / "nd.sqlite")
+    text = make_text(1)
+
+    detector.check(make_item("a", text))
+
+    assert detector.check(make_item("a", text)) is None
+    assert detector.count() == 1
+
+
+@pytest.mark.parametrize("max_distance", [0, 1, 3, 15])
+def test_high_bit_fingerprints_round_trip(tmp_path, max_distance):
+    detector = NearDuplicateDetector(tmp_path / "nd.sqlite", max_distance=max_distance)
+    fingerprint = (1 << 64) - 1 - 0b1010
+
+    detector.add("a", fingerprint)
+
+    assert detector.find(fingerprint) == ("a", 0)
+    if max_distance:
+        assert detector.find(fingerprint ^ 1) == ("a", 1)
+    assert detector.find(fingerprint ^ ((1 << (max_distance + 1)) - 1)) is None
+
+
+def test_rejects_invalid_distance(tmp_path):
+    with pytest.raises(ValueError):
+        NearDuplicateDetector(tmp_path / "nd.sqlite", max_distance=16)
+
+
+def test_check_many_commits_once_and_checks_within_batch(tmp_path):
+    detector = NearDuplicateDetector(tmp_path / "nd.sqlite")
+    text = make_text(1)
+    items = [make_item("a", text), make_item("b", make_text(2)), make_item("c", text + " extra")]
+
+    duplicates = detector.check_many(items)
+    detector.close()
+
+    assert duplicates == {"c": "a"}
+    assert NearDuplicateDetector(tmp_path / "nd.sqlite").count() == 2
+
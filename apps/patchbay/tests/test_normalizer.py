@@ -0,0 +1,35 @@
+"""Tests for content normalization."""
+from models.raw_content import RawContent
+from src import normalizer
+from src.normalizer import ContentNormalizer
+
+
+def make_item(content: str) -> RawContent:
+    return RawContent(
+        id="a1",
+        source_type="article",
+        source_url="https://example.com/post",
+        title="Title",
+        content=content
+    )
+
+
+def test_clean_text_keeps_paragraphs():
+    text = "  First\tline \x00here\r\nsecond   line\n\n\n\nNext  paragraph  "
+
+    assert ContentNormalizer._clean_text(text) == "First line here\nsecond line\n\nNext paragraph"
+
+
+def test_normalize_many_on_pool_matches_in_process(monkeypatch):
+    texts = [f"Item {index}\n\n\n  with   spacing\x07" for index in range(6)]
+    expected = [ContentNormalizer._clean_text(text) for text in texts]
+    monkeypatch.setattr(normalizer, "PARALLEL_MIN_CHARS", 1)
+    content_normalizer = ContentNormalizer(workers=2)
+    try:
+        items = content_normalizer.normalize_many([make_item(text) for text in texts])
+        again = content_normalizer.normalize_many([make_item(text) for text in texts])
+    finally:
+        content_normalizer.close()
+
+    assert [item.content for item in items] == expected
+    assert [item.content for item in again] == expected
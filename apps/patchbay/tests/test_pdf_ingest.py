@@ -0,0 +1,149 @@
+"""Tests for ingesting multi-section PDFs."""
+import json
+from pathlib import Path
+from PyPDF2 import PageObject
+from adapters import pdf_adapter
+from python_shared.file_io import DataWriter
+from src.ingest import Ingestor
+
+
+PAGE_TEXT = "Page {number} of the handbook covers topic {number} in enough words to pass validation."
+
+
+def write_pdf(path: Path, pages: list[str]) -> Path:
+    """Write a minimal PDF with one line of Helvetica text per page."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # Pages, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+    )
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(data))
+    return path
+
+
+def make_ingestor(data_dir: Path, **adapter_config) -> Ingestor:
+    return Ingestor(
+        data_dir=data_dir,
+        min_content_length=20,
+        use_api=False,
+        writer=DataWriter(base_path=data_dir),
+        adapter_config={'pages_per_section': 1, 'pdf_workers': 1, **adapter_config}
+    )
+
+
+def raw_items(data_dir: Path) -> dict[str, dict]:
+    items = {}
+    for path in (data_dir / "raw").rglob("*.json"):
+        item = json.loads(path.read_text(encoding="utf-8"))
+        items[item["id"]] = item
+    return items
+
+
+def test_sections_get_their_own_items(tmp_path):
+    pdf = write_pdf(tmp_path / "handbook.pdf", [PAGE_TEXT.format(number=n) for n in range(1, 4)])
+    ingestor = make_ingestor(tmp_path / "data")
+
+    batch = ingestor.ingest(str(pdf))
+    ingestor.close()
+
+    assert batch.total == 3
+    assert [item.metadata["page_start"] for item in batch.items] == [1, 2, 3]
+    items = raw_items(tmp_path / "data")
+    assert len(items) == 3
+    assert sorted(item["content"] for item in items.values()) == [PAGE_TEXT.format(number=n) for n in range(1, 4)]
+
+
+def test_sections_are_written_as_they_are_extracted(tmp_path, monkeypatch):
+    events = []
+    extract_text = PageObject.extract_text
+
+    def recording_extract_text(page, *args, **kwargs):
+        events.append("extract")
+        return extract_text(page, *args, **kwargs)
+
+    monkeypatch.setattr(PageObject, "extract_text", recording_extract_text)
+    writer = DataWriter(base_path=tmp_path / "data")
+    write_raw = writer.write_raw
+
+    def recording_write_raw(data, source_type, per_item=False):
+        events.append("write")
+        return write_raw(data, source_type, per_item)
+
+    writer.write_raw = recording_write_raw
+    pdf = write_pdf(tmp_path / "handbook.pdf", [PAGE_TEXT.format(number=n) for n in range(1, 4)])
+    ingestor = make_ingestor(tmp_path / "data")
+    ingestor.writer = writer
+
+    batch = ingestor.ingest(str(pdf))
+    ingestor.close()
+
+    assert batch.total == 3
+    assert events == ["extract", "write"] * 3
+    assert len(raw_items(tmp_path / "data")) == 3
+
+
+def test_reingesting_unchanged_pdf_skips_every_section(tmp_path):
+    pdf = write_pdf(tmp_path / "handbook.pdf", [PAGE_TEXT.format(number=n) for n in range(1, 4)])
+    ingestor = make_ingestor(tmp_path / "data")
+    ingestor.ingest(str(pdf))
+    before = raw_items(tmp_path / "data")
+
+    batch = ingestor.ingest(str(pdf))
+    ingestor.close()
+
+    assert batch.total == 0
+    assert raw_items(tmp_path / "data") == before
+
+
+def test_changed_section_is_updated_in_place(tmp_path):
+    pages = [PAGE_TEXT.format(number=n) for n in range(1, 4)]
+    pdf = write_pdf(tmp_path / "handbook.pdf", pages)
+    ingestor = make_ingestor(tmp_path / "data")
+    first = ingestor.ingest(str(pdf))
+    ids = [item.id for item in first.items]
+
+    pages[1] = "Page 2 was rewritten and now covers something else entirely."
+    write_pdf(pdf, pages)
+    batch = ingestor.ingest(str(pdf))
+    ingestor.close()
+
+    assert [item.id for item in batch.items] == [ids[1]]
+    items = raw_items(tmp_path / "data")
+    assert set(items) == set(ids)
+    assert items[ids[1]]["content"] == pages[1]
+    assert items[ids[0]]["content"] == pages[0]
+    assert items[ids[2]]["content"] == pages[2]
+
+
+def test_parallel_extraction_keeps_page_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_adapter, "PARALLEL_MIN_PAGES", 2)
+    pages = [PAGE_TEXT.format(number=n) for n in range(1, 5)]
+    pdf = write_pdf(tmp_path / "handbook.pdf", pages)
+    adapter = pdf_adapter.PDFAdapter({'pages_per_section': 1, 'pdf_workers': 2})
+
+    batch = adapter.extract(str(pdf))
+
+    assert [item.content for item in batch.items] == pages
+    assert len({item.metadata["item_key"] for item in batch.items}) == 4
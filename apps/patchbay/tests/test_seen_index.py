@@ -0,0 +1,55 @@
+"""Tests for the seen index."""
+from models.raw_content import ITEM_KEY, RawContent
+from src.seen_index import SeenIndex, SeenStatus
+
+
+def make_item(item_id="a1", url="https://example.com/post", content="Body", **metadata):
+    return RawContent(
+        id=item_id,
+        source_type="article",
+        source_url=url,
+        title="Title",
+        content=content,
+        metadata=metadata
+    )
+
+
+def test_new_unchanged_and_changed(tmp_path):
+    index = SeenIndex(tmp_path / "seen.sqlite")
+    item = make_item()
+
+    assert index.check(item) == (SeenStatus.NEW, None)
+    index.record([item])
+    assert index.check(make_item(item_id="other")) == (SeenStatus.UNCHANGED, "a1")
+    assert index.check(make_item(item_id="other", content="Edited")) == (SeenStatus.CHANGED, "a1")
+
+
+def test_url_is_canonicalized(tmp_path):
+    index = SeenIndex(tmp_path / "seen.sqlite")
+    index.record([make_item(url="https://Example.com/post/?utm_source=feed")])
+
+    assert index.check(make_item()) == (SeenStatus.UNCHANGED, "a1")
+
+
+def test_items_sharing_a_url_are_tracked_separately(tmp_path):
+    index = SeenIndex(tmp_path / "seen.sqlite")
+    sections = [
+        make_item(item_id=f"s{page}", content=f"Section {page}", **{ITEM_KEY: f"page={page}"})
+        for page in (1, 21, 41)
+    ]
+    index.record(sections)
+
+    assert len(index) == 3
+    for section in sections:
+        assert index.check(section) == (SeenStatus.UNCHANGED, section.id)
+    edited = make_item(item_id="new", content="Edited", **{ITEM_KEY: "page=21"})
+    assert index.check(edited) == (SeenStatus.CHANGED, "s21")
+
+
+def test_record_updates_entry(tmp_path):
+    index = SeenIndex(tmp_path / "seen.sqlite")
+    index.record([make_item()])
+    index.record([make_item(content="Edited")])
+
+    assert len(index) == 1
+    assert index.check(make_item(item_id="other", content="Edited")) == (SeenStatus.UNCHANGED, "a1")
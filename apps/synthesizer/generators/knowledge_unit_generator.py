@@ -25,7 +25,8 @@ class KnowledgeUnitGenerator(BaseGenerator):
         self,
         api_key: Optional[str] = None,
         model: str = "claude-sonnet-4-20250514",
-        max_tokens: int = 4000
+        max_tokens: int = 4000,
+        max_context_items: int = 10
     ):
         """
         Initialize knowledge unit generator.
@@ -34,6 +35,7 @@ class KnowledgeUnitGenerator(BaseGenerator):
             api_key: Anthropic API key (from env if not provided)
             model: Claude model to use
             max_tokens: Maximum tokens per generation
+            max_context_items: Cluster items quoted in the prompt
         """
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         if not self.api_key:
@@ -42,6 +44,7 @@ class KnowledgeUnitGenerator(BaseGenerator):
         self.client = Anthropic(api_key=self.api_key)
         self.model = model
         self.max_tokens = max_tokens
+        self.max_context_items = max_context_items
         logger.info(f"Initialized with model: {model}")
     
     @property
@@ -92,7 +95,7 @@ class KnowledgeUnitGenerator(BaseGenerator):
     def _prepare_context(self, content_items: list[ProcessedContent]) -> str:
         """Prepare content context for prompt."""
         context_parts = []
-        for i, item in enumerate(content_items[:10], 1):  # Limit to 10 items
+        for i, item in enumerate(content_items[:self.max_context_items], 1):
             context_parts.append(f"Article {i}: {item.title}\n{item.content[:500]}...")
         
         return "\n\n".join(context_parts)
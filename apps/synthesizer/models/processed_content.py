@@ -1,7 +1,8 @@
 """Models for processed content."""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import Optional
+import numpy as np
 
 
 class ProcessedContent(BaseModel):
@@ -10,15 +11,25 @@ class ProcessedContent(BaseModel):
     original_id: str  # Reference to RawContent ID
     title: str
     content: str
-    embedding: list[float]  # Vector embedding
+    embedding: list[float] = Field(default_factory=list)  # Empty when the batch holds an embedding matrix
     processed_at: datetime = Field(default_factory=datetime.utcnow)
     metadata: dict = Field(default_factory=dict)
 
 
 class ProcessedBatch(BaseModel):
     """A batch of processed content."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
     items: list[ProcessedContent]
     total: int
     model_used: str
     processed_at: datetime = Field(default_factory=datetime.utcnow)
-
+    # (total, dim) matrix whose row i is the embedding of items[i]; kept out
+    # of model_dump() and stored as a .npy sidecar by EmbeddingStore
+    embeddings: Optional[np.ndarray] = Field(default=None, exclude=True)
+    
+    def embedding_matrix(self) -> np.ndarray:
+        """Embeddings as a matrix, built from per-item lists if no matrix is attached."""
+        if self.embeddings is not None:
+            return self.embeddings
+        return np.asarray([item.embedding for item in self.items], dtype=np.float32)
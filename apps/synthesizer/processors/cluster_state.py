@@ -0,0 +1,199 @@
+"""Persisted k-means state for incremental synthesis runs."""
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+import numpy as np
+from models.processed_content import ProcessedContent
+
+
+logger = logging.getLogger("synthesizer.cluster_state")
+
+# Relative to the data directory; the centroids go in a .npy sidecar
+CLUSTER_STATE_PATH = Path("state") / "cluster_state.json"
+
+
+@dataclass
+class ClusterMembers:
+    """Members of one fitted cluster and how many it had when units were last generated."""
+    cluster_id: int
+    items: list[dict[str, Any]] = field(default_factory=list)  # ProcessedContent without content/embedding
+    generated_size: int = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.items)
+
+    def content_items(self) -> list[ProcessedContent]:
+        """Members as ProcessedContent (no content), newest first."""
+        return [ProcessedContent(content="", **item) for item in reversed(self.items)]
+
+
+@dataclass
+class ClusterState:
+    """
+    A fitted clustering that new items can be assigned to.
+
+    Holds the centroids, every cluster's members (including clusters too
+    small to be published) and the drift since the last full fit: how many
+    items were assigned since, and how far they were from their centroid
+    compared with the fit's mean squared distance.
+    """
+    model_used: str
+    centroids: np.ndarray  # n_clusters x dimensions, float32
+    clusters: list[ClusterMembers]
+    fit_items: int
+    fit_inertia: float  # Mean squared distance to the assigned centroid at fit time
+    fitted_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+    added_items: int = 0  # Items assigned since the fit
+    added_inertia: float = 0.0  # Sum of their squared distances
+
+    @classmethod
+    def from_fit(
+        cls,
+        items: list[ProcessedContent],
+        labels: np.ndarray,
+        centroids: np.ndarray,
+        inertia: float,
+        model_used: str
+    ) -> "ClusterState":
+        """Build the state of a k-means fit (inertia as reported by KMeans)."""
+        clusters = [ClusterMembers(cluster_id) for cluster_id in range(len(centroids))]
+        for item, label in zip(items, labels, strict=True):
+            clusters[int(label)].items.append(_record(item))
+        return cls(
+            model_used=model_used,
+            centroids=np.asarray(centroids, dtype=np.float32),
+            clusters=clusters,
+            fit_items=len(items),
+            fit_inertia=float(inertia) / max(1, len(items))
+        )
+
+    @property
+    def total_items(self) -> int:
+        return sum(cluster.size for cluster in self.clusters)
+
+    @property
+    def drift(self) -> float:
+        """Items assigned since the fit, relative to the items fitted."""
+        return self.added_items / max(1, self.fit_items)
+
+    @property
+    def inertia_ratio(self) -> float:
+        """Mean squared distance of assigned items relative to the fit's."""
+        if not self.added_items or not self.fit_inertia:
+            return 1.0
+        return (self.added_inertia / self.added_items) / self.fit_inertia
+
+    def original_ids(self) -> set[str]:
+        """Raw item ids of every member."""
+        return {item.get('original_id') for cluster in self.clusters for item in cluster.items}
+
+    def assign(self, items: list[ProcessedContent], embeddings: np.ndarray) -> np.ndarray:
+        """
+        Add items to their nearest clusters, moving each centroid to the
+        mean of its members.
+
+        Args:
+            items: New processed items
+            embeddings: Their embedding matrix, row i for items[i]
+
+        Returns:
+            Cluster index of each item
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if not len(embeddings):
+            return np.empty(0, dtype=np.int64)
+
+        # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2, without an n x k x d temporary
+        distances = (
+            (embeddings ** 2).sum(axis=1, keepdims=True)
+            - 2 * embeddings @ self.centroids.T
+            + (self.centroids ** 2).sum(axis=1)
+        )
+        labels = distances.argmin(axis=1)
+        self.added_inertia += float(np.maximum(distances[np.arange(len(labels)), labels], 0).sum())
+        self.added_items += len(labels)
+
+        for label in np.unique(labels):
+            members = labels == label
+            cluster = self.clusters[int(label)]
+            count = cluster.size + int(members.sum())
+            self.centroids[label] += (embeddings[members].sum(axis=0) - members.sum() * self.centroids[label]) / count
+        for item, label in zip(items, labels, strict=True):
+            self.clusters[int(label)].items.append(_record(item))
+
+        self.updated_at = datetime.utcnow()
+        return labels
+
+    def changed_clusters(self, min_size: int, threshold: float) -> list[ClusterMembers]:
+        """
+        Clusters big enough to publish whose membership grew by at least
+        threshold (a fraction of their size when units were last generated).
+        """
+        return [
+            cluster for cluster in self.clusters
+            if cluster.size >= min_size and (
+                not cluster.generated_size
+                or (cluster.size - cluster.generated_size) / cluster.generated_size >= threshold
+            )
+        ]
+
+    def save(self, path: str | Path) -> None:
+        """Write the state atomically (centroids first)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        centroids_path = path.with_suffix(".npy")
+
+        tmp_path = centroids_path.with_name(f"{centroids_path.name}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.save(f, self.centroids)
+        os.replace(tmp_path, centroids_path)
+
+        state = {
+            "model_used": self.model_used,
+            "fitted_at": self.fitted_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+            "fit_items": self.fit_items,
+            "fit_inertia": self.fit_inertia,
+            "added_items": self.added_items,
+            "added_inertia": self.added_inertia,
+            "centroids": centroids_path.name,
+            "clusters": [
+                {"cluster_id": cluster.cluster_id, "generated_size": cluster.generated_size, "items": cluster.items}
+                for cluster in self.clusters
+            ]
+        }
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        logger.info(f"Saved cluster state ({len(self.clusters)} clusters, {self.total_items} items) to {path}")
+
+    @classmethod
+    def load(cls, path: str | Path) -> Optional["ClusterState"]:
+        """Read a saved state, or None if there is none."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return cls(
+            model_used=state["model_used"],
+            centroids=np.load(path.parent / state["centroids"]).astype(np.float32, copy=False),
+            clusters=[ClusterMembers(**cluster) for cluster in state["clusters"]],
+            fit_items=state["fit_items"],
+            fit_inertia=state["fit_inertia"],
+            fitted_at=datetime.fromisoformat(state["fitted_at"]),
+            updated_at=datetime.fromisoformat(state["updated_at"]),
+            added_items=state["added_items"],
+            added_inertia=state["added_inertia"]
+        )
+
+
+def _record(item: ProcessedContent) -> dict[str, Any]:
+    return item.model_dump(mode='json', exclude={'content', 'embedding'})
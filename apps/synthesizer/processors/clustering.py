@@ -5,6 +5,7 @@ from sklearn.cluster import KMeans
 from typing import Optional
 from models.processed_content import ProcessedContent
 from models.cluster import ContentCluster, ClusterBatch
+from processors.cluster_state import ClusterState
 
 
 logger = logging.getLogger("synthesizer.clustering")
@@ -31,20 +32,49 @@ class ClusteringProcessor:
         self.min_cluster_size = min_cluster_size
         self.max_clusters = max_clusters
     
-    def process(self, processed_items: list[ProcessedContent]) -> ClusterBatch:
+    def process(
+        self,
+        processed_items: list[ProcessedContent],
+        embeddings: Optional[np.ndarray] = None
+    ) -> ClusterBatch:
         """
         Cluster processed content items.
         
         Args:
-            processed_items: List of ProcessedContent with embeddings
+            processed_items: List of ProcessedContent
+            embeddings: Embedding matrix, row i for processed_items[i]
+                (e.g. a memory-mapped ProcessedBatch.embeddings). Built from
+                each item's embedding list if omitted.
             
         Returns:
             ClusterBatch with cluster assignments
         """
+        return self.to_batch(self.fit(processed_items, embeddings))
+    
+    def fit(
+        self,
+        processed_items: list[ProcessedContent],
+        embeddings: Optional[np.ndarray] = None,
+        model_used: str = ""
+    ) -> ClusterState:
+        """
+        Fit K-means to processed content items.
+        
+        Args:
+            processed_items: List of ProcessedContent
+            embeddings: Embedding matrix, row i for processed_items[i]
+            model_used: Embedding model, recorded so incremental runs only
+                assign embeddings from the same model
+            
+        Returns:
+            ClusterState with every cluster's centroid and members
+        """
         logger.info(f"Clustering {len(processed_items)} items")
         
-        # Extract embeddings
-        embeddings = np.array([item.embedding for item in processed_items])
+        # float32 matrices (including memory maps) are used as-is; KMeans
+        # only copies other dtypes
+        if embeddings is None:
+            embeddings = np.array([item.embedding for item in processed_items], dtype=np.float32)
         
         # Determine number of clusters if not specified
         n_clusters = self.n_clusters
@@ -57,16 +87,30 @@ class ClusteringProcessor:
         kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
         cluster_labels = kmeans.fit_predict(embeddings)
         
-        # Group items by cluster
-        clusters_dict: dict[int, list[str]] = {}
-        for item, label in zip(processed_items, cluster_labels):
-            if label not in clusters_dict:
-                clusters_dict[label] = []
-            clusters_dict[label].append(item.id)
+        return ClusterState.from_fit(
+            processed_items,
+            cluster_labels,
+            kmeans.cluster_centers_,
+            kmeans.inertia_,
+            model_used
+        )
+    
+    def to_batch(self, state: ClusterState) -> ClusterBatch:
+        """
+        Publishable clusters of a fitted (or incrementally updated) state.
         
-        # Create ContentCluster objects
+        Args:
+            state: Cluster state
+            
+        Returns:
+            ClusterBatch of the clusters with at least min_cluster_size items
+        """
         clusters = []
-        for cluster_id, content_ids in clusters_dict.items():
+        for members in state.clusters:
+            cluster_id = members.cluster_id
+            content_ids = [item['id'] for item in members.items]
+            if not content_ids:
+                continue
             # Skip clusters that are too small
             if len(content_ids) < self.min_cluster_size:
                 logger.warning(
@@ -78,7 +122,7 @@ class ClusteringProcessor:
             cluster = ContentCluster(
                 cluster_id=cluster_id,
                 content_ids=content_ids,
-                centroid=kmeans.cluster_centers_[cluster_id].tolist(),
+                centroid=state.centroids[cluster_id].tolist(),
                 size=len(content_ids),
                 topic_label=f"Topic {cluster_id}",  # Placeholder
                 keywords=[]  # Would be extracted with NLP
@@ -90,10 +134,10 @@ class ClusteringProcessor:
         return ClusterBatch(
             clusters=clusters,
             total_clusters=len(clusters),
-            total_items=len(processed_items),
+            total_items=state.total_items,
             algorithm="kmeans",
             parameters={
-                "n_clusters": n_clusters,
+                "n_clusters": len(state.clusters),
                 "min_cluster_size": self.min_cluster_size
             }
         )
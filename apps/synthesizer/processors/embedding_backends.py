@@ -0,0 +1,341 @@
+"""Inference backends that turn texts into embedding vectors."""
+import json
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+import numpy as np
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+try:
+    from tokenizers import Tokenizer
+except ImportError:
+    Tokenizer = None
+
+
+logger = logging.getLogger("synthesizer.embedding_backends")
+
+# Files in an exported ONNX model directory (see scripts/export_onnx.py)
+ONNX_QUANTIZED_FILE = "model_quantized.onnx"
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_TOKENIZER_FILE = "tokenizer.json"
+ONNX_CONFIG_FILE = "embedding_backend.json"
+
+# Texts are cut at a word boundary before max_length * this many characters,
+# so a long article isn't tokenized in full just to be truncated. This is a
+# heuristic, not a bound: a long token-free run (a URL or base64 blob) can
+# tokenize to a single [UNK], so the cut may drop text the model would see.
+# clip_texts() detects that (the cut text doesn't fill the window) and
+# tokenizes those texts in full
+MAX_CHARS_PER_TOKEN = 10
+
+
+def cut_text(text: str, limit: int) -> str:
+    """
+    Cut text to at most limit characters, at the last whitespace if any.
+
+    Tokenizers split words at whitespace, so the tokens of the cut text
+    are a prefix of the tokens of the whole text.
+    """
+    if len(text) <= limit:
+        return text
+    head = text[:limit]
+    end = max(head.rfind(' '), head.rfind('\n'), head.rfind('\t'))
+    return head[:end] if end > 0 else head
+
+
+def plan_batches(lengths: list[int], token_budget: int) -> list[list[int]]:
+    """
+    Group texts into batches of similar token length.
+
+    Texts are taken longest first; a batch is closed when adding the next
+    text would make batch size x its longest text (the padded size) exceed
+    token_budget. A text longer than the budget gets a batch of its own.
+
+    Args:
+        lengths: Token length of each text
+        token_budget: Maximum padded tokens per batch
+
+    Returns:
+        Batches of indexes into lengths; every index appears once
+    """
+    order = sorted(range(len(lengths)), key=lambda index: lengths[index], reverse=True)
+    batches: list[list[int]] = []
+    batch: list[int] = []
+    width = 0
+    for index in order:
+        if batch and (len(batch) + 1) * width > token_budget:
+            batches.append(batch)
+            batch = []
+        if not batch:
+            width = max(1, lengths[index])
+        batch.append(index)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class EmbeddingBackend(ABC):
+    """
+    Encodes texts with one embedding model.
+
+    encode() schedules the work: texts are cut to what fits the model's
+    token window, sorted by token length and packed into batches up to a
+    padded token budget (see plan_batches), so a long article is never
+    padded against a batch of short blurbs. Rows come back in input order.
+    Subclasses provide token_lengths() and _encode_batch().
+    """
+
+    name: str = ""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        # Model token window (including special tokens); set by subclasses
+        self.max_length = 512
+
+    @property
+    def model_id(self) -> str:
+        """
+        Identifies the vectors this backend produces. Recorded as a batch's
+        model_used and keyed on by the embedding cache, so vectors from
+        different backends of one model are never mixed.
+        """
+        return self.model_name
+
+    def encode(self, texts: list[str], batch_size: int = 32, token_budget: Optional[int] = None) -> np.ndarray:
+        """
+        Embed texts.
+
+        Args:
+            texts: Texts to embed
+            batch_size: Sets the default token budget (batch_size full-length texts)
+            token_budget: Maximum padded tokens per forward pass
+
+        Returns:
+            float32 matrix, row i for texts[i]
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        texts, lengths = self.clip_texts(texts)
+        batches = plan_batches(lengths, token_budget or batch_size * self.max_length)
+
+        embeddings: Optional[np.ndarray] = None
+        padded = 0
+        for batch in batches:
+            vectors = self._encode_batch([texts[index] for index in batch])
+            if embeddings is None:
+                embeddings = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            embeddings[batch] = vectors
+            padded += len(batch) * max(1, lengths[batch[0]])
+        logger.debug(
+            f"Encoded {len(texts)} texts in {len(batches)} batches "
+            f"({sum(lengths) / max(1, padded):.0%} of padded tokens used)"
+        )
+        return embeddings
+
+    def clip_texts(self, texts: list[str]) -> tuple[list[str], list[int]]:
+        """
+        Cut long texts before tokenizing without changing what the model sees.
+
+        A cut text that still fills the token window is truncated to the
+        same tokens as the whole text. One that doesn't lost text the
+        model would have read, so the whole text is used instead.
+
+        Returns:
+            (texts to encode, token length of each)
+        """
+        limit = self.max_length * MAX_CHARS_PER_TOKEN
+        clipped = [cut_text(text, limit) for text in texts]
+        lengths = self.token_lengths(clipped)
+
+        short = [
+            index for index, text in enumerate(texts)
+            if len(clipped[index]) < len(text) and lengths[index] < self.max_length
+        ]
+        if short:
+            logger.debug(f"{len(short)} cut texts don't fill the token window, tokenizing them in full")
+            for index, length in zip(short, self.token_lengths([texts[index] for index in short]), strict=True):
+                clipped[index] = texts[index]
+                lengths[index] = length
+        return clipped, lengths
+
+    @abstractmethod
+    def token_lengths(self, texts: list[str]) -> list[int]:
+        """Tokens each text is encoded as, truncated to max_length."""
+
+    @abstractmethod
+    def _encode_batch(self, texts: list[str]) -> np.ndarray:
+        """Embed one scheduled batch (float32, row i for texts[i])."""
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """sentence-transformers on torch (fp32; the reference backend)."""
+
+    name = "sentence-transformers"
+
+    def __init__(self, model_name: str, threads: Optional[int] = None, device: Optional[str] = None):
+        super().__init__(model_name)
+        # Imported here so the ONNX backend works without torch installed
+        from sentence_transformers import SentenceTransformer
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+        logger.info(f"Loading embedding model: {model_name}")
+        self.model = SentenceTransformer(model_name, device=device)
+        self.max_length = self.model.max_seq_length
+        logger.info("Model loaded successfully")
+
+    def token_lengths(self, texts: list[str]) -> list[int]:
+        encoded = self.model.tokenizer(texts, truncation=True, max_length=self.max_length)
+        return [len(ids) for ids in encoded["input_ids"]]
+
+    def _encode_batch(self, texts: list[str]) -> np.ndarray:
+        return self.model.encode(
+            texts,
+            show_progress_bar=False,
+            batch_size=len(texts),
+            convert_to_numpy=True
+        ).astype(np.float32, copy=False)
+
+
+class OnnxBackend(EmbeddingBackend):
+    """
+    ONNX Runtime on an exported copy of a sentence-transformers model.
+
+    Loads model_quantized.onnx (int8 weights) from the model directory, or
+    model.onnx if there is no quantized copy, with the tokenizer.json and
+    pooling settings written next to it by scripts/export_onnx.py. Needs
+    onnxruntime and tokenizers, not torch.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_name: str, model_path: str | Path, threads: Optional[int] = None):
+        if onnxruntime is None or Tokenizer is None:
+            raise ImportError(
+                "onnxruntime and tokenizers are required for the onnx embedding backend "
+                "(pip install onnxruntime tokenizers)"
+            )
+        super().__init__(model_name)
+        self.model_path = Path(model_path)
+        self.model_file = onnx_model_file(self.model_path)
+
+        config_path = self.model_path / ONNX_CONFIG_FILE
+        config = json.loads(config_path.read_text(encoding='utf-8')) if config_path.exists() else {}
+        if config.get("model_name") not in (None, model_name):
+            raise ValueError(f"{self.model_path} was exported from {config['model_name']}, not {model_name}")
+        self.pooling = config.get("pooling", "mean")
+        self.normalize = config.get("normalize", True)
+
+        self.max_length = config.get("max_length", 256)
+        self.tokenizer = Tokenizer.from_file(str(self.model_path / ONNX_TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.max_length)
+        # Padded to the longest text of each batch
+        self.tokenizer.enable_padding(
+            pad_id=config.get("pad_token_id", 0),
+            pad_token=config.get("pad_token", "[PAD]")
+        )
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        logger.info(f"Loading ONNX embedding model: {self.model_file}")
+        self.session = onnxruntime.InferenceSession(
+            str(self.model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    @property
+    def model_id(self) -> str:
+        return onnx_model_id(self.model_name, self.model_path)
+
+    def token_lengths(self, texts: list[str]) -> list[int]:
+        # The tokenizer pads to the longest text; count real tokens only
+        return [sum(encoding.attention_mask) for encoding in self.tokenizer.encode_batch(texts)]
+
+    def _encode_batch(self, texts: list[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        inputs = {
+            "input_ids": np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+            "attention_mask": np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64),
+            "token_type_ids": np.array([encoding.type_ids for encoding in encodings], dtype=np.int64),
+        }
+        token_embeddings = self.session.run(
+            None, {name: value for name, value in inputs.items() if name in self.input_names}
+        )[0]
+
+        if self.pooling == "cls":
+            embeddings = token_embeddings[:, 0]
+        else:
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            embeddings = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        if self.normalize:
+            embeddings = embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings.astype(np.float32, copy=False)
+
+
+def onnx_model_file(model_path: str | Path) -> Path:
+    """The ONNX file a model directory is loaded from (quantized preferred)."""
+    model_path = Path(model_path)
+    for name in (ONNX_QUANTIZED_FILE, ONNX_MODEL_FILE):
+        if (model_path / name).exists():
+            return model_path / name
+    raise FileNotFoundError(f"No {ONNX_QUANTIZED_FILE} or {ONNX_MODEL_FILE} in {model_path}")
+
+
+def onnx_model_id(model_name: str, model_path: str | Path) -> str:
+    """Model id of the vectors an exported ONNX model produces."""
+    quantized = onnx_model_file(model_path).name == ONNX_QUANTIZED_FILE
+    return f"{model_name}:onnx-int8" if quantized else f"{model_name}:onnx"
+
+
+EMBEDDING_BACKENDS = {
+    SentenceTransformerBackend.name: SentenceTransformerBackend,
+    OnnxBackend.name: OnnxBackend,
+}
+
+
+def _check_backend(backend: str, onnx_path: Optional[str | Path]) -> None:
+    """Raise ValueError for an unknown backend or a missing ONNX model directory."""
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend}")
+    if backend == OnnxBackend.name and not onnx_path:
+        raise ValueError("The onnx embedding backend needs the exported model directory (EMBEDDING_ONNX_PATH)")
+
+
+def backend_model_id(backend: str, model_name: str, onnx_path: Optional[str | Path] = None) -> str:
+    """Model id a backend would report, without loading the model."""
+    _check_backend(backend, onnx_path)
+    if backend == OnnxBackend.name:
+        return onnx_model_id(model_name, onnx_path)
+    return model_name
+
+
+def get_embedding_backend(
+    backend: str = "sentence-transformers",
+    model_name: str = "all-MiniLM-L6-v2",
+    onnx_path: Optional[str | Path] = None,
+    threads: Optional[int] = None
+) -> EmbeddingBackend:
+    """
+    Create an embedding backend.
+
+    Args:
+        backend: 'sentence-transformers' or 'onnx'
+        model_name: sentence-transformers model name
+        onnx_path: Exported model directory (onnx backend)
+        threads: Intra-op threads (default: the runtime's own choice)
+
+    Returns:
+        EmbeddingBackend instance
+    """
+    _check_backend(backend, onnx_path)
+    if backend == OnnxBackend.name:
+        return OnnxBackend(model_name, onnx_path, threads=threads)
+    return SentenceTransformerBackend(model_name, threads=threads)
@@ -0,0 +1,218 @@
+"""Persistent cache of text embeddings keyed by model and content hash."""
+import logging
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Iterable, Optional
+import numpy as np
+from python_shared.utils import content_hash
+
+
+logger = logging.getLogger("synthesizer.embedding_cache")
+
+# Relative to the data directory, next to the artifact catalog
+EMBEDDING_CACHE_PATH = Path("state") / "embedding_cache.sqlite"
+
+
+def text_key(text: str) -> str:
+    """Cache key of an embedded text."""
+    return content_hash(text)
+
+
+class EmbeddingCache:
+    """
+    SQLite cache of embeddings by (model name, SHA-256 of the embedded text).
+
+    Vectors are stored as float32 bytes. Re-running the pipeline over a
+    mostly unchanged corpus only encodes texts the model hasn't seen;
+    everything else is read back from here. Entries record when they were
+    last used, so evict() can drop the least recently used ones.
+
+    Safe to share between threads; SQLite locking makes it safe across
+    processes.
+    """
+
+    def __init__(self, db_path: str | Path):
+        """
+        Initialize embedding cache.
+
+        Args:
+            db_path: Path to the SQLite database (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                dimensions INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            );
+            CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used);
+            """
+        )
+        conn.commit()
+        self._conn = conn
+        return conn
+
+    def get_many(self, model: str, keys: Iterable[str]) -> dict[str, np.ndarray]:
+        """
+        Look up embeddings and mark the hits as used.
+
+        Args:
+            model: Embedding model name
+            keys: Text keys (see text_key)
+
+        Returns:
+            {key: float32 vector} for the keys that are cached
+        """
+        keys = list(dict.fromkeys(keys))
+        found: dict[str, np.ndarray] = {}
+        with self._lock:
+            conn = self._connect()
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = conn.execute(
+                    f"""
+                    SELECT text_hash, dimensions, vector FROM embeddings
+                    WHERE model = ? AND text_hash IN ({', '.join('?' for _ in chunk)})
+                    """,
+                    [model, *chunk]
+                ).fetchall()
+                for key, dimensions, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float32, count=dimensions)
+            if found:
+                now = time.time()
+                conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, key) for key in found]
+                )
+                conn.commit()
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, model: str, entries: dict[str, np.ndarray]) -> int:
+        """
+        Store embeddings in one transaction.
+
+        Args:
+            model: Embedding model name
+            entries: {key: vector}
+
+        Returns:
+            Number of embeddings stored
+        """
+        if not entries:
+            return 0
+        now = time.time()
+        rows = []
+        for key, vector in entries.items():
+            vector = np.ascontiguousarray(vector, dtype=np.float32).reshape(-1)
+            rows.append((model, key, len(vector), vector.tobytes(), now))
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO embeddings (model, text_hash, dimensions, vector, last_used)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+            conn.commit()
+        return len(rows)
+
+    def evict(
+        self,
+        max_entries: Optional[int] = None,
+        max_age: Optional[timedelta] = None,
+        model: Optional[str] = None
+    ) -> int:
+        """
+        Drop entries unused for longer than max_age, then the least recently
+        used ones beyond max_entries.
+
+        Args:
+            max_entries: Entries to keep (of the model, if given, else in total)
+            max_age: Drop entries not used within this time
+            model: Only consider entries of this model; alone, drops all of
+                them (e.g. for a model no longer used)
+
+        Returns:
+            Number of entries removed
+        """
+        model_clause, model_params = ("model = ?", [model]) if model is not None else ("1", [])
+        removed = 0
+        with self._lock:
+            conn = self._connect()
+            if model is not None and max_entries is None and max_age is None:
+                removed += conn.execute(f"DELETE FROM embeddings WHERE {model_clause}", model_params).rowcount
+            if max_age is not None:
+                removed += conn.execute(
+                    f"DELETE FROM embeddings WHERE last_used < ? AND {model_clause}",
+                    [time.time() - max_age.total_seconds(), *model_params]
+                ).rowcount
+            if max_entries is not None:
+                removed += conn.execute(
+                    f"""
+                    DELETE FROM embeddings WHERE rowid IN (
+                        SELECT rowid FROM embeddings WHERE {model_clause}
+                        ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    [*model_params, max(0, max_entries)]
+                ).rowcount
+            conn.commit()
+        if removed:
+            logger.info(f"Evicted {removed} cached embeddings")
+        return removed
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache since it was opened."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        """Lookup counters and the number of stored embeddings."""
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM embeddings")
+            conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
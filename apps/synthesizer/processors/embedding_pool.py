@@ -0,0 +1,136 @@
+"""Multi-process CPU encoding with any embedding backend."""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+import numpy as np
+
+
+logger = logging.getLogger("synthesizer.embedding_pool")
+
+# Thread-count variables read by the BLAS/OpenMP runtimes torch links against
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+# Set in each worker process by _init_worker
+_worker_backend = None
+_worker_batch_size = 32
+_worker_token_budget = None
+
+
+def _init_worker(
+    backend: str,
+    model_name: str,
+    onnx_path: Optional[str],
+    threads: int,
+    batch_size: int,
+    token_budget: Optional[int]
+) -> None:
+    """Pin the worker's thread count and load its copy of the model."""
+    global _worker_backend, _worker_batch_size, _worker_token_budget
+    for name in _THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+    # Imported here so the variables above are set before the runtime loads
+    from processors.embedding_backends import get_embedding_backend
+    _worker_backend = get_embedding_backend(backend, model_name, onnx_path, threads=threads)
+    _worker_batch_size = batch_size
+    _worker_token_budget = token_budget
+
+
+def _encode_shard(texts: list[str]) -> np.ndarray:
+    return _worker_backend.encode(texts, batch_size=_worker_batch_size, token_budget=_worker_token_budget)
+
+
+class EmbeddingPool:
+    """
+    Encodes texts on several worker processes, each with its own model copy.
+
+    Texts are ordered by length and split into shards of a few batches
+    each, so every shard holds texts of similar length; workers pick up
+    shards as they finish, so a slow shard doesn't stall the others.
+    Results are put back in the original order. Each worker is pinned to
+    threads_per_worker intra-op threads, so workers x threads can match the
+    core count without oversubscribing it.
+
+    Workers are started on first use (spawned, not forked, so no torch
+    state is shared) and stay up until close().
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        workers: int,
+        batch_size: int = 32,
+        threads_per_worker: Optional[int] = None,
+        shard_batches: int = 4,
+        backend: str = "sentence-transformers",
+        onnx_path: Optional[str | Path] = None,
+        token_budget: Optional[int] = None
+    ):
+        """
+        Initialize embedding pool.
+
+        Args:
+            model_name: Name of the sentence-transformers model each worker loads
+            workers: Number of worker processes
+            batch_size: Full-length texts per forward pass (see EmbeddingBackend.encode)
+            threads_per_worker: Intra-op threads per worker (defaults to
+                the CPU count divided by workers)
+            shard_batches: Batches per shard handed to a worker
+            backend: Embedding backend each worker uses
+            onnx_path: Exported model directory (onnx backend)
+            token_budget: Maximum padded tokens per forward pass
+        """
+        self.backend = backend
+        self.onnx_path = str(onnx_path) if onnx_path else None
+        self.model_name = model_name
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // self.workers)
+        self.shard_size = self.batch_size * max(1, shard_batches)
+        self.token_budget = token_budget
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _start(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            logger.info(
+                f"Starting {self.workers} embedding workers "
+                f"({self.threads_per_worker} threads each, batch size {self.batch_size})"
+            )
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.backend, self.model_name, self.onnx_path, self.threads_per_worker,
+                          self.batch_size, self.token_budget)
+            )
+        return self._executor
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """
+        Encode texts across the workers.
+
+        Returns:
+            float32 matrix, row i for texts[i]
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        # Character length is a cheap proxy for token length here; each
+        # worker still batches its shard by exact token counts
+        order = sorted(range(len(texts)), key=lambda index: len(texts[index]), reverse=True)
+        shards = [
+            [texts[index] for index in order[start:start + self.shard_size]]
+            for start in range(0, len(order), self.shard_size)
+        ]
+        # map() yields results in submission order
+        sorted_embeddings = np.concatenate(list(self._start().map(_encode_shard, shards)))
+        embeddings = np.empty_like(sorted_embeddings)
+        embeddings[order] = sorted_embeddings
+        return embeddings
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -1,8 +1,11 @@
 """Generate embeddings for content."""
 import logging
-from sentence_transformers import SentenceTransformer
+import numpy as np
 from typing import Optional
 from models.processed_content import ProcessedContent, ProcessedBatch
+from processors.embedding_backends import backend_model_id, get_embedding_backend
+from processors.embedding_cache import EmbeddingCache, text_key
+from processors.embedding_pool import EmbeddingPool
 from python_shared.utils import generate_id
 
 
@@ -12,27 +15,64 @@ logger = logging.getLogger("synthesizer.embeddings")
 class EmbeddingProcessor:
     """Generate vector embeddings for text content."""
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: int = 32,
+        workers: int = 1,
+        threads_per_worker: Optional[int] = None,
+        backend: str = "sentence-transformers",
+        onnx_path: Optional[str] = None,
+        token_budget: Optional[int] = None
+    ):
         """
         Initialize embedding processor.
         
         Args:
             model_name: Name of sentence-transformers model to use
+            cache: Embedding cache; texts already embedded by this model
+                are read from it instead of being encoded again
+            batch_size: Full-length texts per forward pass; sets the
+                default token budget
+            workers: Encoding processes; above 1, texts are sharded across
+                an EmbeddingPool instead of encoded in this process
+            threads_per_worker: Inference threads per worker process
+            backend: 'sentence-transformers' (torch, fp32) or 'onnx'
+                (ONNX Runtime on an exported, optionally int8, copy)
+            onnx_path: Exported model directory for the onnx backend
+            token_budget: Maximum padded tokens per forward pass; texts
+                are batched by token length up to it
         """
-        logger.info(f"Loading embedding model: {model_name}")
-        self.model = SentenceTransformer(model_name)
-        self.model_name = model_name
-        logger.info("Model loaded successfully")
+        # Includes the backend, so cached vectors and saved clusterings
+        # from another backend are not mixed with this one's
+        self.model_name = backend_model_id(backend, model_name, onnx_path)
+        self.cache = cache
+        self.batch_size = batch_size
+        self.token_budget = token_budget
+        self.pool = None
+        self.backend = None
+        if workers > 1:
+            # Each worker loads its own copy; this process doesn't need one
+            self.pool = EmbeddingPool(
+                model_name, workers, batch_size, threads_per_worker,
+                backend=backend, onnx_path=onnx_path, token_budget=token_budget
+            )
+            return
+        self.backend = get_embedding_backend(backend, model_name, onnx_path)
     
-    def process(self, raw_content_items: list[dict]) -> ProcessedBatch:
+    def process(self, raw_content_items: list[dict], keep_content: bool = True) -> ProcessedBatch:
         """
         Generate embeddings for raw content items.
         
         Args:
             raw_content_items: List of RawContent dictionaries
+            keep_content: Copy item content into the results (False when
+                streaming chunks, so content can be freed after embedding)
             
         Returns:
-            ProcessedBatch with embeddings
+            ProcessedBatch with the embeddings as a float32 matrix
+            (batch.embeddings, row i for item i)
         """
         logger.info(f"Processing {len(raw_content_items)} items")
         
@@ -43,17 +83,11 @@ class EmbeddingProcessor:
             text = f"{item['title']} {item['content']}"
             texts.append(text)
         
-        # Generate embeddings (batched for efficiency)
-        logger.info("Generating embeddings...")
-        embeddings = self.model.encode(
-            texts,
-            show_progress_bar=True,
-            batch_size=32
-        )
+        embeddings = self._embed(texts)
         
         # Create ProcessedContent items
         processed_items = []
-        for i, item in enumerate(raw_content_items):
+        for item in raw_content_items:
             # Preserve pathId and api_id from raw content metadata if available
             metadata = {
                 'source_type': item.get('source_type', ''),
@@ -75,8 +109,7 @@ class EmbeddingProcessor:
                 id=generate_id(),
                 original_id=item.get('id', ''),
                 title=item.get('title', ''),
-                content=item.get('content', ''),
-                embedding=embeddings[i].tolist(),
+                content=item.get('content', '') if keep_content else '',
                 metadata=metadata
             )
             processed_items.append(processed)
@@ -86,6 +119,37 @@ class EmbeddingProcessor:
         return ProcessedBatch(
             items=processed_items,
             total=len(processed_items),
-            model_used=self.model_name
+            model_used=self.model_name,
+            embeddings=embeddings
         )
-
+    
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts as a float32 matrix, encoding only cache misses."""
+        if self.cache is None or not texts:
+            return self._encode(texts)
+        
+        keys = [text_key(text) for text in texts]
+        cached = self.cache.get_many(self.model_name, keys)
+        # Texts to encode, each once even if it appears several times
+        missing = {key: text for key, text in zip(keys, texts, strict=True) if key not in cached}
+        hits = sum(key in cached for key in keys)
+        logger.info(f"Embedding cache: {hits}/{len(texts)} hits, encoding {len(missing)} texts")
+        if missing:
+            encoded = self._encode(list(missing.values()))
+            fresh = dict(zip(missing.keys(), encoded, strict=True))
+            self.cache.put_many(self.model_name, fresh)
+            cached.update(fresh)
+        
+        return np.stack([cached[key] for key in keys]).astype(np.float32, copy=False)
+    
+    def _encode(self, texts: list[str]) -> np.ndarray:
+        # Generate embeddings (batched for efficiency)
+        logger.info("Generating embeddings...")
+        if self.pool is not None:
+            return self.pool.encode(texts)
+        return self.backend.encode(texts, batch_size=self.batch_size, token_budget=self.token_budget)
+    
+    def close(self) -> None:
+        """Stop the encoding workers, if any."""
+        if self.pool is not None:
+            self.pool.close()
@@ -0,0 +1,87 @@
+"""Check that the onnx embedding backend agrees with sentence-transformers."""
+from pathlib import Path
+import argparse
+import itertools
+import os
+import sys
+import time
+
+# Add parent directory to path so we can import processors
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from dotenv import load_dotenv
+from processors.embedding_backends import get_embedding_backend
+from python_shared.file_io import DataReader
+
+SAMPLE_TEXTS = [
+    "React Server Components move data fetching to the server",
+    "Understanding the JavaScript event loop and microtask queue",
+    "TypeScript 5 adds decorators and const type parameters",
+    "Rust ownership and borrowing explained for JavaScript developers",
+    "Tuning PostgreSQL indexes for read-heavy workloads",
+    "A practical guide to CSS container queries",
+]
+
+
+def load_texts(data_dir: Path, limit: int) -> list[str]:
+    """Texts as the embedding processor builds them (title + content), from data/raw."""
+    items = itertools.islice(DataReader(base_path=data_dir).iter_raw(), limit)
+    return [f"{item.get('title', '')} {item.get('content', '')}" for item in items]
+
+
+def cosine_agreement(reference: np.ndarray, candidate: np.ndarray) -> np.ndarray:
+    """Cosine similarity between matching rows of two embedding matrices."""
+    dot = (reference * candidate).sum(axis=1)
+    norms = np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    return dot / np.maximum(norms, 1e-12)
+
+
+def main():
+    """Main function."""
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description='Compare onnx and sentence-transformers embeddings')
+    parser.add_argument('onnx_path', type=Path, nargs='?',
+                       default=os.getenv("EMBEDDING_ONNX_PATH"),
+                       help='Exported model directory (default: EMBEDDING_ONNX_PATH)')
+    parser.add_argument('--model', default=os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2"),
+                       help='sentence-transformers model the export was made from')
+    parser.add_argument('--data-dir', type=Path, default=Path(os.getenv("DATA_DIR", "../../data")),
+                       help='Data directory to sample raw items from (default: DATA_DIR)')
+    parser.add_argument('--limit', type=int, default=500,
+                       help='Raw items to embed')
+    parser.add_argument('--batch-size', type=int, default=32,
+                       help='Texts per forward pass')
+    parser.add_argument('--min-cosine', type=float, default=0.99,
+                       help='Fail if the mean cosine agreement is below this')
+    args = parser.parse_args()
+    if not args.onnx_path:
+        parser.error("onnx_path or EMBEDDING_ONNX_PATH is required")
+
+    texts = load_texts(args.data_dir, args.limit) or SAMPLE_TEXTS
+    print(f"Embedding {len(texts)} texts")
+
+    reference = get_embedding_backend("sentence-transformers", args.model)
+    candidate = get_embedding_backend("onnx", args.model, args.onnx_path)
+    embeddings = {}
+    timings = {}
+    for backend in (reference, candidate):
+        backend.encode(texts[:args.batch_size], batch_size=args.batch_size)  # Warm up
+        start = time.perf_counter()
+        embeddings[backend.name] = backend.encode(texts, batch_size=args.batch_size)
+        timings[backend.name] = time.perf_counter() - start
+
+    cosines = cosine_agreement(embeddings[reference.name], embeddings[candidate.name])
+    print(f"\n{candidate.model_id} vs {reference.model_id}")
+    print(f"cosine mean {cosines.mean():.5f}  min {cosines.min():.5f}  p5 {np.percentile(cosines, 5):.5f}")
+    for name, seconds in timings.items():
+        print(f"{name:<22} {len(texts) / seconds:8.1f} texts/s")
+    if timings[candidate.name]:
+        print(f"speedup {timings[reference.name] / timings[candidate.name]:.1f}x")
+
+    sys.exit(0 if cosines.mean() >= args.min_cosine else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Export a sentence-transformers model to ONNX with an int8-quantized copy."""
+from pathlib import Path
+import argparse
+import json
+import sys
+
+# Add parent directory to path so we can import processors
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from processors.embedding_backends import (
+    ONNX_CONFIG_FILE,
+    ONNX_MODEL_FILE,
+    ONNX_QUANTIZED_FILE,
+)
+
+
+def export(model_name: str, output_dir: Path, quantize: bool = True, opset: int = 17) -> None:
+    """
+    Write model.onnx (fp32), model_quantized.onnx (int8 weights, dynamic
+    activation quantization), tokenizer.json and the pooling settings the
+    onnx backend needs.
+
+    Requires torch, sentence-transformers and onnxruntime; the exported
+    directory then only needs onnxruntime and tokenizers.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize, Pooling
+
+    model = SentenceTransformer(model_name, device="cpu")
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    class TokenEmbeddings(torch.nn.Module):
+        """Returns only the last hidden state, the input to pooling."""
+
+        def __init__(self, auto_model):
+            super().__init__()
+            self.auto_model = auto_model
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.auto_model(
+                input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids
+            )[0]
+
+    sample = tokenizer(["An example sentence"], return_tensors="pt")
+    if "token_type_ids" not in sample:
+        sample["token_type_ids"] = torch.zeros_like(sample["input_ids"])
+    axes = {0: "batch", 1: "sequence"}
+    torch.onnx.export(
+        TokenEmbeddings(transformer),
+        (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"]),
+        str(output_dir / ONNX_MODEL_FILE),
+        input_names=["input_ids", "attention_mask", "token_type_ids"],
+        output_names=["token_embeddings"],
+        dynamic_axes={
+            "input_ids": axes, "attention_mask": axes, "token_type_ids": axes,
+            "token_embeddings": axes,
+        },
+        opset_version=opset
+    )
+    print(f"Wrote {output_dir / ONNX_MODEL_FILE}")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(
+            str(output_dir / ONNX_MODEL_FILE),
+            str(output_dir / ONNX_QUANTIZED_FILE),
+            weight_type=QuantType.QInt8
+        )
+        print(f"Wrote {output_dir / ONNX_QUANTIZED_FILE}")
+
+    tokenizer.save_pretrained(str(output_dir))
+    pooling = next((module for module in model if isinstance(module, Pooling)), None)
+    config = {
+        "model_name": model_name,
+        "pooling": "cls" if pooling is not None and pooling.pooling_mode_cls_token else "mean",
+        "normalize": any(isinstance(module, Normalize) for module in model),
+        "max_length": model.max_seq_length,
+        "pad_token": tokenizer.pad_token,
+        "pad_token_id": tokenizer.pad_token_id,
+    }
+    (output_dir / ONNX_CONFIG_FILE).write_text(json.dumps(config, indent=2), encoding='utf-8')
+    print(f"Wrote {output_dir / ONNX_CONFIG_FILE}")
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Export an embedding model for the onnx backend')
+    parser.add_argument('output_dir', type=Path,
+                       help='Directory to write the exported model to (EMBEDDING_ONNX_PATH)')
+    parser.add_argument('--model', default='all-MiniLM-L6-v2',
+                       help='sentence-transformers model to export (default: all-MiniLM-L6-v2)')
+    parser.add_argument('--no-quantize', dest='quantize', action='store_false',
+                       help='Only write the fp32 model')
+    parser.add_argument('--opset', type=int, default=17,
+                       help='ONNX opset version')
+    args = parser.parse_args()
+
+    export(args.model, args.output_dir, quantize=args.quantize, opset=args.opset)
+    print(f"\nCheck agreement with: python scripts/embedding_parity.py {args.output_dir} --model {args.model}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Binary storage for processed embeddings."""
+import json
+import logging
+import os
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+import numpy as np
+from models.processed_content import ProcessedBatch, ProcessedContent
+from python_shared.catalog import ArtifactCatalog
+from python_shared.file_io import run_stem
+
+
+logger = logging.getLogger("synthesizer.embedding_store")
+
+SUPPORTED_DTYPES = ("float32", "float16")
+
+
+class EmbeddingStore:
+    """
+    Stores processed batches as a compact metadata table plus a .npy matrix.
+
+    data/processed/embeddings_<timestamp>.json holds one small record per
+    item (ids, title, metadata; no content and no vectors) and names the
+    sidecar data/processed/embeddings_<timestamp>.npy, whose row i is the
+    embedding of item i. Loading memory-maps the matrix, so clustering
+    reads it straight from the page cache without building Python lists.
+    Item content is not stored; join back to raw content by original_id.
+    """
+
+    def __init__(
+        self,
+        base_path: str | Path = "data",
+        dtype: str = "float32",
+        catalog: Optional[ArtifactCatalog] = None
+    ):
+        """
+        Initialize embedding store.
+
+        Args:
+            base_path: Base data directory
+            dtype: On-disk precision, 'float32' or 'float16' (half the size)
+            catalog: Artifact catalog to index written items in
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        self.processed_dir = Path(base_path) / "processed"
+        self.dtype = dtype
+        self.catalog = catalog
+
+    def write(self, batch: ProcessedBatch, name: str = "embeddings") -> Path:
+        """
+        Write a processed batch.
+
+        Args:
+            batch: Batch with an embedding matrix or per-item embeddings
+            name: File name prefix
+
+        Returns:
+            Path to the metadata file
+        """
+        with self.writer(name) as writer:
+            writer.append(batch)
+        return writer.meta_path
+
+    def writer(self, name: str = "embeddings") -> "EmbeddingWriter":
+        """
+        Start writing a processed batch chunk by chunk.
+
+        Use as a context manager; files appear when it exits cleanly:
+
+            with store.writer() as writer:
+                for chunk in chunks:
+                    writer.append(chunk)
+            batch = store.load(writer.meta_path)
+        """
+        return EmbeddingWriter(self, name)
+
+    def load(self, path: Optional[str | Path] = None, mmap: bool = True) -> Optional[ProcessedBatch]:
+        """
+        Load a processed batch.
+
+        Args:
+            path: Metadata file to load (defaults to the newest embeddings file)
+            mmap: Memory-map the matrix read-only instead of reading it into memory
+
+        Returns:
+            ProcessedBatch with empty item content and the matrix attached as
+            batch.embeddings, or None if nothing has been written yet
+        """
+        meta_path = Path(path) if path else self.latest()
+        if meta_path is None:
+            return None
+
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        matrix = np.load(meta_path.parent / meta["matrix"], mmap_mode='r' if mmap else None)
+        items = [ProcessedContent(content="", **item) for item in meta["items"]]
+
+        return ProcessedBatch(
+            items=items,
+            total=meta["total"],
+            model_used=meta["model_used"],
+            processed_at=meta["processed_at"],
+            embeddings=matrix
+        )
+
+    def latest(self, name: str = "embeddings") -> Optional[Path]:
+        """Newest metadata file with a matrix sidecar, if any."""
+        candidates = sorted(
+            path for path in self.processed_dir.glob(f"{name}_*.json")
+            if path.with_suffix(".npy").exists()
+        )
+        return candidates[-1] if candidates else None
+
+    def delete(self, path: str | Path) -> None:
+        """Remove a metadata file, its matrix and the catalog entries pointing at it."""
+        meta_path = Path(path)
+        meta_path.with_suffix(".npy").unlink(missing_ok=True)
+        meta_path.unlink(missing_ok=True)
+        if self.catalog is not None:
+            self.catalog.remove_paths([f"{self.processed_dir.name}/{meta_path.name}"])
+
+
+class EmbeddingWriter:
+    """
+    Appends chunks of a processed batch to an EmbeddingStore file pair.
+
+    Matrix rows go straight to the .npy file (behind a fixed-size header
+    patched with the final shape on close) and item records to a temp
+    JSONL file, so memory use does not grow with the number of items.
+    """
+
+    # .npy header size reserved up front; fits any 2-D shape
+    HEADER_BYTES = 128
+
+    def __init__(self, store: EmbeddingStore, name: str):
+        self.store = store
+        self.name = name
+        self.meta_path = store.processed_dir / f"{run_stem(name)}.json"
+        self.matrix_path = self.meta_path.with_suffix(".npy")
+        self._matrix_tmp = self.matrix_path.with_name(f"{self.matrix_path.name}.tmp")
+        self._items_tmp = self.meta_path.with_name(f"{self.meta_path.name}.items.tmp")
+        self._matrix_file = None
+        self._items_file = None
+        self._done = False
+        self.rows = 0
+        self.dimensions: Optional[int] = None
+        self.model_used: Optional[str] = None
+        self.processed_at: Optional[datetime] = None
+
+    def append(self, batch: ProcessedBatch) -> None:
+        """Append a chunk (items plus embedding matrix)."""
+        matrix = batch.embedding_matrix().astype(self.store.dtype, copy=False)
+        if len(matrix) != len(batch.items):
+            raise ValueError(f"{len(matrix)} embeddings for {len(batch.items)} items")
+        if self.model_used is None:
+            self.model_used = batch.model_used
+            self.processed_at = batch.processed_at
+        if not len(matrix):
+            return
+
+        if self._matrix_file is None:
+            self._open()
+            self.dimensions = int(matrix.shape[1])
+        elif matrix.shape[1] != self.dimensions:
+            raise ValueError(f"Chunk has {matrix.shape[1]} dimensions, expected {self.dimensions}")
+
+        self._matrix_file.write(np.ascontiguousarray(matrix).tobytes())
+        for item in batch.items:
+            record = item.model_dump(mode='json', exclude={'content', 'embedding'})
+            self._items_file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+            self._items_file.write('\n')
+        self.rows += len(matrix)
+
+    def close(self) -> Path:
+        """
+        Finish both files (matrix first, so a metadata file never points
+        at a missing sidecar).
+
+        Returns:
+            Path to the metadata file
+        """
+        if self._done:
+            return self.meta_path
+        self._done = True
+        if self._matrix_file is None:
+            if self.model_used is None:
+                raise ValueError("Nothing was appended")
+            self._open()
+            self.dimensions = 0
+
+        self._matrix_file.seek(0)
+        self._matrix_file.write(self._npy_header((self.rows, self.dimensions)))
+        self._matrix_file.close()
+        os.replace(self._matrix_tmp, self.matrix_path)
+        self._items_file.close()
+
+        meta = {
+            "model_used": self.model_used,
+            "processed_at": self.processed_at.isoformat(),
+            "total": self.rows,
+            "dimensions": self.dimensions,
+            "dtype": self.store.dtype,
+            "matrix": self.matrix_path.name,
+        }
+        # Same layout as a single json.dump of meta with "items", streamed
+        tmp_path = self.meta_path.with_name(f"{self.meta_path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f, \
+                open(self._items_tmp, 'r', encoding='utf-8') as items:
+            f.write(json.dumps(meta, ensure_ascii=False, separators=(',', ':'))[:-1])
+            f.write(',"items":[')
+            for index, line in enumerate(items):
+                if index:
+                    f.write(',')
+                f.write(line.rstrip('\n'))
+            f.write(']}')
+        os.replace(tmp_path, self.meta_path)
+
+        if self.store.catalog is not None:
+            relative = f"{self.store.processed_dir.name}/{self.meta_path.name}"
+            with open(self._items_tmp, 'r', encoding='utf-8') as items:
+                self.store.catalog.add(
+                    ArtifactCatalog.entry_for("processed", self.name, json.loads(line), relative)
+                    for line in items
+                )
+        self._items_tmp.unlink(missing_ok=True)
+
+        logger.info(f"Wrote {self.rows} embeddings ({self.store.dtype}) to {self.matrix_path}")
+        return self.meta_path
+
+    def _open(self) -> None:
+        self.store.processed_dir.mkdir(parents=True, exist_ok=True)
+        self._matrix_file = open(self._matrix_tmp, 'wb')
+        self._matrix_file.write(b'\0' * self.HEADER_BYTES)
+        self._items_file = open(self._items_tmp, 'w', encoding='utf-8')
+
+    def abort(self) -> None:
+        """Discard everything written so far."""
+        self._done = True
+        for handle in (self._matrix_file, self._items_file):
+            if handle is not None:
+                handle.close()
+        self._matrix_tmp.unlink(missing_ok=True)
+        self._items_tmp.unlink(missing_ok=True)
+
+    def _npy_header(self, shape: tuple[int, int]) -> bytes:
+        """Version 1.0 .npy header padded to HEADER_BYTES."""
+        header = repr({
+            'descr': np.lib.format.dtype_to_descr(np.dtype(self.store.dtype)),
+            'fortran_order': False,
+            'shape': shape,
+        }).encode('latin1')
+        prefix = np.lib.format.magic(1, 0)
+        padding = self.HEADER_BYTES - len(prefix) - 2 - len(header) - 1
+        if padding < 0:
+            raise ValueError(f"Shape {shape} does not fit the reserved .npy header")
+        header += b' ' * padding + b'\n'
+        return prefix + struct.pack('<H', len(header)) + header
+
+    def __enter__(self) -> "EmbeddingWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
@@ -1,6 +1,8 @@
 """Main entry point for Synthesizer."""
+import argparse
 import os
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # Add parent directory to path so we can import modules
@@ -8,6 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from dotenv import load_dotenv
 from python_shared.logging_config import setup_logging
+from python_shared.retention import RetentionPolicy
 from src.orchestrator import SynthesisOrchestrator
 
 
@@ -27,12 +30,33 @@ def main():
     # Get configuration
     data_dir = os.getenv("DATA_DIR", "../../data")
     embedding_model = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    embedding_dtype = os.getenv("EMBEDDING_DTYPE", "float32")
+    chunk_size = int(os.getenv("SYNTHESIS_CHUNK_SIZE", "1000"))
+    embedding_cache = os.getenv("EMBEDDING_CACHE", "true").lower() == "true"
+    cache_max_entries = os.getenv("EMBEDDING_CACHE_MAX_ENTRIES")
+    recluster_drift = float(os.getenv("RECLUSTER_DRIFT", "0.25"))
+    recluster_inertia_ratio = float(os.getenv("RECLUSTER_INERTIA_RATIO", "1.5"))
+    regenerate_threshold = float(os.getenv("REGENERATE_THRESHOLD", "0.2"))
+    embedding_batch_size = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+    embedding_workers = int(os.getenv("EMBEDDING_WORKERS", "1"))
+    threads_per_worker = os.getenv("EMBEDDING_THREADS_PER_WORKER")
+    embedding_backend = os.getenv("EMBEDDING_BACKEND", "sentence-transformers")
+    token_budget = os.getenv("EMBEDDING_TOKEN_BUDGET")
     claude_model = os.getenv("CLAUDE_MODEL", "claude-sonnet-4-20250514")
     min_cluster_size = int(os.getenv("MIN_CLUSTER_SIZE", "3"))
     max_clusters = int(os.getenv("MAX_CLUSTERS", "10"))
     api_base_url = os.getenv("API_URL")
     use_api = api_base_url is not None
     
+    # Retention of old per-run outputs (see the compact command)
+    max_age_days = os.getenv("RETENTION_MAX_AGE_DAYS")
+    retention = RetentionPolicy(
+        keep_last=int(os.getenv("RETENTION_KEEP_LAST", "5")),
+        max_age=timedelta(days=float(max_age_days)) if max_age_days else None,
+        archive=os.getenv("RETENTION_ARCHIVE", "true").lower() == "true"
+    )
+    compact_after_run = os.getenv("RETENTION_AFTER_RUN", "false").lower() == "true"
+    
     # Create orchestrator
     orchestrator = SynthesisOrchestrator(
         data_dir=data_dir,
@@ -41,7 +65,23 @@ def main():
         min_cluster_size=min_cluster_size,
         max_clusters=max_clusters,
         use_api=use_api,
-        api_base_url=api_base_url
+        api_base_url=api_base_url,
+        embedding_dtype=embedding_dtype,
+        data_codec=os.getenv("DATA_CODEC", "json"),
+        data_compression=os.getenv("DATA_COMPRESSION") or None,
+        retention=retention if compact_after_run else None,
+        chunk_size=chunk_size or None,
+        embedding_cache=embedding_cache,
+        embedding_cache_max_entries=int(cache_max_entries) if cache_max_entries else None,
+        recluster_drift=recluster_drift,
+        recluster_inertia_ratio=recluster_inertia_ratio,
+        regenerate_threshold=regenerate_threshold,
+        embedding_batch_size=embedding_batch_size,
+        embedding_workers=embedding_workers,
+        embedding_threads_per_worker=int(threads_per_worker) if threads_per_worker else None,
+        embedding_backend=embedding_backend,
+        embedding_onnx_path=os.getenv("EMBEDDING_ONNX_PATH") or None,
+        embedding_token_budget=int(token_budget) if token_budget else None
     )
     
     # Parse command
@@ -49,21 +89,79 @@ def main():
         print("Usage: python -m src.main <command>")
         print("\nCommands:")
         print("  process    - Run full synthesis pipeline")
+        print("               [--source-type TYPE ...] [--since ISO_DATE] [--until ISO_DATE] [--path-id ID]")
+        print("               [--since-last-run] [--incremental]")
         print("  embeddings - Generate embeddings only")
         print("  cluster    - Cluster existing embeddings")
         print("  generate   - Generate knowledge units from clusters")
+        print("  rebuild-catalog - Re-index data/ in the artifact catalog")
+        print("  compact    - Expire old processed/synthesized outputs")
+        print("               [--keep-last N] [--max-age-days DAYS] [--no-archive] [--dry-run]")
         sys.exit(1)
     
     command = sys.argv[1]
     
-    if command == "process":
-        summary = orchestrator.run_full_pipeline()
-        if "error" in summary:
-            logger.error(summary["error"])
+    try:
+        if command == "process":
+            parser = argparse.ArgumentParser(prog="python -m src.main process")
+            parser.add_argument('--source-type', dest='source_types', action='append',
+                               help='Only synthesize items of this source type (repeatable)')
+            parser.add_argument('--since', type=datetime.fromisoformat,
+                               help='Only synthesize items extracted at or after this UTC time')
+            parser.add_argument('--until', type=datetime.fromisoformat,
+                               help='Only synthesize items extracted before this UTC time')
+            parser.add_argument('--path-id', help='Only synthesize items ingested for this learning path')
+            parser.add_argument('--since-last-run', action='store_true',
+                               help='Only synthesize items that arrived since knowledge units were last written')
+            parser.add_argument('--incremental', action='store_true',
+                               help='Assign new items to the saved clusters and regenerate only changed clusters')
+            args = parser.parse_args(sys.argv[2:])
+            
+            if args.incremental:
+                if args.source_types or args.since or args.until or args.path_id or args.since_last_run:
+                    parser.error("--incremental always covers the whole corpus and takes no filters")
+                summary = orchestrator.run_incremental()
+            else:
+                summary = orchestrator.run_full_pipeline(
+                    source_types=args.source_types,
+                    since=args.since,
+                    until=args.until,
+                    path_id=args.path_id,
+                    since_last_run=args.since_last_run
+                )
+            if "error" in summary:
+                logger.error(summary["error"])
+                sys.exit(1)
+        elif command == "rebuild-catalog":
+            total = orchestrator.writer.rebuild_catalog()
+            logger.info(f"Cataloged {total} records")
+        elif command == "compact":
+            parser = argparse.ArgumentParser(prog="python -m src.main compact")
+            parser.add_argument('--keep-last', type=int, default=retention.keep_last,
+                               help='Runs of each output type to keep (at least 1)')
+            parser.add_argument('--max-age-days', type=float,
+                               default=retention.max_age.total_seconds() / 86400 if retention.max_age else None,
+                               help='Also keep runs younger than this many days')
+            parser.add_argument('--no-archive', dest='archive', action='store_false', default=retention.archive,
+                               help='Delete expired runs instead of archiving them')
+            parser.add_argument('--dry-run', action='store_true',
+                               help='Only report what would be removed')
+            args = parser.parse_args(sys.argv[2:])
+            
+            report = orchestrator.compact(
+                RetentionPolicy(
+                    keep_last=args.keep_last,
+                    max_age=timedelta(days=args.max_age_days) if args.max_age_days is not None else None,
+                    archive=args.archive
+                ),
+                dry_run=args.dry_run
+            )
+            print(report.summary())
+        else:
+            logger.error(f"Unknown command: {command}")
             sys.exit(1)
-    else:
-        logger.error(f"Unknown command: {command}")
-        sys.exit(1)
+    finally:
+        orchestrator.close()
 
 
 if __name__ == "__main__":
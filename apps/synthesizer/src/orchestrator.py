@@ -1,13 +1,23 @@
 """Orchestrates the full synthesis pipeline."""
+import itertools
 import logging
 import os
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
+import numpy as np
 from processors.embeddings import EmbeddingProcessor
+from processors.embedding_cache import EMBEDDING_CACHE_PATH, EmbeddingCache
 from processors.clustering import ClusteringProcessor
+from processors.cluster_state import CLUSTER_STATE_PATH, ClusterState
 from generators.knowledge_unit_generator import KnowledgeUnitGenerator
+from models.cluster import ContentCluster
+from models.synthesis_result import KnowledgeUnit
+from models.processed_content import ProcessedBatch, ProcessedContent
 from python_shared.file_io import DataReader, DataWriter
+from python_shared.retention import CompactionReport, RetentionPolicy, compact
 from src.api_client import KasitaApiClient
+from src.embedding_store import EmbeddingStore
 
 
 logger = logging.getLogger("synthesizer.orchestrator")
@@ -24,13 +34,48 @@ class SynthesisOrchestrator:
         min_cluster_size: int = 3,
         max_clusters: int = 10,
         use_api: bool = True,
-        api_base_url: Optional[str] = None
+        api_base_url: Optional[str] = None,
+        embedding_dtype: str = "float32",
+        data_codec: str = "json",
+        data_compression: Optional[str] = None,
+        retention: Optional[RetentionPolicy] = None,
+        chunk_size: Optional[int] = 1000,
+        embedding_cache: bool = True,
+        embedding_cache_max_entries: Optional[int] = None,
+        recluster_drift: float = 0.25,
+        recluster_inertia_ratio: float = 1.5,
+        regenerate_threshold: float = 0.2,
+        embedding_batch_size: int = 32,
+        embedding_workers: int = 1,
+        embedding_threads_per_worker: Optional[int] = None,
+        embedding_backend: str = "sentence-transformers",
+        embedding_onnx_path: Optional[str] = None,
+        embedding_token_budget: Optional[int] = None
     ):
         self.reader = DataReader(base_path=data_dir)
-        self.writer = DataWriter(base_path=data_dir)
+        self.writer = DataWriter(base_path=data_dir, codec=data_codec, compression=data_compression)
+        self.embedding_store = EmbeddingStore(
+            base_path=data_dir,
+            dtype=embedding_dtype,
+            catalog=self.writer.catalog
+        )
         
         # Initialize processors
-        self.embedding_processor = EmbeddingProcessor(model_name=embedding_model)
+        # Embeddings of texts seen in earlier runs are reused, not re-encoded
+        self.embedding_cache = (
+            EmbeddingCache(Path(data_dir) / EMBEDDING_CACHE_PATH) if embedding_cache else None
+        )
+        self.embedding_cache_max_entries = embedding_cache_max_entries
+        self.embedding_processor = EmbeddingProcessor(
+            model_name=embedding_model,
+            cache=self.embedding_cache,
+            batch_size=embedding_batch_size,
+            workers=embedding_workers,
+            threads_per_worker=embedding_threads_per_worker,
+            backend=embedding_backend,
+            onnx_path=embedding_onnx_path,
+            token_budget=embedding_token_budget
+        )
         self.clustering_processor = ClusteringProcessor(
             min_cluster_size=min_cluster_size,
             max_clusters=max_clusters
@@ -40,8 +85,29 @@ class SynthesisOrchestrator:
         # API client (optional)
         self.use_api = use_api and os.getenv("API_URL") is not None
         self.api_client = KasitaApiClient(api_base_url) if self.use_api else None
+        # Retention policy applied after each pipeline run (None disables)
+        self.retention = retention
+        # Raw items embedded per chunk; None loads everything at once
+        self.chunk_size = chunk_size
+        # Incremental runs: recluster once the items added since the last
+        # fit exceed recluster_drift of the items fitted, or they sit
+        # recluster_inertia_ratio times further from their centroids than
+        # fitted items did; regenerate units for clusters that grew by
+        # regenerate_threshold
+        self.cluster_state_path = Path(data_dir) / CLUSTER_STATE_PATH
+        self.recluster_drift = recluster_drift
+        self.recluster_inertia_ratio = recluster_inertia_ratio
+        self.regenerate_threshold = regenerate_threshold
     
-    def run_full_pipeline(self) -> dict:
+    def run_full_pipeline(
+        self,
+        source_types: Optional[Iterable[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        path_id: Optional[str] = None,
+        since_last_run: bool = False,
+        embedded: Optional[ProcessedBatch] = None
+    ) -> dict:
         """
         Run the complete synthesis pipeline:
         1. Load raw content
@@ -49,48 +115,56 @@ class SynthesisOrchestrator:
         3. Cluster content
         4. Generate knowledge units
         
+        Args:
+            source_types: Only synthesize raw items of these source types
+            since: Only synthesize items extracted at or after this time (UTC)
+            until: Only synthesize items extracted before this time (UTC)
+            path_id: Only synthesize items ingested for this learning path
+            since_last_run: Only synthesize items that arrived after the
+                last knowledge units were written (found via the catalog)
+            embedded: Items embedded already (by an incremental run that
+                crossed the drift threshold); their embeddings are reused
+                instead of encoding them again
+        
         Returns:
             Summary statistics
         """
         logger.info("="*60)
         logger.info("STARTING SYNTHESIS PIPELINE")
         logger.info("="*60)
+        started_at = datetime.utcnow()
         
         # Step 1: Load raw content
         logger.info("\n[1/4] Loading raw content...")
-        raw_files = self.reader.read_all_raw()
-        if not raw_files:
-            logger.error("No raw content found!")
-            return {"error": "No raw content available"}
-        
-        # Extract individual items from batches
-        raw_items = []
-        for file_data in raw_files:
-            if 'items' in file_data:
-                # This is a batch file, extract items
-                raw_items.extend(file_data['items'])
-            else:
-                # This is a single item file
-                raw_items.append(file_data)
-        
-        if not raw_items:
-            logger.error("No raw content items found!")
-            return {"error": "No raw content items available"}
-        
-        logger.info(f"Loaded {len(raw_items)} raw items")
+        # Items are streamed file by file (batch files expanded in place)
+        # and filtered before they are collected
+        written_since = None
+        if since_last_run:
+            written_since = self.reader.last_written("synthesized", "knowledge_units")
+            logger.info(f"Items written since last run: {written_since or 'no previous run'}")
+        raw_items = self.reader.iter_raw(
+            source_types=source_types,
+            since=since,
+            until=until,
+            path_id=path_id,
+            written_since=written_since
+        )
         
         # Step 2: Generate embeddings
-        logger.info("\n[2/4] Generating embeddings...")
-        processed_batch = self.embedding_processor.process(raw_items)
-        self.writer.write_processed(
-            processed_batch.model_dump(mode='json'),
-            "embeddings"
-        )
-        logger.info(f"Generated embeddings for {processed_batch.total} items")
+        raw_count, processed_batch, _ = self._embed(raw_items, embedded)
+        
+        if not raw_count:
+            logger.error("No raw content items found!")
+            return {"error": "No raw content items available"}
         
         # Step 3: Cluster content
         logger.info("\n[3/4] Clustering content...")
-        cluster_batch = self.clustering_processor.process(processed_batch.items)
+        cluster_state = self.clustering_processor.fit(
+            processed_batch.items,
+            processed_batch.embeddings,
+            processed_batch.model_used
+        )
+        cluster_batch = self.clustering_processor.to_batch(cluster_state)
         self.writer.write_processed(
             cluster_batch.model_dump(mode='json'),
             "clusters"
@@ -99,26 +173,244 @@ class SynthesisOrchestrator:
         
         # Step 4: Generate knowledge units
         logger.info("\n[4/4] Generating knowledge units...")
+        items_by_id = {item.id: item for item in processed_batch.items}
+        all_units = self._generate_units(
+            [
+                (cluster, [items_by_id[content_id] for content_id in cluster.content_ids if content_id in items_by_id])
+                for cluster in cluster_batch.clusters
+            ],
+            processed_batch.items
+        )
+        
+        # Summary
+        summary = {
+            "raw_items": raw_count,
+            "processed_items": processed_batch.total,
+            "clusters": cluster_batch.total_clusters,
+            "knowledge_units": len(all_units)
+        }
+        if self.embedding_cache is not None:
+            summary["embedding_cache_hit_rate"] = round(self.embedding_cache.hit_rate, 4)
+        
+        # Incremental runs assign new items to this clustering; it must
+        # cover the whole corpus, so filtered runs don't replace it
+        if not (source_types or since or until or path_id or since_last_run):
+            for cluster in cluster_batch.clusters:
+                cluster_state.clusters[cluster.cluster_id].generated_size = cluster.size
+            cluster_state.updated_at = started_at
+            cluster_state.save(self.cluster_state_path)
+        
+        # Expire old per-run outputs
+        if self.retention is not None:
+            report = self.compact(self.retention)
+            summary["bytes_reclaimed"] = report.bytes_reclaimed
+        
+        logger.info("\n" + "="*60)
+        logger.info("PIPELINE COMPLETE")
+        logger.info("="*60)
+        logger.info(f"Summary: {summary}")
+        
+        return summary
+    
+    def run_incremental(self) -> dict:
+        """
+        Synthesize only what arrived since the last run:
+        1. Load raw items written since the saved cluster state
+        2. Embed them and assign each to its nearest existing cluster
+        3. Regenerate knowledge units for clusters that grew materially
+        
+        Falls back to run_full_pipeline (a full recluster) when there is no
+        saved state, the embedding model changed, or the drift/inertia
+        thresholds are crossed (the new items' embeddings are then reused
+        rather than encoded and written twice).
+        
+        Returns:
+            Summary statistics
+        """
+        state = ClusterState.load(self.cluster_state_path)
+        if state is None:
+            logger.info("No saved cluster state; running the full pipeline")
+            return self.run_full_pipeline()
+        if state.model_used != self.embedding_processor.model_name:
+            logger.info(f"Cluster state was fitted with {state.model_used}; running the full pipeline")
+            return self.run_full_pipeline()
+        
+        logger.info("="*60)
+        logger.info("STARTING INCREMENTAL SYNTHESIS")
+        logger.info("="*60)
+        started_at = datetime.utcnow()
+        
+        # Step 1: Load new raw content
+        logger.info(f"\n[1/3] Loading raw content written since {state.updated_at}...")
+        known_ids = state.original_ids()
+        raw_items = (
+            item for item in self.reader.iter_raw(written_since=state.updated_at)
+            if item.get('id') not in known_ids
+        )
+        
+        # Step 2: Embed and assign to existing clusters
+        raw_count, processed_batch, embeddings_path = self._embed(raw_items)
+        if not raw_count:
+            logger.info("No new raw content")
+            return {"raw_items": 0, "processed_items": 0, "clusters": 0, "knowledge_units": 0}
+        
+        logger.info("\n[2/3] Assigning new items to clusters...")
+        state.assign(processed_batch.items, processed_batch.embeddings)
+        logger.info(
+            f"Assigned {raw_count} items (drift {state.drift:.1%}, "
+            f"inertia ratio {state.inertia_ratio:.2f})"
+        )
+        if state.drift > self.recluster_drift or state.inertia_ratio > self.recluster_inertia_ratio:
+            logger.info("Cluster drift threshold crossed; reclustering the full corpus")
+            summary = self.run_full_pipeline(embedded=processed_batch)
+            # The full run wrote these items again along with the rest
+            self.embedding_store.delete(embeddings_path)
+            return summary
+        
+        cluster_batch = self.clustering_processor.to_batch(state)
+        self.writer.write_processed(
+            cluster_batch.model_dump(mode='json'),
+            "clusters"
+        )
+        
+        # Step 3: Generate knowledge units for changed clusters
+        changed = state.changed_clusters(self.clustering_processor.min_cluster_size, self.regenerate_threshold)
+        logger.info(f"\n[3/3] Generating knowledge units for {len(changed)} changed clusters...")
+        published = {cluster.cluster_id: cluster for cluster in cluster_batch.clusters}
+        all_units = self._generate_units(
+            [(published[members.cluster_id], members.content_items()) for members in changed],
+            processed_batch.items
+        )
+        for members in changed:
+            members.generated_size = members.size
+        state.updated_at = started_at
+        state.save(self.cluster_state_path)
+        
+        summary = {
+            "raw_items": raw_count,
+            "processed_items": processed_batch.total,
+            "clusters": cluster_batch.total_clusters,
+            "changed_clusters": len(changed),
+            "knowledge_units": len(all_units)
+        }
+        if self.embedding_cache is not None:
+            summary["embedding_cache_hit_rate"] = round(self.embedding_cache.hit_rate, 4)
+        
+        # Expire old per-run outputs
+        if self.retention is not None:
+            report = self.compact(self.retention)
+            summary["bytes_reclaimed"] = report.bytes_reclaimed
+        
+        logger.info("\n" + "="*60)
+        logger.info("INCREMENTAL SYNTHESIS COMPLETE")
+        logger.info("="*60)
+        logger.info(f"Summary: {summary}")
+        
+        return summary
+    
+    def _embed(
+        self,
+        raw_items: Iterable[dict],
+        embedded: Optional[ProcessedBatch] = None
+    ) -> tuple[int, Optional[ProcessedBatch], Optional[Path]]:
+        """
+        Embed raw items and write them to the embedding store.
+        
+        Args:
+            raw_items: Raw items to embed
+            embedded: Items embedded already; raw items among them (by
+                original_id) take their item and embedding from here
+        
+        Returns:
+            (number of raw items, processed batch, embedding store metadata
+            file), or (0, None, None) if there were no items
+        """
+        # Row of each already embedded item, by raw item id
+        rows = {item.original_id: row for row, item in enumerate(embedded.items)} if embedded else {}
+        if self.chunk_size:
+            # Embed chunk by chunk, appending to the embedding store as we
+            # go; only item ids/metadata and the memory-mapped matrix stay
+            # in memory, so peak memory doesn't grow with the corpus
+            logger.info(f"\n[2/4] Generating embeddings ({self.chunk_size} items per chunk)...")
+            raw_count, processed_batch, path = self._embed_in_chunks(raw_items, embedded, rows)
+        else:
+            raw_items = list(raw_items)
+            raw_count = len(raw_items)
+            logger.info(f"Loaded {raw_count} raw items")
+            logger.info("\n[2/4] Generating embeddings...")
+            processed_batch = self._process(raw_items, embedded, rows) if raw_items else None
+            path = self.embedding_store.write(processed_batch) if processed_batch is not None else None
+            del raw_items
+        
+        if raw_count:
+            logger.info(f"Generated embeddings for {processed_batch.total} items")
+        if self.embedding_cache is not None:
+            logger.info(f"Embedding cache hit rate: {self.embedding_cache.hit_rate:.1%}")
+            if self.embedding_cache_max_entries is not None:
+                self.embedding_cache.evict(max_entries=self.embedding_cache_max_entries)
+        return raw_count, processed_batch, path
+    
+    def _process(
+        self,
+        raw_items: list[dict],
+        embedded: Optional[ProcessedBatch],
+        rows: dict[str, int],
+        keep_content: bool = True
+    ) -> ProcessedBatch:
+        """Embed raw items, except those at rows of embedded (see _embed)."""
+        reused = [rows[item['id']] for item in raw_items if item.get('id') in rows]
+        if not reused:
+            return self.embedding_processor.process(raw_items, keep_content=keep_content)
+        
+        logger.info(f"Reusing the embeddings of {len(reused)} items")
+        items = [embedded.items[row] for row in reused]
+        matrices = [np.asarray(embedded.embedding_matrix()[reused], dtype=np.float32)]
+        fresh = [item for item in raw_items if item.get('id') not in rows]
+        if fresh:
+            batch = self.embedding_processor.process(fresh, keep_content=keep_content)
+            items.extend(batch.items)
+            matrices.append(batch.embeddings)
+        return ProcessedBatch(
+            items=items,
+            total=len(items),
+            model_used=self.embedding_processor.model_name,
+            embeddings=np.concatenate(matrices)
+        )
+    
+    def _generate_units(
+        self,
+        clusters: list[tuple[ContentCluster, list[ProcessedContent]]],
+        processed_items: list[ProcessedContent]
+    ) -> list[KnowledgeUnit]:
+        """
+        Generate knowledge units for clusters, ingest them to the API if
+        enabled and save them to files.
+        
+        Args:
+            clusters: Each cluster with its content items
+            processed_items: Items the pathId falls back to (from metadata)
+        
+        Returns:
+            Generated knowledge units
+        """
         all_units = []
         unit_source_mapping = {}  # Maps unit.id to list of source IDs (API raw content IDs)
         
         # Get pathId - prioritize DEFAULT_PATH_ID env var over metadata
         # This ensures we use the pathId from the current synthesis request
         path_id = os.getenv("DEFAULT_PATH_ID")
-        if not path_id and processed_batch.items:
-            first_processed = processed_batch.items[0]
+        if not path_id and processed_items:
+            first_processed = processed_items[0]
             path_id = first_processed.metadata.get('pathId')
 
         logger.info(f"Using pathId: {path_id}")
         
-        for cluster in cluster_batch.clusters:
+        for cluster, content_items in clusters:
             logger.info(f"\nProcessing cluster {cluster.cluster_id} ({cluster.size} items)...")
             
-            # Get content items for this cluster
-            content_items = [
-                item for item in processed_batch.items
-                if item.id in cluster.content_ids
-            ]
+            # Content isn't kept in memory when embedding in chunks or
+            # assigning incrementally; load what the prompt quotes
+            self._hydrate_content(content_items[:self.knowledge_unit_generator.max_context_items])
             
             # Generate units
             try:
@@ -134,8 +426,11 @@ class SynthesisOrchestrator:
                     source_ids = []
                     for content_item in content_items:
                         # Try to find the API ID for this raw content
-                        # First check if we have an API ID in metadata
-                        api_id = content_item.metadata.get('api_id')
+                        # First check metadata, then the local catalog
+                        api_id = (
+                            content_item.metadata.get('api_id')
+                            or self.reader.find_api_id(content_item.original_id)
+                        )
                         if api_id:
                             source_ids.append(api_id)
                         elif self.use_api and self.api_client:
@@ -187,18 +482,55 @@ class SynthesisOrchestrator:
             self.writer.write_synthesized(output, "knowledge_units")
             logger.info(f"\nSaved {len(all_units)} knowledge units to files")
         
-        # Summary
-        summary = {
-            "raw_items": len(raw_items),
-            "processed_items": processed_batch.total,
-            "clusters": cluster_batch.total_clusters,
-            "knowledge_units": len(all_units)
-        }
+        return all_units
+    
+    def _embed_in_chunks(
+        self,
+        raw_items: Iterable[dict],
+        embedded: Optional[ProcessedBatch],
+        rows: dict[str, int]
+    ) -> tuple[int, Optional[ProcessedBatch], Optional[Path]]:
+        """
+        Embed raw items chunk_size at a time into one embedding store file.
         
-        logger.info("\n" + "="*60)
-        logger.info("PIPELINE COMPLETE")
-        logger.info("="*60)
-        logger.info(f"Summary: {summary}")
+        Returns:
+            (number of raw items, the written batch loaded with a memory-mapped
+            matrix and no item content, its metadata file), or (0, None, None)
+            if there were no items
+        """
+        raw_items = iter(raw_items)
+        raw_count = 0
+        with self.embedding_store.writer() as writer:
+            while chunk := list(itertools.islice(raw_items, self.chunk_size)):
+                raw_count += len(chunk)
+                writer.append(self._process(chunk, embedded, rows, keep_content=False))
+                logger.info(f"Embedded {raw_count} raw items")
+                del chunk
+            if not raw_count:
+                writer.abort()
+                return 0, None, None
+        return raw_count, self.embedding_store.load(writer.meta_path, mmap=True), writer.meta_path
+    
+    def _hydrate_content(self, items: list[ProcessedContent]) -> None:
+        """Fill in content (not kept when embedding in chunks) from raw items."""
+        for item in items:
+            if item.content:
+                continue
+            raw_item = self.reader.read_raw_item(item.original_id)
+            if raw_item is not None:
+                item.content = raw_item.get('content', '')
+    
+    def close(self) -> None:
+        """Stop embedding workers and close the embedding cache."""
+        self.embedding_processor.close()
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
+    
+    def compact(self, policy: RetentionPolicy, dry_run: bool = False) -> CompactionReport:
+        """
+        Apply a retention policy to data/processed and data/synthesized.
         
-        return summary
-
+        Returns:
+            CompactionReport with the bytes reclaimed
+        """
+        return compact(self.writer.base_path, policy, dry_run=dry_run, catalog=self.writer.catalog)
@@ -0,0 +1,94 @@
+"""Tests for the persisted cluster state used by incremental runs."""
+import numpy as np
+import pytest
+from models.processed_content import ProcessedContent
+from processors.cluster_state import ClusterState
+
+
+def make_items(*ids: str) -> list[ProcessedContent]:
+    return [
+        ProcessedContent(id=f"emb_{item_id}", original_id=item_id, title=item_id, content=f"Content of {item_id}")
+        for item_id in ids
+    ]
+
+
+def fitted_state() -> ClusterState:
+    # Two clusters around (0, 0) and (10, 0); mean squared distance 1
+    embeddings = np.array([[-1, 0], [1, 0], [9, 0], [11, 0]], dtype=np.float32)
+    labels = np.array([0, 0, 1, 1])
+    centroids = np.array([[0, 0], [10, 0]], dtype=np.float32)
+    return ClusterState.from_fit(make_items("a", "b", "c", "d"), labels, centroids, 4.0, "m1")
+
+
+def test_from_fit():
+    state = fitted_state()
+
+    assert [cluster.size for cluster in state.clusters] == [2, 2]
+    assert [item["original_id"] for item in state.clusters[1].items] == ["c", "d"]
+    assert "content" not in state.clusters[0].items[0]
+    assert (state.fit_items, state.fit_inertia) == (4, 1.0)
+    assert state.original_ids() == {"a", "b", "c", "d"}
+    assert (state.drift, state.inertia_ratio) == (0.0, 1.0)
+
+
+def test_assign_moves_centroids_to_the_running_mean():
+    state = fitted_state()
+    embeddings = np.array([[3, 0], [0, 6], [16, 0]], dtype=np.float32)
+
+    labels = state.assign(make_items("e", "f", "g"), embeddings)
+
+    assert labels.tolist() == [0, 0, 1]
+    # Mean of all members, old ones included
+    np.testing.assert_allclose(state.centroids, [[3 / 4, 6 / 4], [12, 0]])
+    assert [cluster.size for cluster in state.clusters] == [4, 3]
+    assert [item["original_id"] for item in state.clusters[0].items] == ["a", "b", "e", "f"]
+    assert [item.original_id for item in state.clusters[0].content_items()] == ["f", "e", "b", "a"]
+    assert state.total_items == 7
+    assert state.assign([], np.empty((0, 2))).tolist() == []
+
+
+def test_assign_tracks_drift_and_inertia():
+    state = fitted_state()
+    state.assign(make_items("e"), np.array([[0, 1]], dtype=np.float32))
+
+    assert state.drift == pytest.approx(0.25)
+    assert state.inertia_ratio == pytest.approx(1.0)
+
+    # Far from every centroid: the clustering no longer fits the data.
+    # Cluster 0 moved to (0, 1/3) with the first item
+    state.assign(make_items("f"), np.array([[5, 7]], dtype=np.float32))
+    assert state.drift == pytest.approx(0.5)
+    assert state.added_inertia == pytest.approx(1 + 25 + (20 / 3) ** 2)
+    assert state.inertia_ratio == pytest.approx(state.added_inertia / 2)
+
+
+def test_changed_clusters():
+    state = fitted_state()
+    assert [cluster.cluster_id for cluster in state.changed_clusters(min_size=2, threshold=0.5)] == [0, 1]
+    assert state.changed_clusters(min_size=3, threshold=0.5) == []
+
+    for cluster in state.clusters:
+        cluster.generated_size = cluster.size
+    assert state.changed_clusters(min_size=2, threshold=0.5) == []
+
+    state.assign(make_items("e"), np.array([[0, 1]], dtype=np.float32))
+    assert state.changed_clusters(min_size=2, threshold=0.5) == [state.clusters[0]]
+    assert state.changed_clusters(min_size=2, threshold=0.6) == []
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "state" / "cluster_state.json"
+    state = fitted_state()
+    state.assign(make_items("e"), np.array([[0, 1]], dtype=np.float32))
+    state.clusters[1].generated_size = 2
+
+    assert ClusterState.load(path) is None
+    state.save(path)
+    loaded = ClusterState.load(path)
+
+    assert loaded.centroids.dtype == np.float32
+    np.testing.assert_array_equal(loaded.centroids, state.centroids)
+    assert loaded.clusters == state.clusters
+    for name in ("model_used", "fit_items", "fit_inertia", "added_items", "added_inertia", "fitted_at", "updated_at"):
+        assert getattr(loaded, name) == getattr(state, name)
+    assert sorted(file.name for file in path.parent.iterdir()) == ["cluster_state.json", "cluster_state.npy"]
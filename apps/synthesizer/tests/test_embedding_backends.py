@@ -0,0 +1,106 @@
+"""Tests for embedding backend selection, batch scheduling and text clipping."""
+import numpy as np
+import pytest
+
+from processors.embedding_backends import EmbeddingBackend, backend_model_id, cut_text, plan_batches
+from processors.embeddings import EmbeddingProcessor
+
+
+class WordBackend(EmbeddingBackend):
+    """One token per whitespace-separated word, like a WordPiece tokenizer
+    that maps any overlong word to a single [UNK]."""
+
+    name = "words"
+
+    def __init__(self, max_length: int = 8):
+        super().__init__("words")
+        self.max_length = max_length
+        self.tokenized: list[str] = []
+        self.batches: list[list[str]] = []
+
+    def token_lengths(self, texts: list[str]) -> list[int]:
+        self.tokenized.extend(texts)
+        return [min(len(text.split()), self.max_length) for text in texts]
+
+    def _encode_batch(self, texts: list[str]) -> np.ndarray:
+        self.batches.append(texts)
+        return np.array([[len(text), len(text.split())] for text in texts], dtype=np.float32)
+
+
+def padded_size(batch: list[int], lengths: list[int]) -> int:
+    return len(batch) * max(lengths[index] for index in batch)
+
+
+@pytest.mark.parametrize("lengths, budget", [
+    ([5, 300, 12, 12, 80, 1, 0, 512, 40], 512),
+    ([128] * 10, 256),
+    ([1] * 7, 3),
+    ([], 100),
+])
+def test_plan_batches_covers_every_text_within_budget(lengths, budget):
+    batches = plan_batches(lengths, budget)
+
+    assert sorted(index for batch in batches for index in batch) == list(range(len(lengths)))
+    for batch in batches:
+        assert padded_size(batch, lengths) <= budget or len(batch) == 1
+
+
+def test_plan_batches_groups_similar_lengths_longest_first():
+    lengths = [10, 500, 12, 490, 11]
+
+    assert plan_batches(lengths, 1000) == [[1, 3], [2, 4, 0]]
+
+
+def test_plan_batches_gives_oversized_text_its_own_batch():
+    assert plan_batches([2000, 10, 10], 512) == [[0], [1, 2]]
+
+
+def test_cut_text_stops_at_whitespace():
+    assert cut_text("short text", 100) == "short text"
+    assert cut_text("alpha beta gamma", 12) == "alpha beta"
+    assert cut_text("x" * 50, 10) == "x" * 10
+
+
+def test_clip_keeps_cut_text_that_fills_the_window():
+    backend = WordBackend(max_length=8)
+    text = " ".join(f"word{index}" for index in range(100))
+
+    texts, lengths = backend.clip_texts([text])
+
+    assert lengths == [8]
+    assert len(texts[0]) <= 8 * 10 and text.startswith(texts[0])
+    # Tokenized once, cut
+    assert backend.tokenized == texts
+
+
+def test_clip_uses_whole_text_when_cut_loses_tokens():
+    backend = WordBackend(max_length=8)
+    # A base64 blob is one token, so the cut text would hold only that
+    text = "QUJD" * 100 + " the words after the blob the model would read"
+
+    texts, lengths = backend.clip_texts([text, "plain"])
+
+    assert texts == [text, "plain"]
+    assert lengths == [8, 1]
+
+
+def test_encode_returns_rows_in_input_order():
+    backend = WordBackend(max_length=8)
+    texts = ["a b c d e f g h i j", "a", "a b c", "a b"]
+
+    embeddings = backend.encode(texts, token_budget=8)
+
+    assert embeddings[:, 1].tolist() == [10, 1, 3, 2]
+    assert [len(batch) for batch in backend.batches] == [1, 2, 1]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_onnx_backend_without_model_directory(workers):
+    with pytest.raises(ValueError, match="EMBEDDING_ONNX_PATH"):
+        EmbeddingProcessor(backend="onnx", onnx_path=None, workers=workers)
+
+
+def test_backend_model_id():
+    assert backend_model_id("sentence-transformers", "m1") == "m1"
+    with pytest.raises(ValueError, match="Unknown embedding backend"):
+        backend_model_id("tensorflow", "m1")
@@ -0,0 +1,106 @@
+"""Tests for the persistent embedding cache."""
+from datetime import timedelta
+import numpy as np
+from processors import embedding_cache
+from processors.embedding_cache import EmbeddingCache, text_key
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+def vector(value: float, dimensions: int = 4) -> np.ndarray:
+    return np.full(dimensions, value, dtype=np.float32)
+
+
+def test_put_many_and_get_many(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite")
+
+    assert cache.put_many("m1", {"a": vector(1), "b": np.array([[2, 2, 2, 2]], dtype=np.float64)}) == 2
+    assert cache.put_many("m1", {}) == 0
+    found = cache.get_many("m1", ["a", "b", "c", "a"])
+
+    assert sorted(found) == ["a", "b"]
+    assert found["b"].dtype == np.float32
+    np.testing.assert_array_equal(found["b"], vector(2))
+    # Keyed by model too
+    assert cache.get_many("m2", ["a"]) == {}
+    # Replacing an entry
+    cache.put_many("m1", {"a": vector(5, dimensions=2)})
+    np.testing.assert_array_equal(cache.get_many("m1", ["a"])["a"], vector(5, dimensions=2))
+    assert len(cache) == 2
+
+
+def test_get_many_over_parameter_limit(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite")
+    keys = [text_key(str(index)) for index in range(1200)]
+    cache.put_many("m1", {key: vector(index) for index, key in enumerate(keys)})
+
+    found = cache.get_many("m1", keys)
+
+    assert len(found) == 1200
+    assert found[keys[1100]][0] == 1100
+
+
+def test_hit_rate(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite")
+    assert cache.hit_rate == 0.0
+
+    cache.put_many("m1", {"a": vector(1)})
+    cache.get_many("m1", ["a", "b", "c"])
+    cache.get_many("m1", ["a"])
+
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert cache.hit_rate == 0.5
+    assert cache.stats() == {"entries": 1, "hits": 2, "misses": 2, "hit_rate": 0.5}
+
+
+def test_evict_by_age(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(embedding_cache, "time", clock)
+    cache = EmbeddingCache(tmp_path / "cache.sqlite")
+    cache.put_many("m1", {"old": vector(1), "used": vector(2)})
+    cache.put_many("m2", {"old": vector(3)})
+    clock.now += 3600
+    cache.get_many("m1", ["used"])
+    cache.put_many("m1", {"new": vector(4)})
+
+    assert cache.evict(max_age=timedelta(minutes=30), model="m1") == 1
+    assert sorted(cache.get_many("m1", ["old", "used", "new"])) == ["new", "used"]
+    assert cache.evict(max_age=timedelta(minutes=30)) == 1
+    assert cache.get_many("m2", ["old"]) == {}
+
+
+def test_evict_least_recently_used_beyond_max_entries(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(embedding_cache, "time", clock)
+    cache = EmbeddingCache(tmp_path / "cache.sqlite")
+    for key in ["a", "b", "c", "d"]:
+        cache.put_many("m1", {key: vector(1)})
+        clock.now += 1
+    cache.put_many("m2", {"x": vector(1)})
+    clock.now += 1
+    # Using "a" makes "b" the least recently used
+    cache.get_many("m1", ["a"])
+
+    assert cache.evict(max_entries=3, model="m1") == 1
+    assert sorted(cache.get_many("m1", ["a", "b", "c", "d"])) == ["a", "c", "d"]
+    assert cache.evict(max_entries=2) == 2
+    assert len(cache) == 2
+    assert cache.evict(max_entries=0) == 2
+    assert len(cache) == 0
+
+
+def test_evict_model(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite")
+    cache.put_many("m1", {"a": vector(1), "b": vector(2)})
+    cache.put_many("m2", {"a": vector(3)})
+
+    assert cache.evict(model="m1") == 2
+    assert cache.get_many("m1", ["a", "b"]) == {}
+    assert list(cache.get_many("m2", ["a"])) == ["a"]
+    assert cache.evict() == 0
@@ -0,0 +1,105 @@
+"""Tests for binary embedding storage."""
+import numpy as np
+import pytest
+from models.processed_content import ProcessedBatch, ProcessedContent
+from python_shared.catalog import ArtifactCatalog
+from src.embedding_store import EmbeddingStore, EmbeddingWriter
+
+
+def make_batch(ids: list[str], matrix: np.ndarray) -> ProcessedBatch:
+    items = [
+        ProcessedContent(id=f"emb_{item_id}", original_id=item_id, title=item_id, content=f"Content of {item_id}")
+        for item_id in ids
+    ]
+    return ProcessedBatch(items=items, total=len(items), model_used="m1", embeddings=matrix)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_writer_output_loads_with_numpy(tmp_path, dtype):
+    store = EmbeddingStore(tmp_path, dtype=dtype)
+    first = np.arange(6, dtype=np.float32).reshape(2, 3)
+    second = np.arange(6, 9, dtype=np.float32).reshape(1, 3)
+
+    with store.writer() as writer:
+        writer.append(make_batch(["a", "b"], first))
+        writer.append(make_batch([], np.zeros((0, 3), dtype=np.float32)))
+        writer.append(make_batch(["c"], second))
+
+    # The hand-written header is a valid .npy header for the final shape
+    matrix = np.load(writer.matrix_path)
+    assert matrix.dtype == np.dtype(dtype)
+    np.testing.assert_array_equal(matrix, np.vstack([first, second]).astype(dtype))
+    with open(writer.matrix_path, 'rb') as f:
+        assert np.lib.format.read_magic(f) == (1, 0)
+        assert f.tell() + 2 + int.from_bytes(f.read(2), 'little') == EmbeddingWriter.HEADER_BYTES
+
+    batch = store.load()
+    assert [item.original_id for item in batch.items] == ["a", "b", "c"]
+    assert batch.total == 3
+    assert all(item.content == "" for item in batch.items)
+    np.testing.assert_array_equal(batch.embeddings, matrix)
+
+
+def test_writer_without_rows(tmp_path):
+    store = EmbeddingStore(tmp_path)
+
+    with store.writer() as writer:
+        writer.append(make_batch([], np.zeros((0, 3), dtype=np.float32)))
+
+    assert np.load(writer.matrix_path).shape == (0, 0)
+    assert store.load(writer.meta_path).items == []
+
+
+def test_header_rejects_shapes_that_do_not_fit(tmp_path):
+    writer = EmbeddingStore(tmp_path).writer()
+
+    assert len(writer._npy_header((10**12, 4096))) == EmbeddingWriter.HEADER_BYTES
+    with pytest.raises(ValueError):
+        writer._npy_header((10**80, 10**80))
+
+
+def test_aborted_writer_leaves_nothing(tmp_path):
+    store = EmbeddingStore(tmp_path)
+
+    with pytest.raises(RuntimeError):
+        with store.writer() as writer:
+            writer.append(make_batch(["a"], np.ones((1, 3), dtype=np.float32)))
+            raise RuntimeError("embedding failed")
+
+    assert list((tmp_path / "processed").iterdir()) == []
+    assert store.load() is None
+
+
+def test_writer_rejects_mismatched_chunks(tmp_path):
+    with pytest.raises(ValueError):
+        with EmbeddingStore(tmp_path).writer() as writer:
+            writer.append(make_batch(["a"], np.ones((1, 3), dtype=np.float32)))
+            writer.append(make_batch(["b"], np.ones((1, 4), dtype=np.float32)))
+
+    with pytest.raises(ValueError):
+        with EmbeddingStore(tmp_path).writer() as writer:
+            writer.append(make_batch(["a", "b"], np.ones((1, 3), dtype=np.float32)))
+
+
+def test_written_items_are_cataloged(tmp_path):
+    catalog = ArtifactCatalog(tmp_path / "catalog.sqlite")
+    store = EmbeddingStore(tmp_path, catalog=catalog)
+
+    path = store.write(make_batch(["a", "b"], np.ones((2, 3), dtype=np.float32)))
+
+    entries = catalog.find(kind="processed")
+    assert [(entry.id, entry.original_id) for entry in entries] == [("emb_a", "a"), ("emb_b", "b")]
+    assert {entry.path for entry in entries} == {f"processed/{path.name}"}
+
+
+def test_delete_removes_files_and_catalog_entries(tmp_path):
+    catalog = ArtifactCatalog(tmp_path / "catalog.sqlite")
+    store = EmbeddingStore(tmp_path, catalog=catalog)
+    kept = store.write(make_batch(["a"], np.ones((1, 3), dtype=np.float32)))
+    path = store.write(make_batch(["b"], np.ones((1, 3), dtype=np.float32)))
+
+    store.delete(path)
+
+    assert sorted(file.name for file in (tmp_path / "processed").iterdir()) == [kept.name, kept.with_suffix(".npy").name]
+    assert [entry.original_id for entry in catalog.find(kind="processed")] == ["a"]
+    assert store.latest() == kept
@@ -0,0 +1,370 @@
+"""SQLite catalog of the artifacts stored under a data directory."""
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple, Optional
+import logging
+import sqlite3
+import threading
+from .utils import canonicalize_url
+
+
+logger = logging.getLogger("python_shared.catalog")
+
+CATALOG_KINDS = ("raw", "processed", "synthesized")
+
+_COLUMNS = (
+    "kind", "id", "artifact_type", "source_url", "path_id", "api_id",
+    "original_id", "path", "created_at", "written_at"
+)
+
+
+class CatalogEntry(NamedTuple):
+    """One cataloged record and where it is stored."""
+    kind: str  # raw, processed or synthesized
+    id: str
+    artifact_type: str  # Source type for raw items, process/artifact type otherwise
+    source_url: Optional[str]  # Canonical form
+    path_id: Optional[str]
+    api_id: Optional[str]
+    original_id: Optional[str]
+    path: str  # File (or raw/segments/<source_type>) relative to the data directory
+    created_at: Optional[str]  # When the record was extracted/processed/generated
+    written_at: str  # When it was written to the data directory (UTC)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class ArtifactCatalog:
+    """
+    Index of raw, processed and synthesized records by id, source URL,
+    source type, pathId, api_id, original_id and write time.
+
+    DataWriter adds an entry for every record it writes, so questions like
+    "which raw items belong to path X" or "what arrived since the last
+    synthesis run" are answered with indexed queries instead of parsing
+    every file. Entries point at the file holding the record; the catalog
+    stores no content.
+
+    Rewriting a record (same kind and id) updates its entry. Safe to share
+    between threads; SQLite locking makes it safe across processes.
+    """
+
+    def __init__(self, db_path: str | Path, read_only: bool = False):
+        """
+        Initialize artifact catalog.
+
+        Args:
+            db_path: Path to the SQLite database (created if missing)
+            read_only: Open for queries only; a missing database reads as empty
+        """
+        self.db_path = Path(db_path)
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._warned_missing = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is not None:
+            return self._conn
+
+        if self.read_only:
+            if not self.db_path.exists():
+                if not self._warned_missing:
+                    logger.warning(f"No artifact catalog at {self.db_path}; queries return nothing")
+                    self._warned_missing = True
+                return None
+            self._conn = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro", uri=True, timeout=30, check_same_thread=False
+            )
+            return self._conn
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS artifacts (
+                kind TEXT NOT NULL,
+                id TEXT NOT NULL,
+                artifact_type TEXT NOT NULL,
+                source_url TEXT,
+                path_id TEXT,
+                api_id TEXT,
+                original_id TEXT,
+                path TEXT NOT NULL,
+                created_at TEXT,
+                written_at TEXT NOT NULL,
+                PRIMARY KEY (kind, id)
+            );
+            CREATE INDEX IF NOT EXISTS artifacts_type ON artifacts (kind, artifact_type, written_at);
+            CREATE INDEX IF NOT EXISTS artifacts_written ON artifacts (kind, written_at);
+            CREATE INDEX IF NOT EXISTS artifacts_source_url ON artifacts (source_url);
+            CREATE INDEX IF NOT EXISTS artifacts_path_id ON artifacts (path_id, kind);
+            CREATE INDEX IF NOT EXISTS artifacts_api_id ON artifacts (api_id);
+            CREATE INDEX IF NOT EXISTS artifacts_original_id ON artifacts (original_id);
+            CREATE INDEX IF NOT EXISTS artifacts_path ON artifacts (path);
+            """
+        )
+        conn.commit()
+        self._conn = conn
+        return conn
+
+    @staticmethod
+    def entry_for(
+        kind: str,
+        artifact_type: str,
+        record: dict[str, Any],
+        path: str,
+        written_at: Optional[str] = None,
+        default_id: Optional[str] = None
+    ) -> Optional[CatalogEntry]:
+        """
+        Build the entry for a record (a RawContent, ProcessedContent or
+        KnowledgeUnit dict, or any other dict given a default_id).
+
+        Returns:
+            CatalogEntry, or None if the record has no id
+        """
+        record_id = record.get('id') or default_id
+        if not record_id:
+            return None
+        metadata = record.get('metadata') or {}
+        source_url = record.get('source_url')
+        created_at = (
+            record.get('extracted_date') or record.get('processed_at')
+            or record.get('created_at') or record.get('generated_at')
+        )
+        return CatalogEntry(
+            kind=kind,
+            id=str(record_id),
+            artifact_type=artifact_type,
+            source_url=canonicalize_url(source_url) if source_url else None,
+            path_id=metadata.get('pathId'),
+            api_id=metadata.get('api_id'),
+            original_id=record.get('original_id') or metadata.get('original_id'),
+            path=path,
+            created_at=str(created_at) if created_at else None,
+            written_at=written_at or datetime.utcnow().isoformat()
+        )
+
+    def add(self, entries: Iterable[CatalogEntry]) -> int:
+        """
+        Insert or update entries in one transaction.
+
+        Returns:
+            Number of entries written
+        """
+        rows = [tuple(entry) for entry in entries if entry is not None]
+        if not rows:
+            return 0
+        if self.read_only:
+            raise PermissionError("Artifact catalog is read-only")
+
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                f"""
+                INSERT INTO artifacts ({', '.join(_COLUMNS)})
+                VALUES ({', '.join('?' for _ in _COLUMNS)})
+                ON CONFLICT(kind, id) DO UPDATE SET
+                    {', '.join(f'{column} = excluded.{column}' for column in _COLUMNS[2:])}
+                """,
+                rows
+            )
+            conn.commit()
+        return len(rows)
+
+    def find(
+        self,
+        kind: Optional[str] = None,
+        artifact_type: Optional[str | Iterable[str]] = None,
+        id: Optional[str] = None,
+        source_url: Optional[str] = None,
+        path_id: Optional[str] = None,
+        api_id: Optional[str] = None,
+        original_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> list[CatalogEntry]:
+        """
+        Query entries; all given filters must match.
+
+        Args:
+            kind: 'raw', 'processed' or 'synthesized'
+            artifact_type: Source type(s) for raw items, process/artifact type otherwise
+            id: Record id
+            source_url: Source URL (compared in canonical form)
+            path_id: Learning path id from the record metadata
+            api_id: Id the record has in the Kasita API
+            original_id: Raw item id a processed record was made from
+            since: Written at or after this time (UTC)
+            until: Written before this time (UTC)
+            limit: Maximum number of entries
+
+        Returns:
+            Matching entries, oldest write first
+        """
+        clauses = []
+        params: list[Any] = []
+        for column, value in (
+            ("kind", kind), ("id", id), ("path_id", path_id),
+            ("api_id", api_id), ("original_id", original_id),
+            ("source_url", canonicalize_url(source_url) if source_url else None),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if artifact_type is not None:
+            types = [artifact_type] if isinstance(artifact_type, str) else list(artifact_type)
+            clauses.append(f"artifact_type IN ({', '.join('?' for _ in types)})")
+            params.extend(types)
+        if since is not None:
+            clauses.append("written_at >= ?")
+            params.append(_naive_utc(since).isoformat())
+        if until is not None:
+            clauses.append("written_at < ?")
+            params.append(_naive_utc(until).isoformat())
+
+        query = f"SELECT {', '.join(_COLUMNS)} FROM artifacts"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY written_at, id"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return []
+            rows = conn.execute(query, params).fetchall()
+        return [CatalogEntry(*row) for row in rows]
+
+    def paths(
+        self,
+        kind: str,
+        artifact_type: Optional[str | Iterable[str]] = None,
+        path_id: Optional[str] = None
+    ) -> set[str]:
+        """
+        Files holding at least one matching record.
+
+        Args:
+            kind: 'raw', 'processed' or 'synthesized'
+            artifact_type: Source type(s) for raw items, process/artifact type otherwise
+            path_id: Learning path id from the record metadata
+
+        Returns:
+            Paths relative to the data directory
+        """
+        clauses = ["kind = ?"]
+        params: list[Any] = [kind]
+        if artifact_type is not None:
+            types = [artifact_type] if isinstance(artifact_type, str) else list(artifact_type)
+            clauses.append(f"artifact_type IN ({', '.join('?' for _ in types)})")
+            params.extend(types)
+        if path_id is not None:
+            clauses.append("path_id = ?")
+            params.append(path_id)
+
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return set()
+            rows = conn.execute(
+                f"SELECT DISTINCT path FROM artifacts WHERE {' AND '.join(clauses)}", params
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def get(self, kind: str, id: str) -> Optional[CatalogEntry]:
+        """Entry for a record, if cataloged."""
+        entries = self.find(kind=kind, id=id, limit=1)
+        return entries[0] if entries else None
+
+    def last_written(self, kind: str, artifact_type: Optional[str] = None) -> Optional[datetime]:
+        """Time of the most recent write of a kind (and type), if any."""
+        query = "SELECT MAX(written_at) FROM artifacts WHERE kind = ?"
+        params = [kind]
+        if artifact_type is not None:
+            query += " AND artifact_type = ?"
+            params.append(artifact_type)
+
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            value = conn.execute(query, params).fetchone()[0]
+        return datetime.fromisoformat(value) if value else None
+
+    def remove_paths(self, paths: Iterable[str]) -> int:
+        """
+        Remove the entries of records stored in the given files (e.g. after
+        retention deleted them).
+
+        Args:
+            paths: File paths relative to the data directory
+
+        Returns:
+            Number of entries removed
+        """
+        paths = list(paths)
+        if not paths:
+            return 0
+        if self.read_only:
+            raise PermissionError("Artifact catalog is read-only")
+        with self._lock:
+            conn = self._connect()
+            removed = conn.executemany("DELETE FROM artifacts WHERE path = ?", [(path,) for path in paths]).rowcount
+            conn.commit()
+        return removed
+
+    def update_paths(self, moves: dict[str, str]) -> int:
+        """
+        Point the entries of moved files at their new location.
+
+        Args:
+            moves: {old path: new path}, relative to the data directory
+
+        Returns:
+            Number of entries updated
+        """
+        if not moves:
+            return 0
+        if self.read_only:
+            raise PermissionError("Artifact catalog is read-only")
+        with self._lock:
+            conn = self._connect()
+            updated = conn.executemany(
+                "UPDATE artifacts SET path = ? WHERE path = ?",
+                [(new, old) for old, new in moves.items()]
+            ).rowcount
+            conn.commit()
+        return updated
+
+    def clear(self) -> None:
+        """Remove every entry (before a rebuild)."""
+        if self.read_only:
+            raise PermissionError("Artifact catalog is read-only")
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM artifacts")
+            conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return 0
+            return conn.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
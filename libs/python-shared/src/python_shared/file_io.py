@@ -1,15 +1,237 @@
 """File I/O utilities for reading/writing data."""
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Union
-import json
-from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+import glob
+import itertools
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+from datetime import date, datetime, timezone
+from .catalog import CATALOG_KINDS, ArtifactCatalog, CatalogEntry
+from .file_lock import FileLock
+from .segment_store import SegmentStore
+from .serialization import get_format, is_data_file, load_file, split_extension
+from .utils import generate_id, id_timestamp
+
+
+logger = logging.getLogger("python_shared.file_io")
+
+# Raw content layouts: one JSON file per item/batch (flat, or partitioned
+# by source type and date), or append-only segments
+RAW_LAYOUTS = ("files", "partitioned", "segments")
+
+# Directory name prefixes of the partitioned layout:
+# raw/source_type=<source_type>/date=<YYYY-MM-DD>/
+SOURCE_PARTITION = "source_type="
+DATE_PARTITION = "date="
+
+# Lock file guarding the *_latest pointers of a directory
+LATEST_LOCK_NAME = ".latest.lock"
+
+# Artifact catalog database, relative to the data directory
+CATALOG_PATH = Path("state") / "catalog.sqlite"
+
+_tmp_counter = itertools.count()
+
+
+@dataclass
+class _PendingBatch:
+    """Writes staged by DataWriter.batch(), committed together on exit."""
+    files: list[tuple[Path, Path]] = field(default_factory=list)  # (temp file, final path)
+    sync_paths: set[Path] = field(default_factory=set)  # Appended files to fsync
+    after_commit: list[Callable[[], None]] = field(default_factory=list)
+
+
+def run_stem(artifact_type: str) -> str:
+    """
+    File stem for a new timestamped output: <type>_<generate_id()>.
+    
+    The id is fixed-width and strictly increasing within a process, so
+    stems never collide and sort in write order.
+    """
+    return f"{artifact_type}_{generate_id()}"
+
+
+def parse_run_stem(stem: str) -> Optional[tuple[str, datetime]]:
+    """
+    (artifact type, UTC write time) of a run_stem(), or of an older
+    <type>_<ISO timestamp> stem.
+    
+    Returns:
+        The pair, or None if stem has no timestamp (e.g. a latest pointer)
+    """
+    parts = stem.split('_')
+    # generate_id() spans the last four underscore-separated parts
+    if len(parts) > 4:
+        written_at = id_timestamp('_'.join(parts[-4:]))
+        if written_at is not None:
+            return '_'.join(parts[:-4]), written_at
+    
+    artifact_type, _, timestamp = stem.rpartition('_')
+    if not artifact_type:
+        return None
+    try:
+        return artifact_type, datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+
+
+def _tmp_path(path: Path) -> Path:
+    """Hidden temp file next to path, unique to this process and write."""
+    return path.with_name(f".{path.name}.{os.getpid()}.{next(_tmp_counter)}.tmp")
+
+
+def _records(data: dict[str, Any], path: Path) -> list[tuple[dict[str, Any], Path, Optional[str]]]:
+    """
+    (record, path, default id) for the records in a data file.
+    
+    Batches are cataloged item by item; any other file is one record,
+    identified by its file name if it has no id of its own.
+    """
+    for key in ('items', 'units'):
+        if isinstance(data.get(key), list):
+            return [(record, path, None) for record in data[key]]
+    return [(data, path, split_extension(path.name)[0])]
+
+
+def raw_partition(raw_dir: Path, source_type: str, day: date) -> Path:
+    """Directory of a source type's raw files written on a (UTC) day."""
+    return raw_dir / f"{SOURCE_PARTITION}{source_type}" / f"{DATE_PARTITION}{day.isoformat()}"
+
+
+def group_by_source_type(records: Iterable[dict[str, Any]], default: str) -> dict[str, list[dict[str, Any]]]:
+    """Records grouped by their own source_type (default for records without one)."""
+    groups: dict[str, list[dict[str, Any]]] = {}
+    for record in records:
+        groups.setdefault(record.get('source_type') or default, []).append(record)
+    return groups
+
+
+def iter_raw_partitions(
+    raw_dir: Path,
+    source_types: Optional[Iterable[str]] = None,
+    since: Optional[date] = None
+) -> Iterator[Path]:
+    """
+    Partition directories under raw/, in (source type, date) order.
+    
+    Partitions of other source types, or dated before since, are pruned by
+    name without being listed. That is safe because a partition only ever
+    holds items of its own source type (see DataWriter._raw_dir).
+    """
+    source_types = set(source_types) if source_types else None
+    if not raw_dir.exists():
+        return
+    with os.scandir(raw_dir) as entries:
+        source_dirs = sorted(
+            entry.path for entry in entries
+            if entry.name.startswith(SOURCE_PARTITION) and entry.is_dir()
+            and (source_types is None or entry.name[len(SOURCE_PARTITION):] in source_types)
+        )
+    
+    for source_dir in source_dirs:
+        with os.scandir(source_dir) as entries:
+            day_dirs = []
+            for entry in entries:
+                if not entry.name.startswith(DATE_PARTITION) or not entry.is_dir():
+                    continue
+                try:
+                    day = date.fromisoformat(entry.name[len(DATE_PARTITION):])
+                except ValueError:
+                    continue
+                if since is None or day >= since:
+                    day_dirs.append((day, entry.path))
+        for _, path in sorted(day_dirs):
+            yield Path(path)
+
+
+def _data_file_entries(directory: str | Path) -> list[os.DirEntry]:
+    """Data files in a directory (no latest pointers), in name order."""
+    with os.scandir(directory) as entries:
+        return sorted(
+            (
+                entry for entry in entries
+                if is_data_file(entry.name) and entry.is_file()
+                and not split_extension(entry.name)[0].endswith("_latest")
+            ),
+            key=lambda entry: entry.name
+        )
+
+
+def _fsync_path(path: Path, directory: bool = False) -> None:
+    """fsync a file or directory by path."""
+    flags = os.O_RDONLY | (getattr(os, "O_DIRECTORY", 0) if directory else 0)
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        return  # e.g. directories can't be opened on Windows
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
 
 class DataWriter:
-    """Handles writing data to the appropriate directories."""
+    """
+    Handles writing data to the appropriate directories.
     
-    def __init__(self, base_path: str | Path = "data"):
+    Every file is written to a temp file and renamed into place, so readers
+    never see a partial file. *_latest pointers are updated under a file
+    lock and only ever move forward, so concurrent processes can share a
+    data directory. Inside batch(), commits (and fsyncs) are grouped.
+    
+    Every record written is added to the artifact catalog
+    (state/catalog.sqlite) once its file is committed.
+    """
+    
+    def __init__(
+        self,
+        base_path: str | Path = "data",
+        raw_layout: str = "files",
+        compress_segments: bool = False,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        codec: str = "json",
+        compression: Optional[str] = None,
+        fsync: bool = False,
+        catalog: bool = True
+    ):
+        """
+        Initialize data writer.
+        
+        Args:
+            base_path: Base data directory
+            raw_layout: 'files' (one JSON file per item or batch),
+                'partitioned' (the same files under
+                raw/source_type=<type>/date=<YYYY-MM-DD>/) or 'segments'
+                (append-only JSONL segments in raw/segments)
+            compress_segments: Gzip records in new segments
+            segment_max_bytes: Size at which a segment is rotated
+            codec: File codec: 'json' (default), 'orjson' or 'msgpack'
+            compression: Optional file compression: 'gzip' or 'zstd'
+            fsync: fsync files and directories on commit (durable across
+                power loss, at a cost per commit; batch() amortizes it)
+            catalog: Index written records in the artifact catalog
+        """
+        if raw_layout not in RAW_LAYOUTS:
+            raise ValueError(f"Unknown raw layout: {raw_layout}")
         self.base_path = Path(base_path)
+        self.raw_layout = raw_layout
+        self.format = get_format(codec, compression)
+        self.fsync = fsync
+        self._local = threading.local()
+        self.segments = (
+            SegmentStore(
+                self.base_path / "raw" / "segments",
+                max_segment_bytes=segment_max_bytes,
+                compress=compress_segments
+            )
+            if raw_layout == "segments" else None
+        )
+        self.catalog = ArtifactCatalog(self.base_path / CATALOG_PATH) if catalog else None
         
     def write_raw(self, data: dict[str, Any], source_type: str, per_item: bool = False) -> Union[Path, list[Path]]:
         """
@@ -21,101 +243,690 @@ class DataWriter:
             per_item: If True and data has 'items', write each item to its own file
             
         Returns:
-            Path to written file(s)
+            Path to written file(s); with the segments layout, the segment
+            the items were appended to
         """
+        if self.segments is not None:
+            return self._append_segments(data, source_type, per_item)
+        
         if per_item and 'items' in data:
-            # Write each item to its own file
+            # Write each item to its own file, under the item's own source type
             paths = []
             for item in data['items']:
-                item_id = item.get('id', datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f"))
-                filename = f"{source_type}_{item_id}.json"
-                output_path = self.base_path / "raw" / filename
-                
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(item, f, indent=2, ensure_ascii=False)
-                
-                paths.append(output_path)
+                item_type = item.get('source_type') or source_type
+                item_id = item.get('id') or generate_id()
+                stem = f"{item_type}_{item_id}"
+                paths.append(self._write(self._item_dir(item_type, item_id, stem), stem, item))
             
+            self._catalog("raw", source_type, (
+                (item, path, split_extension(path.name)[0]) for item, path in zip(data['items'], paths, strict=True)
+            ))
             return paths
         else:
             # Write batch to single file (original behavior)
-            timestamp = datetime.utcnow().isoformat()
-            filename = f"{source_type}_{timestamp}.json"
-            output_path = self.base_path / "raw" / filename
+            items = data['items'] if 'items' in data else [data]
+            item_types = list(group_by_source_type(items, source_type)) or [source_type]
+            directory = self._raw_dir(item_types[0] if len(item_types) == 1 else None)
+            output_path = self._write(directory, run_stem(source_type), data)
+            self._catalog("raw", source_type, _records(data, output_path))
             
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            # Also point "latest" at it for easy access (always in raw/)
+            self._point_latest(output_path, f"{source_type}_latest", self.base_path / "raw")
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-                
-            # Also write to "latest" for easy access
-            latest_path = self.base_path / "raw" / f"{source_type}_latest.json"
-            with open(latest_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-                
             return output_path
     
-    def write_processed(self, data: dict[str, Any], process_type: str) -> Path:
-        """Write processed content to data/processed/."""
-        timestamp = datetime.utcnow().isoformat()
-        filename = f"{process_type}_{timestamp}.json"
-        output_path = self.base_path / "processed" / filename
+    def _raw_dir(self, source_type: Optional[str]) -> Path:
+        """
+        Directory a new raw file is written to.
         
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        Args:
+            source_type: The source_type of every item in the file, or
+                None if they differ. Partitions are pruned by type when
+                reading, so a file mixing types stays in raw/ itself,
+                which readers always scan.
+        """
+        raw_dir = self.base_path / "raw"
+        if self.raw_layout == "partitioned" and source_type:
+            return raw_partition(raw_dir, source_type, datetime.utcnow().date())
+        return raw_dir
+    
+    def _item_dir(self, source_type: str, item_id: str, stem: str) -> Path:
+        """
+        Directory a per-item raw file is written to.
+        
+        In the partitioned layout an item written again on a later day (an
+        update, or the same content-addressed item ingested again) stays in
+        the partition it was first written to, so the new version replaces
+        the old file instead of sitting next to it in a newer partition.
+        """
+        directory = self._raw_dir(source_type)
+        if self.raw_layout != "partitioned":
+            return directory
+        
+        if self.catalog is not None:
+            try:
+                entry = self.catalog.get("raw", item_id)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to look up raw item {item_id} in the catalog: {e}")
+                entry = None
+            candidates = [self.base_path / entry.path] if entry is not None else []
+        else:
+            candidates = directory.parent.glob(f"{DATE_PARTITION}*/{glob.escape(stem)}.*")
+        
+        for existing in candidates:
+            if (
+                split_extension(existing.name)[0] == stem
+                and existing.parent.parent == directory.parent
+                and existing.exists()
+            ):
+                return existing.parent
+        return directory
+    
+    def partition_raw(self, dry_run: bool = False) -> int:
+        """
+        Move flat raw/ files into the partitioned layout.
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        Each file goes to raw/source_type=<type>/date=<day it was last
+        modified, UTC>/ under its own name; the source type is read from
+        the items in the file. Files whose items have different source
+        types stay in raw/. Files already in a partition of the wrong type
+        (written before partitions followed the items' own types) move to
+        the right one, keeping their date. Latest symlinks and catalog
+        entries are repointed. Run it while nothing else is writing raw
+        files.
+        
+        Args:
+            dry_run: Only count the files that would move
             
+        Returns:
+            Number of files moved (or that would be moved)
+        """
+        raw_dir = self.base_path / "raw"
+        if not raw_dir.exists():
+            return 0
+        
+        # (file, day of its partition; None for flat files)
+        candidates = [(entry, None) for entry in _data_file_entries(raw_dir)]
+        for partition in iter_raw_partitions(raw_dir):
+            day = date.fromisoformat(partition.name[len(DATE_PARTITION):])
+            candidates.extend((entry, day) for entry in _data_file_entries(partition))
+        
+        moved: dict[Path, Path] = {}
+        for entry, day in candidates:
+            try:
+                data = load_file(entry.path)
+            except Exception as e:
+                logger.warning(f"Skipping unreadable file {entry.path}: {e}")
+                continue
+            items = data.get('items') or [data]
+            item_types = list(group_by_source_type(items, data.get('source_type') or ''))
+            if item_types == ['']:
+                logger.warning(f"Skipping {entry.path}: no source_type")
+                continue
+            
+            if len(item_types) > 1 or '' in item_types:
+                target_dir = raw_dir
+            else:
+                if day is None:
+                    day = datetime.fromtimestamp(entry.stat().st_mtime, timezone.utc).date()
+                target_dir = raw_partition(raw_dir, item_types[0], day)
+            path = Path(entry.path)
+            if path.parent != target_dir:
+                moved[path] = target_dir / entry.name
+        
+        if dry_run or not moved:
+            return len(moved)
+        
+        for old_path, new_path in moved.items():
+            new_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(old_path, new_path)
+        
+        # Repoint latest symlinks at the moved files
+        moved_by_name = {old_path.name: new_path for old_path, new_path in moved.items()}
+        for latest_path in raw_dir.iterdir():
+            if not latest_path.is_symlink():
+                continue
+            target = moved_by_name.get(Path(os.readlink(latest_path)).name)
+            if target is not None:
+                stem = split_extension(latest_path.name)[0]
+                self._update_latest(target, latest_path, stem)
+        
+        if self.catalog is not None:
+            self.catalog.update_paths({
+                self._relative(old_path): self._relative(new_path)
+                for old_path, new_path in moved.items()
+            })
+        
+        logger.info(f"Moved {len(moved)} raw files to their partitions")
+        return len(moved)
+    
+    def _append_segments(self, data: dict[str, Any], source_type: str, per_item: bool) -> Path:
+        """
+        Append raw items to the segment store, one record per item.
+        
+        Items go to the segments of their own source type, so readers can
+        skip other types' segments. Returns the last segment appended to.
+        """
+        items = data['items'] if 'items' in data else [data]
+        segment = None
+        for item_type, group in group_by_source_type(items, source_type).items():
+            segment = self.segments.append(group, item_type)
+            # Segment records are cataloged by directory; rotation doesn't move them
+            self._catalog("raw", item_type, ((item, segment.parent, None) for item in group))
+            if self.fsync:
+                for path in (segment, self.segments.index_path(segment)):
+                    pending = self._pending()
+                    if pending is not None:
+                        pending.sync_paths.add(path)
+                    else:
+                        _fsync_path(path)
+        
+        if not per_item:
+            # Batch writes keep their "latest" file for read_latest_raw()
+            latest_path = self._write(self.base_path / "raw", f"{source_type}_latest", data)
+            self._remove_stale_pointers(latest_path, f"{source_type}_latest")
+        
+        return segment
+    
+    def write_processed(self, data: dict[str, Any], process_type: str) -> Path:
+        """Write processed content to data/processed/."""
+        output_path = self._write(self.base_path / "processed", run_stem(process_type), data)
+        self._catalog("processed", process_type, _records(data, output_path))
         return output_path
     
     def write_synthesized(self, data: dict[str, Any], artifact_type: str) -> Path:
         """Write synthesized content to data/synthesized/."""
-        timestamp = datetime.utcnow().isoformat()
-        filename = f"{artifact_type}_{timestamp}.json"
-        output_path = self.base_path / "synthesized" / filename
+        output_path = self._write(self.base_path / "synthesized", run_stem(artifact_type), data)
+        self._catalog("synthesized", artifact_type, _records(data, output_path))
+        
+        # Also point "latest" at it for easy access
+        self._point_latest(output_path, f"{artifact_type}_latest")
+        
+        return output_path
+    
+    def rebuild_catalog(self) -> int:
+        """
+        Rebuild the artifact catalog from the files on disk.
+        
+        Use it for data written before the catalog existed or with
+        cataloging disabled. Write times are taken from file modification
+        times (segment records use their extraction time).
+        
+        Returns:
+            Number of records cataloged
+        """
+        if self.catalog is None:
+            raise ValueError("Cataloging is disabled for this writer")
+        
+        self.catalog.clear()
+        total = 0
+        for kind in CATALOG_KINDS:
+            directory = self.base_path / kind
+            if not directory.exists():
+                continue
+            directories = [directory]
+            if kind == "raw":
+                directories.extend(iter_raw_partitions(directory))
+            file_paths = [
+                Path(entry.path) for subdirectory in directories
+                for entry in _data_file_entries(subdirectory)
+            ]
+            for file_path in file_paths:
+                stem = split_extension(file_path.name)[0]
+                try:
+                    data = load_file(file_path)
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable file {file_path}: {e}")
+                    continue
+                written_at = datetime.utcfromtimestamp(file_path.stat().st_mtime).isoformat()
+                parsed = parse_run_stem(stem)
+                artifact_type = data.get('source_type') or (parsed[0] if parsed else stem.rsplit('_', 1)[0])
+                total += self.catalog.add(
+                    ArtifactCatalog.entry_for(
+                        kind,
+                        record.get('source_type') or artifact_type,
+                        record,
+                        self._relative(path),
+                        written_at,
+                        default_id
+                    )
+                    for record, path, default_id in _records(data, file_path)
+                )
         
+        segments = SegmentStore(self.base_path / "raw" / "segments", read_only=True)
+        total += self.catalog.add(
+            ArtifactCatalog.entry_for(
+                "raw",
+                record.get('source_type', ''),
+                record,
+                self._relative(segments.root / record.get('source_type', '')),
+                record.get('extracted_date')
+            )
+            for record in segments.iter_records()
+        )
+        
+        logger.info(f"Rebuilt artifact catalog with {total} records")
+        return total
+    
+    def _relative(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.base_path).as_posix()
+        except ValueError:
+            return path.as_posix()
+    
+    def _catalog(
+        self,
+        kind: str,
+        artifact_type: str,
+        records: Iterable[tuple[dict[str, Any], Path, Optional[str]]]
+    ) -> None:
+        """
+        Add written records to the catalog once their files are committed.
+        
+        Raw items are cataloged under their own source_type, which may
+        differ from the type the batch was written under.
+        """
+        if self.catalog is None:
+            return
+        
+        written_at = datetime.utcnow().isoformat()
+        entries = [
+            ArtifactCatalog.entry_for(
+                kind,
+                (record.get('source_type') if kind == "raw" else None) or artifact_type,
+                record,
+                self._relative(path),
+                written_at,
+                default_id
+            )
+            for record, path, default_id in records
+        ]
+        
+        def add() -> None:
+            # The catalog is derived data; a failure must not fail the write
+            try:
+                self.catalog.add(entries)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to catalog {len(entries)} {kind} records: {e}")
+        
+        pending = self._pending()
+        if pending is not None:
+            pending.after_commit.append(add)
+        else:
+            add()
+    
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Group the writes made by this thread into one commit.
+        
+        Files are staged as temp files; on exit they are fsynced (if
+        enabled), renamed into place, each directory is fsynced once and
+        then latest pointers are updated. If the block raises, staged
+        files are discarded.
+        """
+        if self._pending() is not None:
+            yield  # Already inside a batch
+            return
+        
+        pending = _PendingBatch()
+        self._local.pending = pending
+        try:
+            yield
+        except BaseException:
+            self._local.pending = None
+            for tmp_path, _ in pending.files:
+                tmp_path.unlink(missing_ok=True)
+            raise
+        
+        self._local.pending = None
+        self._commit_batch(pending)
+    
+    def _pending(self) -> Optional[_PendingBatch]:
+        return getattr(self._local, "pending", None)
+    
+    def _commit_batch(self, pending: _PendingBatch) -> None:
+        if self.fsync:
+            for tmp_path, _ in pending.files:
+                _fsync_path(tmp_path)
+            for path in pending.sync_paths:
+                _fsync_path(path)
+        
+        directories = set()
+        for tmp_path, output_path in pending.files:
+            os.replace(tmp_path, output_path)
+            directories.add(output_path.parent)
+        
+        if self.fsync:
+            for directory in directories:
+                _fsync_path(directory, directory=True)
+        
+        for action in pending.after_commit:
+            action()
+    
+    def _write(self, directory: Path, stem: str, data: dict[str, Any]) -> Path:
+        """Serialize data once to <directory>/<stem><extension>, atomically."""
+        output_path = directory / f"{stem}{self.format.extension}"
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = _tmp_path(output_path)
+        self.format.dump(data, tmp_path)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        pending = self._pending()
+        if pending is not None:
+            pending.files.append((tmp_path, output_path))
+            return output_path
+        
+        if self.fsync:
+            _fsync_path(tmp_path)
+        os.replace(tmp_path, output_path)
+        if self.fsync:
+            _fsync_path(output_path.parent, directory=True)
+        return output_path
+    
+    def _point_latest(self, target: Path, stem: str, directory: Optional[Path] = None) -> Path:
+        """
+        Make <directory>/<stem><extension> refer to target without
+        serializing again (directory defaults to target's own).
+        
+        Inside batch() the pointer is updated after target is committed.
+        """
+        latest_path = (directory or target.parent) / f"{stem}{self.format.extension}"
+        pending = self._pending()
+        if pending is not None:
+            pending.after_commit.append(lambda: self._update_latest(target, latest_path, stem))
+        else:
+            self._update_latest(target, latest_path, stem)
+        return latest_path
+    
+    def _update_latest(self, target: Path, latest_path: Path, stem: str) -> None:
+        """
+        Swap the latest pointer to target under the directory's file lock.
+        
+        Uses a relative symlink where supported, else a hard link, else a
+        byte copy. A pointer already at a newer file (timestamped names
+        sort in time order) is left alone, so racing writers can't move
+        it backwards.
+        """
+        with FileLock(latest_path.parent / LATEST_LOCK_NAME):
+            if latest_path.is_symlink() and Path(os.readlink(latest_path)).name > target.name:
+                return
             
-        # Also write to "latest" for easy access
-        latest_path = self.base_path / "synthesized" / f"{artifact_type}_latest.json"
-        with open(latest_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            tmp_path = _tmp_path(latest_path)
+            try:
+                os.symlink(os.path.relpath(target, latest_path.parent), tmp_path)
+            except (OSError, NotImplementedError):
+                try:
+                    os.link(target, tmp_path)
+                except OSError:
+                    shutil.copyfile(target, tmp_path)
+            os.replace(tmp_path, latest_path)
             
-        return output_path
+            self._remove_stale_pointers(latest_path, stem)
+    
+    @staticmethod
+    def _remove_stale_pointers(latest_path: Path, stem: str) -> None:
+        """Remove latest pointers left behind in a different format."""
+        for path in latest_path.parent.glob(f"{stem}.*"):
+            if path != latest_path and split_extension(path.name)[0] == stem:
+                path.unlink(missing_ok=True)
 
 
 class DataReader:
-    """Handles reading data from directories."""
+    """
+    Handles reading data from directories.
+    
+    Raw content is read from both layouts: data files in raw/ (in any
+    codec/compression, detected from the extension) and append-only
+    segments in raw/segments. find_raw(), find_api_id() and
+    last_written() answer from the artifact catalog without opening files.
+    """
     
     def __init__(self, base_path: str | Path = "data"):
         self.base_path = Path(base_path)
+        self.segments = SegmentStore(self.base_path / "raw" / "segments", read_only=True)
+        self.catalog = ArtifactCatalog(self.base_path / CATALOG_PATH, read_only=True)
         
     def read_latest_raw(self, source_type: str) -> dict[str, Any] | None:
         """Read the latest raw content for a source type."""
-        latest_path = self.base_path / "raw" / f"{source_type}_latest.json"
-        if not latest_path.exists():
-            return None
-            
-        with open(latest_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        stem = f"{source_type}_latest"
+        for latest_path in (self.base_path / "raw").glob(f"{stem}.*"):
+            if split_extension(latest_path.name)[0] == stem and latest_path.exists():
+                return load_file(latest_path)
+        return None
     
     def read_all_raw(self) -> list[dict[str, Any]]:
-        """Read all raw content files."""
+        """
+        Read all raw content items.
+        
+        Batch files are expanded into their items, like iter_raw(). Loads
+        every item into memory at once; prefer iter_raw() for large raw
+        directories.
+        """
+        return list(self.iter_raw())
+    
+    def read_raw_item(self, item_id: str) -> dict[str, Any] | None:
+        """
+        Read a single raw item by id.
+        
+        Uses the artifact catalog and the segment index; falls back to the
+        per-item file name (<source_type>_<id>.<ext>) in raw/ and its
+        partitions.
+        """
+        entry = self.catalog.get("raw", item_id)
+        if entry is not None:
+            for item in self.load_entries([entry]):
+                return item
+        
+        item = self.segments.get(item_id)
+        if item is not None:
+            return item
+        
+        raw_dir = self.base_path / "raw"
+        for pattern in (f"*_{item_id}.*", f"{SOURCE_PARTITION}*/{DATE_PARTITION}*/*_{item_id}.*"):
+            for file_path in raw_dir.glob(pattern):
+                if split_extension(file_path.name)[0].endswith(f"_{item_id}"):
+                    return load_file(file_path)
+        return None
+    
+    def find_raw(
+        self,
+        source_types: Optional[Iterable[str]] = None,
+        path_id: Optional[str] = None,
+        source_url: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> list[CatalogEntry]:
+        """
+        Look up raw items in the artifact catalog.
+        
+        Args:
+            source_types: Only items of these source types
+            path_id: Only items ingested for this learning path
+            source_url: Only items from this URL (compared in canonical form)
+            since: Only items written at or after this time (UTC)
+            until: Only items written before this time (UTC)
+            
+        Returns:
+            Catalog entries, oldest write first; load them with load_entries()
+        """
+        return self.catalog.find(
+            kind="raw",
+            artifact_type=list(source_types) if source_types else None,
+            path_id=path_id,
+            source_url=source_url,
+            since=since,
+            until=until
+        )
+    
+    def load_entries(self, entries: Iterable[CatalogEntry]) -> Iterator[dict[str, Any]]:
+        """
+        Yield the records that catalog entries point at.
+        
+        Consecutive entries in the same batch file share one read.
+        """
+        cached_path = None
+        cached_records: dict[str, dict[str, Any]] = {}
+        for entry in entries:
+            path = self.base_path / entry.path
+            record = None
+            if path.is_dir():
+                record = self.segments.get(entry.id)
+            elif path.exists():
+                if path != cached_path:
+                    cached_records = {
+                        str(item.get('id') or default_id): item
+                        for item, _, default_id in _records(load_file(path), path)
+                    }
+                    cached_path = path
+                record = cached_records.get(entry.id)
+            
+            if record is None:
+                logger.warning(f"Cataloged {entry.kind} record {entry.id} not found in {entry.path}")
+                continue
+            yield record
+    
+    def find_api_id(self, original_id: str) -> Optional[str]:
+        """
+        API id of a raw item, from the catalog.
+        
+        Checks the raw item itself, then processed records made from it.
+        """
+        raw = self.catalog.get("raw", original_id)
+        if raw is not None and raw.api_id:
+            return raw.api_id
+        for entry in self.catalog.find(kind="processed", original_id=original_id):
+            if entry.api_id:
+                return entry.api_id
+        return None
+    
+    def last_written(self, kind: str, artifact_type: Optional[str] = None) -> Optional[datetime]:
+        """
+        When records of a kind were last written (e.g. the last synthesis
+        run: kind 'synthesized', artifact_type 'knowledge_units').
+        """
+        return self.catalog.last_written(kind, artifact_type)
+    
+    def iter_raw(
+        self,
+        source_types: Optional[Iterable[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        path_id: Optional[str] = None,
+        written_since: Optional[datetime] = None
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Lazily yield raw content items, one at a time.
+        
+        Batch files are expanded in place, so callers always see single
+        items. Filters are applied as early as possible: partitions are
+        pruned by source type and date, files are skipped by modification
+        time (since) without being opened, and remaining items are filtered
+        before they are yielded. Partitions and segment directories only
+        hold items of their own source type. File names carry the type a
+        file was written under, which for a batch need not be its items'
+        (an RSS feed's items may be articles), so files are never skipped
+        by name. Instead, with source_types or path_id, the artifact
+        catalog (which records every item's own source type and pathId)
+        names the files holding a match, and cataloged files without one
+        are skipped unopened. Files missing from the catalog are read.
+        
+        Args:
+            source_types: Only yield items of these source types
+            since: Only yield items extracted at or after this time (UTC)
+            until: Only yield items extracted before this time (UTC)
+            path_id: Only yield items whose metadata pathId matches
+            written_since: Only yield items written at or after this time
+                (UTC); selected through the artifact catalog, so only
+                the files holding those items are read
+            
+        Yields:
+            RawContent dictionaries: flat files in name order, then
+            partitions in (source type, date) order, then segment records
+            (in write order with written_since)
+        """
         raw_dir = self.base_path / "raw"
         if not raw_dir.exists():
-            return []
+            return
+        
+        source_types = set(source_types) if source_types else None
+        since = self._naive_utc(since) if since else None
+        until = self._naive_utc(until) if until else None
+        
+        if written_since is not None:
+            entries = self.find_raw(source_types, path_id, since=written_since)
+            for item in self.load_entries(entries):
+                if self._matches(item, source_types, since, until, path_id):
+                    yield item
+            return
+        
+        # Items are written after they are extracted, so a file last modified
+        # before `since` cannot contain a matching item
+        since_ts = since.replace(tzinfo=timezone.utc).timestamp() if since else None
+        
+        # Files are written after their items are extracted, so a partition
+        # dated before `since` cannot contain a matching item
+        partitions = iter_raw_partitions(raw_dir, source_types, since.date() if since else None)
+        
+        # Latest files are skipped to avoid duplicates
+        candidates = itertools.chain.from_iterable(
+            _data_file_entries(directory) for directory in itertools.chain([raw_dir], partitions)
+        )
+        
+        cataloged = wanted = None
+        if source_types or path_id:
+            cataloged = self.catalog.paths("raw")
+            wanted = self.catalog.paths("raw", source_types, path_id) if cataloged else None
+        
+        for entry in candidates:
+            if since_ts is not None and entry.stat().st_mtime < since_ts:
+                continue
             
-        results = []
-        for file_path in raw_dir.glob("*.json"):
-            if file_path.stem.endswith("_latest"):
-                continue  # Skip latest files to avoid duplicates
-            with open(file_path, 'r', encoding='utf-8') as f:
-                results.append(json.load(f))
-                
-        return results
-
+            if wanted is not None:
+                relative = Path(entry.path).relative_to(self.base_path).as_posix()
+                if relative in cataloged and relative not in wanted:
+                    continue
+            
+            file_data = load_file(entry.path)
+            
+            items = file_data['items'] if 'items' in file_data else [file_data]
+            for item in items:
+                if self._matches(item, source_types, since, until, path_id):
+                    yield item
+        
+        for item in self.segments.iter_records(source_types, modified_since=since_ts):
+            if self._matches(item, source_types, since, until, path_id):
+                yield item
+    
+    @staticmethod
+    def _matches(
+        item: dict[str, Any],
+        source_types: Optional[set[str]],
+        since: Optional[datetime],
+        until: Optional[datetime],
+        path_id: Optional[str]
+    ) -> bool:
+        """Check a raw item against iter_raw() filters."""
+        if source_types and item.get('source_type') not in source_types:
+            return False
+        
+        if path_id and (item.get('metadata') or {}).get('pathId') != path_id:
+            return False
+        
+        if since or until:
+            extracted = item.get('extracted_date')
+            if not extracted:
+                return False
+            extracted_date = DataReader._naive_utc(datetime.fromisoformat(extracted))
+            if since and extracted_date < since:
+                return False
+            if until and extracted_date >= until:
+                return False
+        
+        return True
+    
+    @staticmethod
+    def _naive_utc(value: datetime) -> datetime:
+        """Convert an aware datetime to naive UTC (naive values are assumed UTC)."""
+        if value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
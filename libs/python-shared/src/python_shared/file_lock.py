@@ -0,0 +1,60 @@
+"""Cross-process file locks."""
+from pathlib import Path
+from typing import Optional
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    Exclusive advisory lock held on a lock file.
+
+    Works across processes and across threads of one process (each
+    acquisition opens its own file descriptor). Use as a context manager:
+
+        with FileLock(directory / ".latest.lock"):
+            ...
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> None:
+        """Block until the lock is held."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def release(self) -> None:
+        """Release the lock."""
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
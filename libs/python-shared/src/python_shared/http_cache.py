@@ -0,0 +1,256 @@
+"""On-disk HTTP cache for conditional GET requests."""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Mapping, Optional
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+
+logger = logging.getLogger("python_shared.http_cache")
+
+# Response headers kept with a cached body so a 304 can be served as if it
+# were the original response
+STORED_HEADERS = ("content-type", "content-location", "etag", "last-modified")
+
+
+@dataclass
+class CacheEntry:
+    """Validators and bookkeeping for one cached URL."""
+    url: str
+    key: str
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    headers: dict[str, str] = field(default_factory=dict)
+    stored_at: float = 0.0
+    last_access: float = 0.0
+
+
+class HttpCache:
+    """
+    Stores response bodies and their validators (ETag / Last-Modified).
+
+    Callers send the validators back as If-None-Match / If-Modified-Since
+    and, on a 304, reuse the stored body. Only responses that carry a
+    validator are cached. When the cache grows past max_bytes the least
+    recently used entries are evicted.
+
+    Callers that skip work on a 304 should stage() a response and only
+    commit() it once whatever was built from it has been saved; until then
+    the previous validators stay in place, so a failed run sees the
+    response again instead of a 304.
+
+    Layout: <cache_dir>/<key[:2]>/<key>.meta and <key>.body
+    """
+
+    def __init__(self, cache_dir: str | Path, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize HTTP cache.
+
+        Args:
+            cache_dir: Directory for cached entries (e.g. <DATA_DIR>/cache/http)
+            max_bytes: Total body size the cache may hold before evicting
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: Optional[dict[str, CacheEntry]] = None
+        self._total_bytes = 0
+        self._pending: dict[str, tuple[dict[str, str], bytes]] = {}
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Return the cache entry for a URL, if its body is still on disk."""
+        with self._lock:
+            entry = self._load_index().get(self._key(url))
+        if entry and self._body_path(entry.key).exists():
+            return entry
+        return None
+
+    def conditional_headers(self, entry: CacheEntry) -> dict[str, str]:
+        """Request headers that revalidate a cached entry."""
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def read_body(self, entry: CacheEntry) -> bytes:
+        """Read a cached body and mark the entry as recently used."""
+        body = self._body_path(entry.key).read_bytes()
+        self._touch(entry)
+        return body
+
+    def store(self, url: str, headers: Mapping[str, str], body: bytes) -> bool:
+        """
+        Cache a response body if the response can be revalidated.
+
+        Args:
+            url: Requested URL
+            headers: Response headers
+            body: Response body
+
+        Returns:
+            True if the response was cached
+        """
+        lowered = {k.lower(): v for k, v in headers.items()}
+        etag = lowered.get("etag")
+        last_modified = lowered.get("last-modified")
+        if not etag and not last_modified:
+            return False
+        if "no-store" in lowered.get("cache-control", "").lower():
+            return False
+        if len(body) > self.max_bytes:
+            return False
+
+        now = time.time()
+        entry = CacheEntry(
+            url=url,
+            key=self._key(url),
+            size=len(body),
+            etag=etag,
+            last_modified=last_modified,
+            headers={k: lowered[k] for k in STORED_HEADERS if k in lowered},
+            stored_at=now,
+            last_access=now
+        )
+
+        with self._lock:
+            index = self._load_index()
+            self._write_atomic(self._body_path(entry.key), body)
+            self._write_meta(entry)
+            previous = index.get(entry.key)
+            if previous:
+                self._total_bytes -= previous.size
+            index[entry.key] = entry
+            self._total_bytes += entry.size
+            self._evict()
+
+        return True
+
+    def stage(self, url: str, headers: Mapping[str, str], body: bytes) -> None:
+        """
+        Hold a response in memory until commit(url) or discard(url).
+
+        Args:
+            url: Requested URL
+            headers: Response headers
+            body: Response body
+        """
+        with self._lock:
+            self._pending[url] = (dict(headers), body)
+
+    def commit(self, url: str) -> bool:
+        """
+        Store the response staged for a URL.
+
+        Returns:
+            True if a staged response was cached
+        """
+        with self._lock:
+            pending = self._pending.pop(url, None)
+        if pending is None:
+            return False
+        return self.store(url, *pending)
+
+    def discard(self, url: str) -> None:
+        """Drop the response staged for a URL, keeping the previous entry."""
+        with self._lock:
+            self._pending.pop(url, None)
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            for key in list(self._load_index()):
+                self._remove(key)
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of cached bodies."""
+        with self._lock:
+            self._load_index()
+            return self._total_bytes
+
+    def _touch(self, entry: CacheEntry) -> None:
+        """Update an entry's last access time."""
+        entry.last_access = time.time()
+        with self._lock:
+            try:
+                self._write_meta(entry)
+            except OSError as e:
+                logger.debug(f"Could not update cache entry for {entry.url}: {e}")
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under max_bytes (lock held)."""
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        # Evict down to 90% so a full cache doesn't evict on every store
+        target = int(self.max_bytes * 0.9)
+        index = self._load_index()
+        evicted = 0
+        for entry in sorted(index.values(), key=lambda e: e.last_access):
+            if self._total_bytes <= target:
+                break
+            self._remove(entry.key)
+            evicted += 1
+
+        logger.debug(f"Evicted {evicted} entries from HTTP cache")
+
+    def _remove(self, key: str) -> None:
+        """Delete an entry from disk and from the index (lock held)."""
+        entry = self._load_index().pop(key, None)
+        if entry:
+            self._total_bytes -= entry.size
+        self._meta_path(key).unlink(missing_ok=True)
+        self._body_path(key).unlink(missing_ok=True)
+
+    def _load_index(self) -> dict[str, CacheEntry]:
+        """Build the in-memory index from meta files on first use (lock held)."""
+        if self._index is not None:
+            return self._index
+
+        self._index = {}
+        self._total_bytes = 0
+        if self.cache_dir.exists():
+            for meta_path in self.cache_dir.glob("*/*.meta"):
+                try:
+                    data = json.loads(meta_path.read_text(encoding="utf-8"))
+                    entry = CacheEntry(**data)
+                except (OSError, ValueError, TypeError):
+                    meta_path.unlink(missing_ok=True)
+                    continue
+                self._index[entry.key] = entry
+                self._total_bytes += entry.size
+
+        return self._index
+
+    def _write_meta(self, entry: CacheEntry) -> None:
+        """Persist an entry's metadata."""
+        data: dict[str, Any] = entry.__dict__
+        self._write_atomic(
+            self._meta_path(entry.key),
+            json.dumps(data, ensure_ascii=False).encode("utf-8")
+        )
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        """Write a file via a temp file and rename."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _meta_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.meta"
+
+    def _body_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.body"
@@ -0,0 +1,284 @@
+"""Pooled HTTP client shared by Kasita Python applications."""
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Optional
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+from python_shared.http_cache import CacheEntry, HttpCache
+
+
+DEFAULT_TIMEOUT = (10.0, 30.0)  # (connect, read) seconds
+DEFAULT_USER_AGENT = "Kasita/0.1 (+https://github.com/onehungrymind/infiltrate)"
+CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLargeError(requests.RequestException):
+    """Raised when a response body exceeds the configured size cap."""
+    pass
+
+
+@dataclass
+class FetchResult:
+    """A fully read HTTP response."""
+    url: str
+    status_code: int
+    headers: CaseInsensitiveDict = field(default_factory=CaseInsensitiveDict)
+    content: bytes = b""
+    encoding: Optional[str] = None
+    not_modified: bool = False  # True when served from cache after a 304
+
+    @property
+    def text(self) -> str:
+        """Body decoded with the declared charset (UTF-8 if none was sent)."""
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+class HttpClient:
+    """
+    Thin wrapper around a pooled requests.Session.
+
+    One client is meant to be shared by every adapter in a process:
+    - Connections are kept alive and reused per host, so repeated fetches
+      skip the TCP/TLS handshake and the DNS lookup that comes with it
+    - pool_maxsize caps concurrent connections per host; with pool_block
+      extra requests wait for a free connection instead of opening more
+    - Every request gets a default (connect, read) timeout
+    - Bodies are streamed in chunks and can be capped with max_bytes
+    - With an HttpCache, fetch() sends conditional GETs and reuses the
+      stored body when the server answers 304 Not Modified; fetch(...,
+      commit=False) defers caching a new body until commit_cache(url)
+    """
+
+    def __init__(
+        self,
+        timeout: float | tuple[float, float] = DEFAULT_TIMEOUT,
+        pool_connections: int = 20,
+        pool_maxsize: int = 4,
+        max_retries: int = 2,
+        user_agent: str = DEFAULT_USER_AGENT,
+        cache: Optional[HttpCache] = None
+    ):
+        """
+        Initialize HTTP client.
+
+        Args:
+            timeout: Default timeout, either seconds or (connect, read)
+            pool_connections: Number of per-host pools to keep
+            pool_maxsize: Maximum open connections per host
+            max_retries: Retries for connection errors and 429/5xx on GET/HEAD
+            user_agent: User-Agent header sent with every request
+            cache: Optional conditional-GET cache used by fetch()
+        """
+        self.timeout = timeout
+        self.cache = cache
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+            max_retries=retry
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request through the pooled session with the default timeout."""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a POST request."""
+        return self.request("POST", url, **kwargs)
+
+    def fetch(
+        self,
+        url: str,
+        max_bytes: Optional[int] = None,
+        headers: Optional[dict[str, str]] = None,
+        timeout: float | tuple[float, float] | None = None,
+        use_cache: bool = True,
+        commit: bool = True
+    ) -> FetchResult:
+        """
+        GET a URL and read the streamed body into memory.
+
+        Args:
+            url: URL to fetch
+            max_bytes: Abort with ResponseTooLargeError past this many bytes
+            headers: Extra request headers
+            timeout: Override the default timeout
+            use_cache: Revalidate against the cache when one is configured
+            commit: Cache a new body right away; False stages it until
+                commit_cache(url), for callers that skip work on a 304 and
+                must not see one before their results are saved
+
+        Returns:
+            FetchResult with the full body (not_modified is set when the
+            body came from the cache after a 304)
+
+        Raises:
+            requests.RequestException: On network errors and 4xx/5xx responses
+        """
+        entry = self.cache.lookup(url) if self.cache and use_cache else None
+        result = self._request(url, max_bytes, headers, timeout, entry)
+        if result is None:
+            # Cached body evicted between lookup and read, fetch it again
+            # in full and cache the new body as usual
+            result = self._request(url, max_bytes, headers, timeout, None)
+        elif result.not_modified:
+            return result
+
+        if self.cache and use_cache:
+            if commit:
+                self.cache.store(url, result.headers, result.content)
+            else:
+                self.cache.stage(url, result.headers, result.content)
+        return result
+
+    def _request(
+        self,
+        url: str,
+        max_bytes: Optional[int],
+        headers: Optional[dict[str, str]],
+        timeout: float | tuple[float, float] | None,
+        entry: Optional[CacheEntry]
+    ) -> Optional[FetchResult]:
+        """
+        GET a URL, revalidating against a cache entry when one is given.
+
+        Returns:
+            FetchResult, or None when the server answered 304 but the
+            entry's body is no longer on disk
+        """
+        request_headers = dict(headers or {})
+        if entry:
+            request_headers.update(self.cache.conditional_headers(entry))
+
+        with self.get(
+            url,
+            headers=request_headers,
+            timeout=timeout or self.timeout,
+            stream=True
+        ) as response:
+            if entry and response.status_code == 304:
+                try:
+                    content = self.cache.read_body(entry)
+                except OSError:
+                    return None
+                cached_headers = CaseInsensitiveDict(entry.headers)
+                cached_headers.update(response.headers)
+                return FetchResult(
+                    url=response.url,
+                    status_code=response.status_code,
+                    headers=cached_headers,
+                    content=content,
+                    encoding=self._declared_encoding(cached_headers),
+                    not_modified=True
+                )
+
+            response.raise_for_status()
+            chunks = []
+            received = 0
+            for chunk in response.iter_content(CHUNK_SIZE):
+                received += len(chunk)
+                if max_bytes is not None and received > max_bytes:
+                    raise ResponseTooLargeError(
+                        f"Response from {url} exceeds {max_bytes} bytes"
+                    )
+                chunks.append(chunk)
+
+            return FetchResult(
+                url=response.url,
+                status_code=response.status_code,
+                headers=response.headers,
+                content=b"".join(chunks),
+                encoding=self._declared_encoding(response.headers)
+            )
+
+    def commit_cache(self, url: str) -> None:
+        """Cache the body fetched from a URL with commit=False."""
+        if self.cache:
+            self.cache.commit(url)
+
+    def discard_cache(self, url: str) -> None:
+        """Forget the body fetched from a URL with commit=False."""
+        if self.cache:
+            self.cache.discard(url)
+
+    def download(
+        self,
+        url: str,
+        destination: BinaryIO,
+        max_bytes: Optional[int] = None,
+        timeout: float | tuple[float, float] | None = None
+    ) -> int:
+        """
+        Stream a URL into a writable binary file object.
+
+        Args:
+            url: URL to fetch
+            destination: File object the body is written to
+            max_bytes: Abort with ResponseTooLargeError past this many bytes
+            timeout: Override the default timeout
+
+        Returns:
+            Number of bytes written
+        """
+        with self.get(url, timeout=timeout or self.timeout, stream=True) as response:
+            response.raise_for_status()
+            written = 0
+            for chunk in response.iter_content(CHUNK_SIZE):
+                written += len(chunk)
+                if max_bytes is not None and written > max_bytes:
+                    raise ResponseTooLargeError(
+                        f"Response from {url} exceeds {max_bytes} bytes"
+                    )
+                destination.write(chunk)
+            return written
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+    @staticmethod
+    def _declared_encoding(headers: CaseInsensitiveDict) -> Optional[str]:
+        """Charset from the Content-Type header, if the server sent one."""
+        content_type = headers.get("Content-Type", "")
+        if "charset=" not in content_type.lower():
+            return None
+        return requests.utils.get_encoding_from_headers(headers)
+
+
+_default_client: Optional[HttpClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> HttpClient:
+    """Return the process-wide shared HttpClient, creating it on first use."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
+
+
+def set_default_client(client: HttpClient) -> None:
+    """Replace the process-wide shared HttpClient."""
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
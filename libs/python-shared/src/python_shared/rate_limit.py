@@ -0,0 +1,61 @@
+"""Rate limiting utilities."""
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`, so
+    short bursts are allowed while the long-run rate stays bounded.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum stored tokens (defaults to max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until `tokens` are available and take them.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take `tokens` if they are available right now."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def _refill(self) -> None:
+        """Add tokens for the time elapsed since the last refill (lock held)."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
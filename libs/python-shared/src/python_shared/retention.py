@@ -0,0 +1,224 @@
+"""Retention and compaction of per-run outputs in data/processed and data/synthesized."""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+import logging
+import os
+import tarfile
+from .catalog import ArtifactCatalog
+from .file_io import LATEST_LOCK_NAME, parse_run_stem
+from .file_lock import FileLock
+from .serialization import is_data_file, split_extension
+
+
+logger = logging.getLogger("python_shared.retention")
+
+# Directories holding timestamped per-run outputs (<type>_<generate_id()>.<ext>,
+# or <type>_<ISO timestamp>.<ext> for older runs)
+RUN_DIRECTORIES = ("processed", "synthesized")
+
+# Files stored next to a run's data file under the same stem
+SIDECAR_SUFFIXES = (".npy",)
+
+ARCHIVE_DIR = "archive"
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    Which per-run outputs to keep.
+
+    A run is kept if it is one of the newest keep_last runs of its type or
+    younger than max_age. The newest run of each type is always kept.
+    Expired runs are merged into a compressed archive (archive=True) or
+    deleted.
+    """
+    keep_last: Optional[int] = 5
+    max_age: Optional[timedelta] = None
+    archive: bool = True
+
+
+@dataclass
+class Run:
+    """One pipeline output: its data file and any sidecars."""
+    artifact_type: str
+    timestamp: datetime
+    stem: str
+    files: list[Path] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return sum(path.stat().st_size for path in self.files if path.exists())
+
+
+@dataclass
+class CompactionReport:
+    """What a compaction removed and how much space it reclaimed."""
+    runs_kept: int = 0
+    runs_expired: int = 0
+    files_removed: int = 0
+    archives: list[Path] = field(default_factory=list)
+    bytes_removed: int = 0
+    bytes_archived: int = 0  # Size of the archives written
+    dry_run: bool = False
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        return self.bytes_removed - self.bytes_archived
+
+    def summary(self) -> str:
+        prefix = "Would reclaim" if self.dry_run else "Reclaimed"
+        return (
+            f"{prefix} {self.bytes_reclaimed / (1024 * 1024):.1f} MB: "
+            f"{self.runs_expired} runs expired ({self.files_removed} files), "
+            f"{self.runs_kept} kept, {len(self.archives)} archives written"
+        )
+
+
+def find_runs(directory: Path) -> dict[str, list[Run]]:
+    """
+    Group the per-run outputs in a directory by artifact type.
+
+    Latest pointers, temp files and names without a timestamp are ignored.
+
+    Returns:
+        {artifact_type: runs, newest first}
+    """
+    runs: dict[str, Run] = {}
+    if not directory.exists():
+        return {}
+
+    for path in directory.iterdir():
+        if path.name.startswith('.') or path.is_symlink() or not path.is_file():
+            continue
+        sidecar = next((suffix for suffix in SIDECAR_SUFFIXES if path.name.endswith(suffix)), None)
+        if sidecar:
+            stem = path.name[:-len(sidecar)]
+        elif is_data_file(path.name):
+            stem = split_extension(path.name)[0]
+        else:
+            continue
+
+        parsed = parse_run_stem(stem)
+        if parsed is None:
+            continue
+
+        run = runs.setdefault(stem, Run(parsed[0], parsed[1], stem))
+        run.files.append(path)
+
+    grouped: dict[str, list[Run]] = {}
+    for run in runs.values():
+        grouped.setdefault(run.artifact_type, []).append(run)
+    for group in grouped.values():
+        group.sort(key=lambda run: run.timestamp, reverse=True)
+    return grouped
+
+
+def expired_runs(runs: list[Run], policy: RetentionPolicy, now: Optional[datetime] = None) -> list[Run]:
+    """Runs (newest first) that the policy no longer keeps."""
+    if policy.keep_last is None and policy.max_age is None:
+        return []
+    now = now or datetime.utcnow()
+    keep_last = max(1, policy.keep_last) if policy.keep_last is not None else 1
+
+    expired = []
+    for index, run in enumerate(runs):
+        if index < keep_last:
+            continue
+        if policy.max_age is not None and now - run.timestamp < policy.max_age:
+            continue
+        expired.append(run)
+    return expired
+
+
+def compact(
+    base_path: str | Path,
+    policy: RetentionPolicy,
+    dry_run: bool = False,
+    catalog: Optional[ArtifactCatalog] = None
+) -> CompactionReport:
+    """
+    Apply a retention policy to data/processed and data/synthesized.
+
+    For each artifact type, expired runs are written into one
+    archive/<type>_<oldest>_<newest>.tar.gz (when archiving) and then
+    deleted, under the directory's latest-pointer lock. Runs a *_latest
+    symlink points at are never expired. Catalog entries pointing at
+    deleted files are removed.
+
+    Args:
+        base_path: Base data directory
+        policy: What to keep
+        dry_run: Only report what would be removed
+        catalog: Artifact catalog to prune
+
+    Returns:
+        CompactionReport
+    """
+    base_path = Path(base_path)
+    report = CompactionReport(dry_run=dry_run)
+
+    for directory_name in RUN_DIRECTORIES:
+        directory = base_path / directory_name
+        pinned = _symlink_targets(directory)
+        for artifact_type, runs in sorted(find_runs(directory).items()):
+            expired = [
+                run for run in expired_runs(runs, policy)
+                if not any(path.name in pinned for path in run.files)
+            ]
+            report.runs_kept += len(runs) - len(expired)
+            if not expired:
+                continue
+
+            report.runs_expired += len(expired)
+            files = [path for run in expired for path in run.files]
+            report.files_removed += len(files)
+            report.bytes_removed += sum(run.size for run in expired)
+            if dry_run:
+                continue
+
+            with FileLock(directory / LATEST_LOCK_NAME):
+                if policy.archive:
+                    archive = _write_archive(directory / ARCHIVE_DIR, artifact_type, expired)
+                    report.archives.append(archive)
+                    report.bytes_archived += archive.stat().st_size
+                for path in files:
+                    path.unlink(missing_ok=True)
+
+            if catalog is not None:
+                catalog.remove_paths(f"{directory_name}/{path.name}" for path in files)
+            logger.info(f"Expired {len(expired)} {directory_name}/{artifact_type} runs")
+
+    logger.info(report.summary())
+    return report
+
+
+def _symlink_targets(directory: Path) -> set[str]:
+    """Names of the files that symlinks in a directory point at."""
+    if not directory.exists():
+        return set()
+    return {
+        Path(os.readlink(path)).name
+        for path in directory.iterdir() if path.is_symlink()
+    }
+
+
+def _write_archive(archive_dir: Path, artifact_type: str, runs: list[Run]) -> Path:
+    """Merge runs into one gzipped tar, atomically."""
+    oldest = min(run.timestamp for run in runs).strftime("%Y%m%dT%H%M%S")
+    newest = max(run.timestamp for run in runs).strftime("%Y%m%dT%H%M%S")
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    archive_path = archive_dir / f"{artifact_type}_{oldest}_{newest}.tar.gz"
+    suffix = 1
+    while archive_path.exists():
+        archive_path = archive_dir / f"{artifact_type}_{oldest}_{newest}-{suffix}.tar.gz"
+        suffix += 1
+    tmp_path = archive_dir / f".{archive_path.name}.{os.getpid()}.tmp"
+
+    with tarfile.open(tmp_path, "w:gz") as tar:
+        for run in sorted(runs, key=lambda run: run.timestamp):
+            for path in run.files:
+                tar.add(path, arcname=path.name)
+    os.replace(tmp_path, archive_path)
+    return archive_path
@@ -0,0 +1,330 @@
+"""Append-only JSONL segment store for raw content."""
+from pathlib import Path
+from typing import Any, Iterable, Iterator, NamedTuple, Optional
+import gzip
+import logging
+import threading
+import zlib
+from .file_lock import FileLock
+from .serialization import json_dumps, json_loads
+
+
+logger = logging.getLogger("python_shared.segment_store")
+
+SEGMENT_SUFFIX = ".jsonl"
+COMPRESSED_SUFFIX = ".jsonl.gz"
+INDEX_SUFFIX = ".idx"
+LOCK_NAME = ".lock"
+
+
+class RecordLocation(NamedTuple):
+    """Where the current version of a record lives."""
+    source_type: str
+    segment: Path
+    offset: int
+    length: int
+
+
+class SegmentStore:
+    """
+    Stores records as newline-delimited JSON in rotating segment files.
+
+    Each source type gets its own directory of numbered segments. Records
+    are only ever appended; a segment is closed once it reaches
+    max_segment_bytes and a new one is started. With compression enabled,
+    every record is written as its own gzip member, so the segment is
+    still a valid .gz stream and any record can be decompressed on its own.
+
+    Next to each segment an .idx file lists "<id>\\t<offset>\\t<length>" per
+    record, which gives random access by id without scanning segments.
+    Writing a record with an existing id supersedes the earlier version.
+
+    Appends and crash recovery hold a per-source-type file lock, so several
+    processes can write to the same store. Each instance only indexes what
+    it has loaded or written itself; open a fresh (read-only) instance to
+    see other processes' records.
+
+    Layout: <root>/<source_type>/<seq>.jsonl[.gz] and <seq>.idx
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        compress: bool = False,
+        read_only: bool = False
+    ):
+        """
+        Initialize segment store.
+
+        Args:
+            root: Directory holding the segments (e.g. data/raw/segments)
+            max_segment_bytes: Size at which a segment is rotated
+            compress: Gzip new records (existing segments keep their format)
+            read_only: Never modify segments (readers must not repair files
+                a writer may still be appending to)
+        """
+        self.root = Path(root)
+        self.max_segment_bytes = max_segment_bytes
+        self.compress = compress
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        self._index: Optional[dict[str, RecordLocation]] = None
+        self._recovered: set[Path] = set()
+
+    def append(self, records: Iterable[dict[str, Any]], source_type: str) -> Optional[Path]:
+        """
+        Append records to the active segment of a source type.
+
+        Args:
+            records: Records to store; each must have an 'id'
+            source_type: Source type the records belong to
+
+        Returns:
+            Path of the last segment written to, or None if there were no records
+        """
+        if self.read_only:
+            raise PermissionError("Segment store is read-only")
+
+        encoded = [(record['id'], self._encode(record)) for record in records]
+        if not encoded:
+            return None
+
+        with self._lock:
+            index = self._load_index()
+            with FileLock(self.root / source_type / LOCK_NAME):
+                segment = self._active_segment(source_type)
+                size = segment.stat().st_size if segment.exists() else 0
+
+                data_file = open(segment, 'ab')
+                index_file = open(self.index_path(segment), 'a', encoding='utf-8')
+                try:
+                    for record_id, data in encoded:
+                        if size and size + len(data) > self.max_segment_bytes:
+                            data_file.close()
+                            index_file.close()
+                            segment = self._next_segment(source_type, segment)
+                            size = 0
+                            data_file = open(segment, 'ab')
+                            index_file = open(self.index_path(segment), 'a', encoding='utf-8')
+
+                        data_file.write(data)
+                        index_file.write(f"{record_id}\t{size}\t{len(data)}\n")
+                        index[record_id] = RecordLocation(source_type, segment, size, len(data))
+                        size += len(data)
+                finally:
+                    data_file.close()
+                    index_file.close()
+
+        return segment
+
+    def get(self, record_id: str) -> Optional[dict[str, Any]]:
+        """Read the current version of a record by id."""
+        with self._lock:
+            location = self._load_index().get(record_id)
+        if location is None:
+            return None
+
+        with open(location.segment, 'rb') as f:
+            f.seek(location.offset)
+            return self._decode(location.segment, f.read(location.length))
+
+    def iter_records(
+        self,
+        source_types: Optional[Iterable[str]] = None,
+        modified_since: Optional[float] = None
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Yield the current version of every record, segment by segment.
+
+        Args:
+            source_types: Only read segments of these source types
+            modified_since: Skip segments last modified before this POSIX time
+
+        Yields:
+            Records in write order within each source type
+        """
+        with self._lock:
+            index = self._load_index()
+
+        for segment in self.segments(source_types):
+            if modified_since is not None and segment.stat().st_mtime < modified_since:
+                continue
+
+            source_type = segment.parent.name
+            with open(segment, 'rb') as f:
+                for record_id, offset, length in self._read_index_file(self.index_path(segment)):
+                    # Skip versions superseded by a later write of the same id
+                    if index.get(record_id) != RecordLocation(source_type, segment, offset, length):
+                        continue
+                    f.seek(offset)
+                    yield self._decode(segment, f.read(length))
+
+    def segments(self, source_types: Optional[Iterable[str]] = None) -> list[Path]:
+        """Segment files in write order, optionally limited to some source types."""
+        if not self.root.exists():
+            return []
+
+        if source_types is None:
+            directories = sorted(p for p in self.root.iterdir() if p.is_dir())
+        else:
+            directories = [self.root / source_type for source_type in sorted(set(source_types))]
+
+        segments = []
+        for directory in directories:
+            if directory.is_dir():
+                segments.extend(sorted(
+                    (p for p in directory.iterdir() if self._is_segment(p)),
+                    key=self._sequence
+                ))
+        return segments
+
+    def __contains__(self, record_id: str) -> bool:
+        with self._lock:
+            return record_id in self._load_index()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_index())
+
+    def _load_index(self) -> dict[str, RecordLocation]:
+        """Read every .idx file into memory on first use (lock held)."""
+        if self._index is not None:
+            return self._index
+
+        self._index = {}
+        for segment in self.segments():
+            if not self.read_only and segment not in self._recovered:
+                with FileLock(segment.parent / LOCK_NAME):
+                    self._recover(segment)
+            source_type = segment.parent.name
+            for record_id, offset, length in self._read_index_file(self.index_path(segment)):
+                self._index[record_id] = RecordLocation(source_type, segment, offset, length)
+        return self._index
+
+    def _recover(self, segment: Path) -> None:
+        """
+        Make a segment and its index agree after an interrupted append.
+
+        Records written to the segment but missing from the index are
+        re-indexed; a partially written trailing record is truncated.
+        """
+        if self.read_only or segment in self._recovered:
+            return
+        self._recovered.add(segment)
+
+        index_path = self.index_path(segment)
+        if index_path.exists():
+            # Drop a partially written last index line so appends start on a fresh line
+            content = index_path.read_bytes()
+            if content and not content.endswith(b'\n'):
+                with open(index_path, 'r+b') as f:
+                    f.truncate(content.rfind(b'\n') + 1)
+        entries = list(self._read_index_file(index_path))
+        indexed_end = entries[-1][1] + entries[-1][2] if entries else 0
+        size = segment.stat().st_size
+        if size == indexed_end:
+            return
+
+        with open(segment, 'rb') as f:
+            f.seek(indexed_end)
+            tail = f.read()
+
+        recovered = []
+        offset = indexed_end
+        for data in self._split_records(segment, tail):
+            record = self._decode(segment, data)
+            recovered.append(f"{record['id']}\t{offset}\t{len(data)}\n")
+            offset += len(data)
+
+        if offset < size:
+            logger.warning(f"Truncating {size - offset} bytes of partial record from {segment}")
+            with open(segment, 'r+b') as f:
+                f.truncate(offset)
+        if recovered:
+            logger.warning(f"Re-indexed {len(recovered)} records in {segment}")
+            with open(index_path, 'a', encoding='utf-8') as f:
+                f.writelines(recovered)
+
+    @staticmethod
+    def _split_records(segment: Path, data: bytes) -> Iterator[bytes]:
+        """Split raw segment bytes into complete records, stopping at a partial one."""
+        if segment.name.endswith(COMPRESSED_SUFFIX):
+            while data:
+                decompressor = zlib.decompressobj(wbits=31)
+                try:
+                    decompressor.decompress(data)
+                except zlib.error:
+                    return
+                if not decompressor.eof:
+                    return
+                length = len(data) - len(decompressor.unused_data)
+                yield data[:length]
+                data = data[length:]
+        else:
+            start = 0
+            while True:
+                end = data.find(b'\n', start)
+                if end == -1:
+                    return
+                yield data[start:end + 1]
+                start = end + 1
+
+    def _encode(self, record: dict[str, Any]) -> bytes:
+        line = json_dumps(record) + b'\n'
+        if self.compress:
+            return gzip.compress(line, compresslevel=6, mtime=0)
+        return line
+
+    @staticmethod
+    def _decode(segment: Path, data: bytes) -> dict[str, Any]:
+        if segment.name.endswith(COMPRESSED_SUFFIX):
+            data = gzip.decompress(data)
+        return json_loads(data)
+
+    def _active_segment(self, source_type: str) -> Path:
+        """Last segment of a source type, or a new one if its format doesn't match (lock held)."""
+        existing = self.segments([source_type])
+        if existing and existing[-1].name.endswith(self._suffix):
+            self._recover(existing[-1])
+            return existing[-1]
+        return self._next_segment(source_type, existing[-1] if existing else None)
+
+    def _next_segment(self, source_type: str, current: Optional[Path]) -> Path:
+        directory = self.root / source_type
+        directory.mkdir(parents=True, exist_ok=True)
+        sequence = self._sequence(current) + 1 if current else 1
+        segment = directory / f"{sequence:06d}{self._suffix}"
+        self._recovered.add(segment)
+        return segment
+
+    @property
+    def _suffix(self) -> str:
+        return COMPRESSED_SUFFIX if self.compress else SEGMENT_SUFFIX
+
+    @staticmethod
+    def _is_segment(path: Path) -> bool:
+        return path.name.endswith((SEGMENT_SUFFIX, COMPRESSED_SUFFIX))
+
+    @staticmethod
+    def _sequence(segment: Path) -> int:
+        return int(segment.name.split('.', 1)[0])
+
+    @staticmethod
+    def index_path(segment: Path) -> Path:
+        """The .idx file belonging to a segment."""
+        return segment.with_name(f"{segment.name.split('.', 1)[0]}{INDEX_SUFFIX}")
+
+    @staticmethod
+    def _read_index_file(index_path: Path) -> Iterator[tuple[str, int, int]]:
+        """Entries of an .idx file, ignoring a partially written last line."""
+        if not index_path.exists():
+            return
+        with open(index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break
+                parts = line.rstrip('\n').split('\t')
+                if len(parts) != 3:
+                    continue
+                yield parts[0], int(parts[1]), int(parts[2])
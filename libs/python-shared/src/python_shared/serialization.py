@@ -0,0 +1,267 @@
+"""Pluggable serialization codecs and compression framing for data files."""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+import gzip
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def json_dumps(data: Any, indent: Optional[int] = None) -> bytes:
+    """Serialize to UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option)
+    separators = None if indent else (',', ':')
+    return json.dumps(data, indent=indent, ensure_ascii=False, separators=separators).encode('utf-8')
+
+
+def json_loads(data: bytes) -> Any:
+    """Parse JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class Codec(ABC):
+    """Turns plain Python data (dicts, lists, strings, numbers) into bytes and back."""
+
+    name: str = ""
+    extension: str = ""
+
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes:
+        """Serialize data to bytes."""
+        pass
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        """Parse bytes written by dumps()."""
+        pass
+
+
+class JsonCodec(Codec):
+    """Standard library JSON (the original format: indent=2, UTF-8)."""
+
+    name = "json"
+    extension = ".json"
+
+    def __init__(self, indent: Optional[int] = 2):
+        self.indent = indent
+
+    def dumps(self, data: Any) -> bytes:
+        separators = None if self.indent else (',', ':')
+        return json.dumps(data, indent=self.indent, ensure_ascii=False, separators=separators).encode('utf-8')
+
+    def loads(self, data: bytes) -> Any:
+        return json_loads(data)
+
+
+class OrjsonCodec(Codec):
+    """orjson: same .json files, several times faster to write and read."""
+
+    name = "orjson"
+    extension = ".json"
+
+    def __init__(self, indent: Optional[int] = 2):
+        if orjson is None:
+            raise ImportError("orjson is required for the orjson codec (pip install orjson)")
+        self.indent = indent
+
+    def dumps(self, data: Any) -> bytes:
+        return json_dumps(data, indent=2 if self.indent else None)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """MessagePack: compact binary encoding."""
+
+    name = "msgpack"
+    extension = ".msgpack"
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack is required for the msgpack codec (pip install msgpack)")
+
+    def dumps(self, data: Any) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+class Compression(ABC):
+    """Whole-file compression framing."""
+
+    name: str = ""
+    extension: str = ""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress a whole file's bytes."""
+        pass
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress bytes written by compress()."""
+        pass
+
+
+class GzipCompression(Compression):
+    name = "gzip"
+    extension = ".gz"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def decompress(self, data: bytes) -> bytes:
+        return gzip.decompress(data)
+
+
+class ZstdCompression(Compression):
+    name = "zstd"
+    extension = ".zst"
+
+    def __init__(self, level: int = 3):
+        if zstandard is None:
+            raise ImportError("zstandard is required for zstd compression (pip install zstandard)")
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+CODECS: dict[str, type[Codec]] = {
+    "json": JsonCodec,
+    "orjson": OrjsonCodec,
+    "msgpack": MsgpackCodec,
+}
+
+COMPRESSIONS: dict[str, type[Compression]] = {
+    "gzip": GzipCompression,
+    "zstd": ZstdCompression,
+}
+
+
+@dataclass(frozen=True)
+class FileFormat:
+    """A codec plus optional compression, e.g. .json, .msgpack.zst."""
+    codec: Codec
+    compression: Optional[Compression] = None
+
+    @property
+    def extension(self) -> str:
+        return self.codec.extension + (self.compression.extension if self.compression else "")
+
+    def dumps(self, data: Any) -> bytes:
+        encoded = self.codec.dumps(data)
+        return self.compression.compress(encoded) if self.compression else encoded
+
+    def loads(self, data: bytes) -> Any:
+        if self.compression:
+            data = self.compression.decompress(data)
+        return self.codec.loads(data)
+
+    def dump(self, data: Any, path: str | Path) -> None:
+        """Serialize data to a file."""
+        Path(path).write_bytes(self.dumps(data))
+
+    def load(self, path: str | Path) -> Any:
+        """Deserialize a file."""
+        return self.loads(Path(path).read_bytes())
+
+
+def get_format(codec: str = "json", compression: Optional[str] = None) -> FileFormat:
+    """
+    Build a file format from configuration names.
+
+    Args:
+        codec: 'json', 'orjson' or 'msgpack'
+        compression: None, 'gzip' or 'zstd'
+
+    Returns:
+        FileFormat
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec: {codec}")
+    if compression and compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}")
+    return FileFormat(
+        codec=CODECS[codec](),
+        compression=COMPRESSIONS[compression]() if compression else None
+    )
+
+
+# Extensions recognised on read, longest first so ".json.gz" wins over ".gz"
+_EXTENSIONS = sorted(
+    (
+        (codec_class.extension + (compression_class.extension if compression_class else ""),
+         codec_name, compression_name)
+        for codec_name, codec_class in CODECS.items() if codec_name != "orjson"
+        for compression_name, compression_class in [(None, None), *COMPRESSIONS.items()]
+    ),
+    key=lambda entry: len(entry[0]),
+    reverse=True
+)
+
+
+def split_extension(name: str) -> tuple[str, str]:
+    """
+    Split a data file name into (stem, extension).
+
+    Returns:
+        (stem, extension), or (name, "") if the extension isn't a data format
+    """
+    for extension, _, _ in _EXTENSIONS:
+        if name.endswith(extension) and len(name) > len(extension):
+            return name[:-len(extension)], extension
+    return name, ""
+
+
+def is_data_file(name: str) -> bool:
+    """Whether a file name has a recognised data format extension."""
+    return bool(split_extension(name)[1])
+
+
+def format_for_path(path: str | Path) -> FileFormat:
+    """
+    Detect the format of a data file from its extension.
+
+    JSON files are always parsed with the fastest available parser,
+    whichever codec wrote them.
+    """
+    name = Path(path).name
+    for extension, codec_name, compression_name in _EXTENSIONS:
+        if name.endswith(extension):
+            codec = JsonCodec() if codec_name == "json" else CODECS[codec_name]()
+            compression = COMPRESSIONS[compression_name]() if compression_name else None
+            return FileFormat(codec=codec, compression=compression)
+    raise ValueError(f"Unrecognised data file extension: {name}")
+
+
+def load_file(path: str | Path) -> Any:
+    """Read a data file in whatever format its extension names."""
+    return format_for_path(path).load(path)
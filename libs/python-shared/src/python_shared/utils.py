@@ -1,8 +1,38 @@
 """Shared utility functions for Kasita Python applications."""
 from pathlib import Path
-from typing import Any
-import json
-from datetime import datetime
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import hashlib
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from .serialization import format_for_path, get_format, is_data_file
+
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref', 'ref_src'}
+
+_EPOCH = datetime(1970, 1, 1)
+
+# generate_id(): fixed-width UTC timestamp, then a 6 hex digit node
+ID_TIME_FORMAT = '%Y%m%d_%H%M%S_%f'
+GENERATED_ID = re.compile(r'(\d{8}_\d{6}_\d{6})_[0-9a-f]{6}')
+
+# State for generate_id(): last microsecond handed out and a random node
+# suffix, both reset in forked children so they don't repeat the parent
+_id_lock = threading.Lock()
+_id_state = {'last': 0, 'node': os.urandom(3).hex()}
+
+
+def _reset_id_state() -> None:
+    _id_state['last'] = 0
+    _id_state['node'] = os.urandom(3).hex()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_id_state)
 
 
 def ensure_directory(path: str | Path) -> Path:
@@ -13,20 +43,92 @@ def ensure_directory(path: str | Path) -> Path:
 
 
 def generate_id() -> str:
-    """Generate a unique ID based on timestamp."""
-    return datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
+    """
+    Generate a unique, time-sortable ID.
+    
+    Format: <UTC %Y%m%d_%H%M%S_%f>_<6 hex node>. Within a process the
+    timestamp part strictly increases (calls in the same microsecond are
+    bumped forward), and the random per-process node keeps ids from
+    parallel processes apart. IDs sort in creation order per process.
+    """
+    with _id_lock:
+        micros = max(time.time_ns() // 1000, _id_state['last'] + 1)
+        _id_state['last'] = micros
+        node = _id_state['node']
+    timestamp = _EPOCH + timedelta(microseconds=micros)
+    return f"{timestamp.strftime(ID_TIME_FORMAT)}_{node}"
+
+
+def id_timestamp(value: str) -> Optional[datetime]:
+    """
+    UTC creation time of an id made by generate_id().
+    
+    Returns:
+        Naive UTC datetime, or None if value is not such an id
+    """
+    match = GENERATED_ID.fullmatch(value)
+    if not match:
+        return None
+    return datetime.strptime(match.group(1), ID_TIME_FORMAT)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for identity checks.
+    
+    Lowercases scheme and host, drops default ports, fragments, trailing
+    slashes and tracking parameters (utm_* etc.), and sorts the query.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.hostname or ''
+    if parts.port and not (
+        (scheme == 'http' and parts.port == 80) or (scheme == 'https' and parts.port == 443)
+    ):
+        netloc = f"{netloc}:{parts.port}"
+    
+    path = parts.path.rstrip('/') or '/'
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ))
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+
+def content_hash(*parts: str) -> str:
+    """SHA-256 hex digest of one or more text parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def content_id(source_url: str, *parts: str) -> str:
+    """
+    Deterministic ID for a piece of content.
+    
+    Hashes the canonical source URL together with the given parts (e.g.
+    title and content), so extracting the same content twice yields the
+    same ID and writes become idempotent upserts.
+    
+    Returns:
+        32 hex characters (128 bits of SHA-256)
+    """
+    return content_hash(canonicalize_url(source_url), *parts)[:32]
 
 
 def load_json(path: str | Path) -> dict[str, Any]:
-    """Load JSON from file."""
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Load JSON (or another data format, detected from the extension) from file."""
+    path = Path(path)
+    file_format = format_for_path(path) if is_data_file(path.name) else get_format("json")
+    return file_format.load(path)
 
 
 def save_json(data: dict[str, Any], path: str | Path) -> None:
-    """Save data as JSON to file."""
+    """Save data as JSON (or the format named by the extension) to file."""
     path = Path(path)
     ensure_directory(path.parent)
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    file_format = format_for_path(path) if is_data_file(path.name) else get_format("json")
+    file_format.dump(data, path)
 
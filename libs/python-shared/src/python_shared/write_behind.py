@@ -0,0 +1,157 @@
+"""Write-behind wrapper that moves DataWriter commits to a background thread."""
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+import logging
+import queue
+import threading
+from .file_io import DataWriter
+
+
+logger = logging.getLogger("python_shared.write_behind")
+
+_STOP = object()
+
+
+class WriteBehindWriter:
+    """
+    Queues DataWriter writes and commits them on a background thread.
+
+    write_raw / write_processed / write_synthesized return immediately with
+    a Future for the written path(s). The background thread drains up to
+    max_batch queued writes at a time and commits them as one
+    DataWriter.batch(), so fsyncs and directory syncs are shared. When
+    the queue is full, callers block (backpressure) rather than buffering
+    without bound.
+
+    Call flush() to wait for everything queued so far and close() before
+    exiting; close() flushes. Both raise if a write failed, so callers that
+    ignore the Futures still find out. flush() reports the writes queued
+    by the calling thread, so concurrent callers each see their own
+    failures; close() reports any left unreported.
+    """
+
+    def __init__(self, writer: DataWriter, max_batch: int = 64, max_queue: int = 1024):
+        """
+        Initialize write-behind writer.
+
+        Args:
+            writer: Writer that performs the actual writes
+            max_batch: Maximum writes committed together
+            max_queue: Maximum writes waiting to be committed
+        """
+        self.writer = writer
+        self.max_batch = max(1, max_batch)
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_queue))
+        self._closed = False
+        # Failed writes not yet reported, by the thread that queued them
+        self._errors: dict[int, list[BaseException]] = {}
+        self._errors_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def write_raw(self, data: dict[str, Any], source_type: str, per_item: bool = False) -> Future:
+        """Queue DataWriter.write_raw; the Future resolves to its return value."""
+        return self._submit(self.writer.write_raw, data, source_type, per_item)
+
+    def write_processed(self, data: dict[str, Any], process_type: str) -> Future:
+        """Queue DataWriter.write_processed."""
+        return self._submit(self.writer.write_processed, data, process_type)
+
+    def write_synthesized(self, data: dict[str, Any], artifact_type: str) -> Future:
+        """Queue DataWriter.write_synthesized."""
+        return self._submit(self.writer.write_synthesized, data, artifact_type)
+
+    def flush(self) -> None:
+        """
+        Block until every write queued so far is committed.
+
+        Raises:
+            The first error of the writes this thread queued since its
+            last flush() (every failure is also logged when it happens)
+        """
+        self._queue.join()
+        with self._errors_lock:
+            errors = self._errors.pop(threading.get_ident(), [])
+        self._raise_first(errors)
+
+    def close(self) -> None:
+        """
+        Flush pending writes and stop the background thread.
+
+        Raises:
+            The first error of any write not yet reported by flush()
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        with self._errors_lock:
+            errors = [error for thread_errors in self._errors.values() for error in thread_errors]
+            self._errors.clear()
+        self._raise_first(errors)
+
+    @staticmethod
+    def _raise_first(errors: list[BaseException]) -> None:
+        if len(errors) > 1:
+            logger.error(f"{len(errors)} writes failed")
+        if errors:
+            raise errors[0]
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        if self._closed:
+            raise RuntimeError("WriteBehindWriter is closed")
+        future: Future = Future()
+        thread_id = threading.get_ident()
+        future.add_done_callback(lambda done: self._record_error(thread_id, done))
+        self._queue.put((future, fn, args))
+        return future
+
+    def _record_error(self, thread_id: int, future: Future) -> None:
+        """Keep a failed write's error for the next flush() of the thread that queued it."""
+        error = future.exception()
+        if error is not None:
+            with self._errors_lock:
+                self._errors.setdefault(thread_id, []).append(error)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            jobs = [self._queue.get()]
+            while len(jobs) < self.max_batch:
+                try:
+                    jobs.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if any(job is _STOP for job in jobs):
+                stopping = True
+                jobs = [job for job in jobs if job is not _STOP]
+                self._queue.task_done()
+
+            self._commit(jobs)
+            for _ in jobs:
+                self._queue.task_done()
+
+    def _commit(self, jobs: list[tuple[Future, Callable[..., Any], tuple]]) -> None:
+        """Run queued writes as one batch and resolve their futures."""
+        results: list[tuple[Future, Any, Optional[BaseException]]] = []
+        try:
+            with self.writer.batch():
+                for future, fn, args in jobs:
+                    try:
+                        results.append((future, fn(*args), None))
+                    except Exception as e:
+                        logger.error(f"Write failed: {e}")
+                        results.append((future, None, e))
+        except Exception as e:
+            logger.error(f"Commit of {len(jobs)} writes failed: {e}")
+            for future, _, _ in jobs:
+                future.set_exception(e)
+            return
+
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
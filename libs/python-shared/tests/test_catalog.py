@@ -0,0 +1,99 @@
+"""Tests for the artifact catalog."""
+from datetime import datetime
+import pytest
+from python_shared.catalog import ArtifactCatalog
+
+
+def make_entry(
+    item_id: str,
+    source_type: str = "rss",
+    path: str = "raw/batch.json",
+    written_at=None,
+    path_id=None,
+    api_id=None
+):
+    record = {
+        "id": item_id,
+        "source_url": f"HTTPS://Example.com/{item_id}/",
+        "extracted_date": "2024-05-01T00:00:00",
+        "metadata": {"pathId": path_id, "api_id": api_id},
+    }
+    return ArtifactCatalog.entry_for("raw", source_type, record, path, written_at)
+
+
+def test_entry_for_reads_record_fields():
+    record = {
+        "original_id": "raw1",
+        "processed_at": "2024-05-02T00:00:00",
+        "metadata": {"pathId": "p1", "api_id": "api1"},
+    }
+
+    entry = ArtifactCatalog.entry_for("processed", "embeddings", record, "processed/e.json", default_id="e1")
+
+    assert entry.id == "e1"
+    assert (entry.path_id, entry.api_id, entry.original_id) == ("p1", "api1", "raw1")
+    assert entry.created_at == "2024-05-02T00:00:00"
+    assert ArtifactCatalog.entry_for("raw", "rss", {}, "raw/x.json") is None
+
+
+def test_find_filters_and_orders_by_write_time(tmp_path):
+    catalog = ArtifactCatalog(tmp_path / "catalog.sqlite")
+    catalog.add([
+        make_entry("b", written_at="2024-05-02T00:00:00", path_id="p1"),
+        make_entry("a", "article", written_at="2024-05-01T00:00:00", api_id="api1"),
+        make_entry("c", written_at="2024-05-03T00:00:00", path_id="p1"),
+        None,
+    ])
+
+    assert len(catalog) == 3
+    assert [entry.id for entry in catalog.find(kind="raw")] == ["a", "b", "c"]
+    assert [entry.id for entry in catalog.find(artifact_type=["rss"], path_id="p1")] == ["b", "c"]
+    assert [entry.id for entry in catalog.find(since=datetime(2024, 5, 2))] == ["b", "c"]
+    assert [entry.id for entry in catalog.find(until=datetime(2024, 5, 2))] == ["a"]
+    assert [entry.id for entry in catalog.find(source_url="https://example.com/b")] == ["b"]
+    assert catalog.find(api_id="api1")[0].id == "a"
+    assert catalog.last_written("raw", "rss") == datetime(2024, 5, 3)
+
+
+def test_rewrite_updates_the_entry(tmp_path):
+    catalog = ArtifactCatalog(tmp_path / "catalog.sqlite")
+    catalog.add([make_entry("a", path="raw/old.json")])
+    catalog.add([make_entry("a", "article", path="raw/new.json")])
+
+    entry = catalog.get("raw", "a")
+    assert len(catalog) == 1
+    assert (entry.artifact_type, entry.path) == ("article", "raw/new.json")
+    assert catalog.get("processed", "a") is None
+
+
+def test_paths_update_and_remove(tmp_path):
+    catalog = ArtifactCatalog(tmp_path / "catalog.sqlite")
+    catalog.add([
+        make_entry("a", path="raw/one.json", path_id="p1"),
+        make_entry("b", path="raw/one.json"),
+        make_entry("c", "article", path="raw/two.json"),
+    ])
+
+    assert catalog.paths("raw") == {"raw/one.json", "raw/two.json"}
+    assert catalog.paths("raw", "article") == {"raw/two.json"}
+    assert catalog.paths("raw", path_id="p1") == {"raw/one.json"}
+
+    assert catalog.update_paths({"raw/one.json": "raw/moved.json"}) == 2
+    assert catalog.get("raw", "a").path == "raw/moved.json"
+    assert catalog.remove_paths(["raw/moved.json"]) == 2
+    assert [entry.id for entry in catalog.find()] == ["c"]
+
+
+def test_read_only_catalog(tmp_path):
+    path = tmp_path / "catalog.sqlite"
+    missing = ArtifactCatalog(path, read_only=True)
+
+    assert missing.find() == []
+    assert missing.paths("raw") == set()
+    assert len(missing) == 0
+
+    ArtifactCatalog(path).add([make_entry("a")])
+    catalog = ArtifactCatalog(path, read_only=True)
+    assert catalog.get("raw", "a").id == "a"
+    with pytest.raises(PermissionError):
+        catalog.add([make_entry("b")])
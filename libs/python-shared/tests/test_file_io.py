@@ -0,0 +1,192 @@
+"""Tests for raw content reading and writing."""
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from python_shared import file_io
+from python_shared.file_io import DataReader, DataWriter, parse_run_stem
+from python_shared.serialization import load_file
+
+
+def make_item(item_id: str, source_type: str, **fields) -> dict:
+    return {
+        "id": item_id,
+        "source_type": source_type,
+        "source_url": f"https://example.com/{item_id}",
+        "title": item_id,
+        "content": f"Content of {item_id}",
+        "extracted_date": datetime(2024, 5, 1).isoformat(),
+        "metadata": {},
+        **fields
+    }
+
+
+def mixed_rss_batch() -> dict:
+    """An RSS feed whose issue links were extracted as full articles."""
+    items = [
+        make_item("entry1", "rss"),
+        make_item("issue1", "article"),
+        make_item("entry2", "rss"),
+        make_item("issue2", "article"),
+    ]
+    return {"items": items, "total": len(items), "source_type": "rss"}
+
+
+def ids(items) -> list[str]:
+    return sorted(item["id"] for item in items)
+
+
+@pytest.mark.parametrize("layout", ["files", "partitioned", "segments"])
+@pytest.mark.parametrize("per_item", [True, False])
+def test_iter_raw_filters_mixed_batch_by_item_type(tmp_path, layout, per_item):
+    DataWriter(tmp_path, raw_layout=layout).write_raw(mixed_rss_batch(), "rss", per_item=per_item)
+    reader = DataReader(tmp_path)
+
+    assert ids(reader.iter_raw(source_types={"article"})) == ["issue1", "issue2"]
+    assert ids(reader.iter_raw(source_types={"rss"})) == ["entry1", "entry2"]
+    assert ids(reader.iter_raw()) == ["entry1", "entry2", "issue1", "issue2"]
+    # Through the catalog
+    since = datetime(2000, 1, 1)
+    assert ids(reader.iter_raw(source_types={"article"}, written_since=since)) == ["issue1", "issue2"]
+    assert ids(reader.iter_raw(source_types={"rss"}, written_since=since)) == ["entry1", "entry2"]
+
+
+def test_partitions_follow_item_source_type(tmp_path):
+    writer = DataWriter(tmp_path, raw_layout="partitioned")
+    writer.write_raw(mixed_rss_batch(), "rss", per_item=True)
+    writer.write_raw(mixed_rss_batch(), "rss")
+    raw_dir = tmp_path / "raw"
+
+    assert sorted(path.name for path in raw_dir.glob("source_type=article/*/*")) == [
+        "article_issue1.json", "article_issue2.json"
+    ]
+    assert sorted(path.name for path in raw_dir.glob("source_type=rss/*/*")) == [
+        "rss_entry1.json", "rss_entry2.json"
+    ]
+    # The mixed batch file can't be pruned by type, so it stays unpartitioned
+    assert len(list(raw_dir.glob("rss_2*.json"))) == 1
+
+
+def test_partition_raw_moves_misplaced_files(tmp_path):
+    raw_dir = tmp_path / "raw"
+    # As written before partitions followed the items' types
+    misplaced = raw_dir / "source_type=rss" / "date=2024-05-01"
+    misplaced.mkdir(parents=True)
+    (misplaced / "rss_issue1.json").write_text(json.dumps(make_item("issue1", "article")))
+    (misplaced / "rss_entry1.json").write_text(json.dumps(make_item("entry1", "rss")))
+    (misplaced / "rss_batch.json").write_text(json.dumps(mixed_rss_batch()))
+    (raw_dir / "rss_entry2.json").write_text(json.dumps(make_item("entry2", "rss")))
+    writer = DataWriter(tmp_path, raw_layout="partitioned")
+
+    assert writer.partition_raw(dry_run=True) == 3
+    assert writer.partition_raw() == 3
+    assert writer.partition_raw() == 0
+
+    assert (raw_dir / "source_type=article" / "date=2024-05-01" / "rss_issue1.json").exists()
+    assert (misplaced / "rss_entry1.json").exists()
+    assert (raw_dir / "rss_batch.json").exists()
+    assert len(list(raw_dir.glob("source_type=rss/*/rss_entry2.json"))) == 1
+    articles = DataReader(tmp_path).iter_raw(source_types={"article"})
+    assert ids(articles) == ["issue1", "issue1", "issue2"]
+
+
+@pytest.mark.parametrize("catalog", [True, False])
+def test_rewrite_on_a_later_day_replaces_the_item(tmp_path, monkeypatch, catalog):
+    class FixedDatetime(datetime):
+        now_utc = datetime(2024, 5, 1, 12)
+
+        @classmethod
+        def utcnow(cls):
+            return cls.now_utc
+
+    monkeypatch.setattr(file_io, "datetime", FixedDatetime)
+    writer = DataWriter(tmp_path, raw_layout="partitioned", catalog=catalog)
+    writer.write_raw({"items": [make_item("entry1", "rss", title="v1")], "total": 1}, "rss", per_item=True)
+    FixedDatetime.now_utc = datetime(2024, 5, 3, 12)
+    writer.write_raw({"items": [make_item("entry1", "rss", title="v2")], "total": 1}, "rss", per_item=True)
+    writer.write_raw({"items": [make_item("entry2", "rss")], "total": 1}, "rss", per_item=True)
+
+    raw_dir = tmp_path / "raw" / "source_type=rss"
+    assert sorted(path.relative_to(raw_dir).as_posix() for path in raw_dir.glob("*/*")) == [
+        "date=2024-05-01/rss_entry1.json", "date=2024-05-03/rss_entry2.json"
+    ]
+    items = list(DataReader(tmp_path).iter_raw())
+    assert [(item["id"], item["title"]) for item in items] == [("entry1", "v2"), ("entry2", "entry2")]
+
+
+def test_iter_raw_filters_by_extracted_date_and_path(tmp_path):
+    day = datetime(2024, 5, 1)
+    items = [
+        make_item("old", "rss", extracted_date=(day - timedelta(days=2)).isoformat()),
+        make_item("new", "rss", extracted_date=day.isoformat(), metadata={"pathId": "p1"}),
+        make_item("other", "rss", extracted_date=day.isoformat(), metadata={"pathId": "p2"}),
+    ]
+    DataWriter(tmp_path).write_raw({"items": items, "total": 3, "source_type": "rss"}, "rss", per_item=True)
+    reader = DataReader(tmp_path)
+
+    assert ids(reader.iter_raw(since=day - timedelta(days=1))) == ["new", "other"]
+    assert ids(reader.iter_raw(until=day)) == ["old"]
+    assert ids(reader.iter_raw(path_id="p1")) == ["new"]
+
+
+def test_iter_raw_skips_cataloged_files_without_matches(tmp_path, monkeypatch):
+    writer = DataWriter(tmp_path)
+    writer.write_raw(mixed_rss_batch(), "rss")
+    singles = [make_item("article1", "article"), make_item("rss1", "rss")]
+    writer.write_raw({"items": singles, "total": 2, "source_type": "rss"}, "rss", per_item=True)
+    rss_only = [make_item("entry3", "rss"), make_item("entry4", "rss", metadata={"pathId": "p1"})]
+    writer.write_raw({"items": rss_only, "total": 2, "source_type": "rss"}, "rss")
+    # Written without the catalog, so it has to be read
+    (tmp_path / "raw" / "article_manual.json").write_text(json.dumps(make_item("manual", "article")))
+    loaded = []
+    load = file_io.load_file
+
+    def recording_load(path, *args, **kwargs):
+        loaded.append(Path(path).name)
+        return load(path, *args, **kwargs)
+
+    monkeypatch.setattr(file_io, "load_file", recording_load)
+    reader = DataReader(tmp_path)
+
+    assert ids(reader.iter_raw(source_types={"article"})) == ["article1", "issue1", "issue2", "manual"]
+    # The mixed batch, the article file and the uncataloged file
+    assert len(loaded) == 3
+    assert "rss_rss1.json" not in loaded
+
+    loaded.clear()
+    assert ids(reader.iter_raw(path_id="p1")) == ["entry4"]
+    assert len(loaded) == 2
+
+
+def test_read_all_raw_expands_batches(tmp_path):
+    writer = DataWriter(tmp_path)
+    writer.write_raw(mixed_rss_batch(), "rss")
+    writer.write_raw({"items": [make_item("single", "article")], "total": 1}, "article", per_item=True)
+
+    items = DataReader(tmp_path).read_all_raw()
+
+    assert ids(items) == ["entry1", "entry2", "issue1", "issue2", "single"]
+    assert all("items" not in item for item in items)
+
+
+def test_run_file_names_are_unique_and_sort_in_write_order(tmp_path):
+    writer = DataWriter(tmp_path)
+    paths = [writer.write_synthesized({"run": index}, "knowledge_units") for index in range(50)]
+
+    assert len(set(paths)) == 50
+    assert sorted(paths, key=lambda path: path.name) == paths
+    latest = load_file(tmp_path / "synthesized" / "knowledge_units_latest.json")
+    assert latest == {"run": 49}
+
+
+def test_parse_run_stem():
+    assert parse_run_stem("knowledge_units_20240501_120000_000000_0a1b2c") == (
+        "knowledge_units", datetime(2024, 5, 1, 12)
+    )
+    # Stems written before fixed-width ids
+    assert parse_run_stem("embeddings_2024-05-01T12:00:00.250000") == (
+        "embeddings", datetime(2024, 5, 1, 12, 0, 0, 250000)
+    )
+    assert parse_run_stem("knowledge_units_latest") is None
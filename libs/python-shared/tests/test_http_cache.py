@@ -0,0 +1,114 @@
+"""Tests for the conditional-GET HTTP cache."""
+import io
+import requests
+from python_shared.http_cache import HttpCache
+from python_shared.http_client import HttpClient
+
+
+URL = "https://example.com/feed"
+HEADERS = {"ETag": '"v1"', "Content-Type": "application/rss+xml"}
+
+
+def test_store_requires_validator(tmp_path):
+    cache = HttpCache(tmp_path)
+
+    assert not cache.store(URL, {"Content-Type": "text/html"}, b"body")
+    assert cache.lookup(URL) is None
+
+
+def test_staged_response_is_cached_on_commit(tmp_path):
+    cache = HttpCache(tmp_path)
+    cache.stage(URL, HEADERS, b"body")
+
+    assert cache.lookup(URL) is None
+    assert cache.commit(URL)
+    entry = cache.lookup(URL)
+    assert entry.etag == '"v1"'
+    assert cache.read_body(entry) == b"body"
+    assert cache.conditional_headers(entry) == {"If-None-Match": '"v1"'}
+
+
+def test_discard_keeps_previous_entry(tmp_path):
+    cache = HttpCache(tmp_path)
+    cache.store(URL, HEADERS, b"old")
+    cache.stage(URL, {"ETag": '"v2"'}, b"new")
+
+    cache.discard(URL)
+
+    assert not cache.commit(URL)
+    entry = cache.lookup(URL)
+    assert entry.etag == '"v1"'
+    assert cache.read_body(entry) == b"old"
+
+
+def test_entries_survive_reopening(tmp_path):
+    HttpCache(tmp_path).store(URL, HEADERS, b"body")
+
+    entry = HttpCache(tmp_path).lookup(URL)
+
+    assert entry is not None
+    assert entry.size == 4
+
+
+def make_response(status_code: int, headers: dict, body: bytes = b"") -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers)
+    response.raw = io.BytesIO(body)
+    response.url = URL
+    return response
+
+
+class ScriptedClient(HttpClient):
+    """HttpClient that answers GETs from a list of prepared responses."""
+
+    def __init__(self, cache, responses, before_response=None):
+        super().__init__(cache=cache)
+        self.responses = list(responses)
+        self.before_response = before_response
+        self.sent_headers = []
+
+    def get(self, url, **kwargs):
+        self.sent_headers.append(kwargs.get("headers") or {})
+        if self.before_response:
+            self.before_response()
+        return self.responses.pop(0)
+
+
+def test_fetch_serves_cached_body_on_304(tmp_path):
+    cache = HttpCache(tmp_path)
+    cache.store(URL, HEADERS, b"body")
+    client = ScriptedClient(cache, [make_response(304, {})])
+
+    result = client.fetch(URL)
+
+    assert result.not_modified
+    assert result.content == b"body"
+    assert client.sent_headers == [{"If-None-Match": '"v1"'}]
+
+
+def test_fetch_refetches_and_stages_when_cached_body_is_gone(tmp_path):
+    cache = HttpCache(tmp_path)
+    cache.store(URL, HEADERS, b"old")
+    body_paths = list(tmp_path.rglob("*.body"))
+
+    def evict():
+        for path in body_paths:
+            path.unlink(missing_ok=True)
+
+    client = ScriptedClient(
+        cache,
+        [make_response(304, {}), make_response(200, {"ETag": '"v2"'}, b"new")],
+        before_response=evict
+    )
+
+    result = client.fetch(URL, commit=False)
+
+    assert not result.not_modified
+    assert result.content == b"new"
+    # The refetch is unconditional, and its body is staged like any other
+    assert client.sent_headers == [{"If-None-Match": '"v1"'}, {}]
+    client.commit_cache(URL)
+    entry = cache.lookup(URL)
+    assert entry.etag == '"v2"'
+    assert cache.read_body(entry) == b"new"
@@ -0,0 +1,40 @@
+"""Tests for retention and compaction of per-run outputs."""
+from datetime import datetime
+
+from python_shared.retention import RetentionPolicy, compact, find_runs
+
+
+def write_run(directory, stem: str) -> None:
+    (directory / f"{stem}.json").write_text("{}")
+
+
+def test_find_runs_orders_old_and_new_stems_by_time(tmp_path):
+    directory = tmp_path / "synthesized"
+    directory.mkdir()
+    write_run(directory, "knowledge_units_2024-05-01T12:00:00")
+    write_run(directory, "knowledge_units_20240502_120000_000000_0a1b2c")
+    write_run(directory, "knowledge_units_20240502_120000_000001_ffffff")
+    write_run(directory, "knowledge_units_latest")
+
+    runs = find_runs(directory)["knowledge_units"]
+
+    assert [run.timestamp for run in runs] == [
+        datetime(2024, 5, 2, 12, 0, 0, 1),
+        datetime(2024, 5, 2, 12),
+        datetime(2024, 5, 1, 12),
+    ]
+
+
+def test_compact_keeps_newest_runs(tmp_path):
+    directory = tmp_path / "processed"
+    directory.mkdir()
+    for day in range(1, 5):
+        write_run(directory, f"embeddings_202405{day:02d}_120000_000000_0a1b2c")
+
+    report = compact(tmp_path, RetentionPolicy(keep_last=2, archive=False))
+
+    assert report.runs_expired == 2
+    assert sorted(path.name for path in directory.glob("*.json")) == [
+        "embeddings_20240503_120000_000000_0a1b2c.json",
+        "embeddings_20240504_120000_000000_0a1b2c.json",
+    ]
@@ -0,0 +1,71 @@
+"""Tests for the append-only segment store."""
+import pytest
+
+from python_shared.segment_store import SegmentStore
+
+
+def record(record_id: str, content: str = "body") -> dict:
+    return {"id": record_id, "source_type": "rss", "content": content}
+
+
+def simulate_crash(store: SegmentStore, segment, keep_index_lines: int) -> None:
+    """Leave a segment as an append interrupted mid-write would: index
+    entries missing, a half-written index line and a partial record."""
+    index_path = store.index_path(segment)
+    lines = index_path.read_bytes().splitlines(keepends=True)
+    index_path.write_bytes(b"".join(lines[:keep_index_lines]) + lines[keep_index_lines][:3])
+    with open(segment, "ab") as f:
+        f.write(store._encode(record("partial"))[:-5])
+
+
+def test_append_get_and_supersede(tmp_path):
+    store = SegmentStore(tmp_path)
+    store.append([record("a"), record("b")], "rss")
+    store.append([record("a", "updated")], "rss")
+
+    assert store.get("a")["content"] == "updated"
+    assert [r["id"] for r in store.iter_records()] == ["b", "a"]
+    assert [r["id"] for r in SegmentStore(tmp_path, read_only=True).iter_records()] == ["b", "a"]
+
+
+def test_rotation_keeps_records_readable(tmp_path):
+    store = SegmentStore(tmp_path, max_segment_bytes=120)
+    store.append([record(f"r{i}") for i in range(6)], "rss")
+
+    assert len(store.segments()) > 1
+    reopened = SegmentStore(tmp_path)
+    assert [r["id"] for r in reopened.iter_records()] == [f"r{i}" for i in range(6)]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_recovers_interrupted_append(tmp_path, compress):
+    store = SegmentStore(tmp_path, compress=compress)
+    segment = store.append([record("a"), record("b"), record("c")], "rss")
+    intact_size = segment.stat().st_size
+    simulate_crash(store, segment, keep_index_lines=1)
+
+    recovered = SegmentStore(tmp_path, compress=compress)
+
+    # Unindexed complete records are re-indexed, the partial one is cut off
+    assert [r["id"] for r in recovered.iter_records()] == ["a", "b", "c"]
+    assert recovered.get("c") == record("c")
+    assert "partial" not in recovered
+    assert segment.stat().st_size == intact_size
+    assert store.index_path(segment).read_text().endswith("\n")
+
+    recovered.append([record("d")], "rss")
+    assert [r["id"] for r in SegmentStore(tmp_path, read_only=True).iter_records()] == ["a", "b", "c", "d"]
+
+
+def test_read_only_store_does_not_repair(tmp_path):
+    store = SegmentStore(tmp_path)
+    segment = store.append([record("a"), record("b")], "rss")
+    simulate_crash(store, segment, keep_index_lines=1)
+    damaged = segment.read_bytes()
+
+    reader = SegmentStore(tmp_path, read_only=True)
+
+    assert [r["id"] for r in reader.iter_records()] == ["a"]
+    assert segment.read_bytes() == damaged
+    with pytest.raises(PermissionError):
+        reader.append([record("c")], "rss")
@@ -0,0 +1,76 @@
+"""Tests for the write-behind writer."""
+import threading
+
+import pytest
+
+from python_shared.file_io import DataReader, DataWriter
+from python_shared.write_behind import WriteBehindWriter
+
+
+def make_batch(item_id: str) -> dict:
+    item = {"id": item_id, "source_type": "rss", "title": item_id, "content": "body"}
+    return {"items": [item], "total": 1, "source_type": "rss"}
+
+
+def failing_writer(tmp_path, failing_ids: set[str]) -> DataWriter:
+    """A DataWriter whose raw writes fail for some item ids."""
+    writer = DataWriter(tmp_path)
+    write_raw = writer.write_raw
+
+    def write(data, source_type, per_item=False):
+        if data["items"][0]["id"] in failing_ids:
+            raise OSError(f"disk full writing {data['items'][0]['id']}")
+        return write_raw(data, source_type, per_item)
+
+    writer.write_raw = write
+    return writer
+
+
+def test_flush_raises_failed_write_once(tmp_path):
+    writer = WriteBehindWriter(failing_writer(tmp_path, {"bad"}))
+    try:
+        ok = writer.write_raw(make_batch("good"), "rss", per_item=True)
+        failed = writer.write_raw(make_batch("bad"), "rss", per_item=True)
+
+        with pytest.raises(OSError, match="disk full"):
+            writer.flush()
+        writer.flush()
+    finally:
+        writer.close()
+
+    assert ok.result()
+    assert isinstance(failed.exception(), OSError)
+    assert [item["id"] for item in DataReader(tmp_path).iter_raw()] == ["good"]
+
+
+def test_flush_reports_only_the_calling_threads_writes(tmp_path):
+    writer = WriteBehindWriter(failing_writer(tmp_path, {"bad"}))
+    errors = {}
+
+    def ingest(name: str, item_id: str) -> None:
+        writer.write_raw(make_batch(item_id), "rss", per_item=True)
+        try:
+            writer.flush()
+        except OSError as e:
+            errors[name] = e
+
+    threads = [
+        threading.Thread(target=ingest, args=("failing", "bad")),
+        threading.Thread(target=ingest, args=("passing", "good")),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+
+    assert list(errors) == ["failing"]
+
+
+def test_close_raises_unflushed_failure(tmp_path):
+    writer = WriteBehindWriter(failing_writer(tmp_path, {"bad"}))
+    writer.write_raw(make_batch("bad"), "rss", per_item=True)
+
+    with pytest.raises(OSError):
+        writer.close()
+    writer.close()